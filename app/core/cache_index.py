@@ -0,0 +1,79 @@
+#app/core/cache_index.py
+import json
+import sqlite3
+import threading
+from app.core.data_manager import data_manager
+
+class CacheIndex:
+    """
+    Base de los índices SQLite derivados de los detalles de mods guardados en caché. Hay una base de
+    datos por juego (gamedata/<appid>/<DB_NAME>) que se crea al primer uso a partir de la caché existente
+    y luego se actualiza incrementalmente. Las subclases definen el esquema, la tabla y las filas.
+    """
+    DB_NAME = ""
+    TABLE = ""
+
+    def __init__(self):
+        self._connections: dict[str, sqlite3.Connection] = {}
+        self._lock = threading.Lock()
+
+    def _create_schema(self, conn: sqlite3.Connection):
+        raise NotImplementedError
+
+    def _rows_for(self, workshop_id: str, data: dict) -> list[tuple]:
+        """Filas del índice para los detalles de un mod."""
+        raise NotImplementedError
+
+    def _insert_rows(self, conn: sqlite3.Connection, rows: list[tuple]):
+        raise NotImplementedError
+
+    def _get_connection(self, app_id: str) -> sqlite3.Connection:
+        key = str(app_id)
+        conn = self._connections.get(key)
+        if conn is None:
+            db_path = data_manager.get_game_path(app_id) / self.DB_NAME
+            is_new = not db_path.exists()
+            conn = sqlite3.connect(db_path, check_same_thread=False)
+            self._create_schema(conn)
+            self._connections[key] = conn
+            if is_new:
+                self._index_existing_cache(app_id, conn)
+        return conn
+
+    def _index_existing_cache(self, app_id: str, conn: sqlite3.Connection):
+        """Indexa los detalles que ya estaban en caché antes de existir el índice."""
+        cache_dir = data_manager.get_game_path(app_id) / "cache"
+        if not cache_dir.exists():
+            return
+        rows = []
+        for cache_file in cache_dir.glob("*.json"):
+            try:
+                with open(cache_file, 'r', encoding='utf-8') as f:
+                    rows.extend(self._rows_for(cache_file.stem, json.load(f)))
+            except (json.JSONDecodeError, TypeError, OSError):
+                continue
+        with conn:
+            self._insert_rows(conn, rows)
+
+    def index_mod(self, app_id: str, workshop_id: str, data: dict):
+        """Sustituye las filas de un mod en el índice por las de sus detalles."""
+        with self._lock:
+            conn = self._get_connection(app_id)
+            with conn:
+                conn.execute(f"DELETE FROM {self.TABLE} WHERE workshop_id = ?", (str(workshop_id),))
+                self._insert_rows(conn, self._rows_for(workshop_id, data))
+
+    def remove_mod(self, app_id: str, workshop_id: str):
+        """Elimina un mod del índice."""
+        with self._lock:
+            conn = self._get_connection(app_id)
+            with conn:
+                conn.execute(f"DELETE FROM {self.TABLE} WHERE workshop_id = ?", (str(workshop_id),))
+
+    def rebuild(self, app_id: str):
+        """Vacía el índice de un juego y lo vuelve a generar a partir de la caché."""
+        with self._lock:
+            conn = self._get_connection(app_id)
+            with conn:
+                conn.execute(f"DELETE FROM {self.TABLE}")
+            self._index_existing_cache(app_id, conn)
@@ -2,6 +2,10 @@
 import json
 from pathlib import Path
 from app.core.data_manager import data_manager
+from app.core.tracer import tracer
+from app.core.metrics import cache_requests_total
+from app.core.search_index import search_index
+from app.core.dependency_index import dependency_index
 
 class CacheManager:
     """
@@ -16,20 +20,27 @@ class CacheManager:
 
     def get_mod_cache(self, app_id: str, workshop_id: str) -> dict | None:
         """Intenta recuperar los detalles de un mod desde el archivo de caché JSON."""
-        cache_file = self.get_cache_dir(app_id) / f"{workshop_id}.json"
-        if cache_file.exists():
-            try:
-                with open(cache_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, TypeError):
-                return None
-        return None
+        with tracer.span("cache.get", "cache", workshop_id=workshop_id):
+            cache_file = self.get_cache_dir(app_id) / f"{workshop_id}.json"
+            if cache_file.exists():
+                try:
+                    with open(cache_file, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                    cache_requests_total.inc(result="hit")
+                    return data
+                except (json.JSONDecodeError, TypeError):
+                    pass
+            cache_requests_total.inc(result="miss")
+            return None
 
     def save_mod_cache(self, app_id: str, workshop_id: str, data: dict):
         """Guarda los detalles de un mod en un archivo de caché JSON."""
-        cache_file = self.get_cache_dir(app_id) / f"{workshop_id}.json"
-        with open(cache_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4)
+        with tracer.span("cache.save", "cache", workshop_id=workshop_id):
+            cache_file = self.get_cache_dir(app_id) / f"{workshop_id}.json"
+            with open(cache_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=4)
+        search_index.index_mod(app_id, workshop_id, data)
+        dependency_index.index_mod(app_id, workshop_id, data)
 
 # Instancia única para ser usada en toda la aplicación
 cache_manager = CacheManager()
\ No newline at end of file
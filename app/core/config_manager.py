@@ -10,6 +10,48 @@ DEFAULT_CONFIG = {
     },
     "API": {
         "steam_api_key": ""
+    },
+    "Downloads": {
+        "order": "small_first",
+        "verify_copies": "true"
+    },
+    "Performance": {
+        "download_threads": "1",
+        "scrape_threads": "3",
+        "image_threads": "2",
+        "io_threads": "1",
+        "copy_threads": "4",
+        "parse_processes": "0",
+        "crawl_threads": "4",
+        "crawl_max_pages": "500",
+        "preview_debounce_ms": "150"
+    },
+    # Límites por host de las peticiones a Steam (ver app/core/network_governor.py)
+    "Network": {
+        "requests_per_second": "4",
+        "burst": "8",
+        "min_concurrency": "1",
+        "max_concurrency": "8",
+        "max_retries": "4",
+        "timeout_s": "15",
+        "backoff_base_s": "1.0"
+    },
+    "Tracing": {
+        "enabled": "false",
+        "trace_file": "trace.json"
+    },
+    # Pruebas de carga sin conexión con tools/fake_steamcmd.py y tools/mock_steam_server.py
+    "Testing": {
+        "mock_steam_url": "",
+        "mock_port": "27070",
+        "mock_latency_ms": "0",
+        "mock_error_rate": "0.0",
+        "mock_catalog_size": "5000",
+        "fake_latency_ms": "50",
+        "fake_failure_rate": "0.0",
+        "fake_min_size_kb": "64",
+        "fake_max_size_kb": "2048",
+        "fake_seed": "moddownloader"
     }
 }
 
@@ -0,0 +1,242 @@
+#app/core/copy_engine.py
+import errno
+import hashlib
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from pathlib import Path
+from PyQt6.QtCore import QObject, pyqtSignal, QRunnable
+from app.core.tracer import tracer
+from app.core.metrics import installed_bytes_total
+
+CHUNK_SIZE = 8 * 1024 * 1024
+PARTIAL_SUFFIX = ".partial"
+# Errores con los que el kernel indica que una vía rápida no sirve para este par de archivos
+# (ENOTSOCK: en macOS sendfile solo admite un socket como destino)
+_FALLBACK_ERRNOS = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.EBADF, errno.ENOTSUP, errno.ENOTSOCK}
+
+class CopyVerificationError(OSError):
+    """El contenido del destino no coincide con el del origen tras copiarlo."""
+
+class _Progress:
+    """Acumula los bytes copiados desde varios hilos y avisa al callback."""
+    def __init__(self, total: int, callback=None):
+        self.total = total
+        self.done = 0
+        self.callback = callback
+        self._lock = threading.Lock()
+
+    def add(self, nbytes: int):
+        with self._lock:
+            self.done += nbytes
+            done = self.done
+        if self.callback:
+            self.callback(done, self.total)
+
+def _copy_chunk(src_fd: int, dst_fd: int, offset: int, count: int, method: list[str]) -> tuple[int, bytes | None]:
+    """
+    Copia un bloque usando la vía más rápida que funcione. `method` es una lista de un elemento que
+    se degrada ('copy_file_range' -> 'sendfile' -> 'read') la primera vez que el kernel la rechaza.
+    Devuelve (bytes copiados, datos leídos si se copiaron pasando por Python).
+    """
+    while True:
+        try:
+            if method[0] == 'copy_file_range':
+                return os.copy_file_range(src_fd, dst_fd, count, offset, offset), None
+            if method[0] == 'sendfile':
+                os.lseek(dst_fd, offset, os.SEEK_SET)
+                return os.sendfile(dst_fd, src_fd, offset, count), None
+        except OSError as e:
+            if e.errno not in _FALLBACK_ERRNOS:
+                raise
+            method[0] = 'sendfile' if method[0] == 'copy_file_range' and hasattr(os, 'sendfile') else 'read'
+            continue
+        data = _read_at(src_fd, offset, count)
+        written = 0
+        while written < len(data):
+            written += _write_at(dst_fd, data[written:], offset + written)
+        return len(data), data
+
+def _read_at(fd: int, offset: int, count: int) -> bytes:
+    if hasattr(os, 'pread'):
+        return os.pread(fd, count, offset)
+    os.lseek(fd, offset, os.SEEK_SET)
+    return os.read(fd, count)
+
+def _write_at(fd: int, data: bytes, offset: int) -> int:
+    if hasattr(os, 'pwrite'):
+        return os.pwrite(fd, data, offset)
+    os.lseek(fd, offset, os.SEEK_SET)
+    return os.write(fd, data)
+
+def _initial_method() -> str:
+    if hasattr(os, 'copy_file_range'):
+        return 'copy_file_range'
+    return 'sendfile' if hasattr(os, 'sendfile') else 'read'
+
+def copy_file(src: Path, dst: Path, verify: bool = True, progress: _Progress | None = None) -> str | None:
+    """
+    Copia un archivo bloque a bloque con copy_file_range/sendfile cuando el sistema lo permite.
+    Si `verify` es True, cada bloque se vuelve a leer del origen y del destino justo después de
+    copiarlo (aún en caché) y se comparan sus SHA-256 al terminar; devuelve el hash del archivo.
+    """
+    flags = os.O_RDONLY | getattr(os, 'O_BINARY', 0)
+    src_fd = os.open(src, flags)
+    try:
+        dst_fd = os.open(dst, os.O_RDWR | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+        try:
+            size = os.fstat(src_fd).st_size
+            src_hash = hashlib.sha256() if verify else None
+            dst_hash = hashlib.sha256() if verify else None
+            method = [_initial_method()]
+            offset = 0
+            while offset < size:
+                copied, data = _copy_chunk(src_fd, dst_fd, offset, min(CHUNK_SIZE, size - offset), method)
+                if copied == 0:
+                    break # El origen se ha acortado mientras se copiaba
+                if verify:
+                    src_hash.update(data if data is not None else _read_at(src_fd, offset, copied))
+                    dst_hash.update(_read_at(dst_fd, offset, copied))
+                offset += copied
+                if progress:
+                    progress.add(copied)
+            if offset != size:
+                raise CopyVerificationError(f"Copia incompleta de {src}: {offset} de {size} bytes")
+            if verify and src_hash.digest() != dst_hash.digest():
+                raise CopyVerificationError(f"El contenido de {dst} no coincide con {src}")
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+    shutil.copystat(src, dst)
+    return src_hash.hexdigest() if verify else None
+
+def _list_files(root: Path) -> tuple[list[str], list[tuple[str, int]]]:
+    """Devuelve (subcarpetas relativas, [(archivo relativo, tamaño)]) de un árbol."""
+    dirs, files = [], []
+    for current, subdirs, names in os.walk(root):
+        rel = os.path.relpath(current, root)
+        dirs.extend(os.path.normpath(os.path.join(rel, d)) for d in subdirs)
+        for name in names:
+            path = os.path.join(current, name)
+            files.append((os.path.normpath(os.path.join(rel, name)), os.path.getsize(path)))
+    return dirs, files
+
+def _same_device(a: Path, b: Path) -> bool:
+    try:
+        return os.stat(a).st_dev == os.stat(b).st_dev
+    except OSError:
+        return False
+
+def install_mods(items: list[tuple[str, Path]], install_dir: Path, workers: int = 4, verify: bool = True,
+                 on_progress=None, on_installed=None) -> tuple[list[str], dict[str, str]]:
+    """
+    Instala en install_dir/<workshop_id> las carpetas descargadas. Si origen y destino están en el
+    mismo volumen basta con renombrar; si no, los archivos de todos los mods se copian a la vez en
+    un mismo grupo de hilos a una carpeta temporal, que se renombra al terminar cada mod.
+    Devuelve (workshop_ids instalados, {workshop_id: error}).
+    """
+    install_dir = Path(install_dir)
+    try:
+        install_dir.mkdir(parents=True, exist_ok=True)
+    except OSError as e: # Unidad desconectada o sin permisos: no se puede instalar ninguno
+        return [], {workshop_id: str(e) for workshop_id, _ in items}
+    installed, errors = [], {}
+    to_copy = []
+
+    for workshop_id, src in items:
+        try:
+            if not Path(src).is_dir():
+                raise FileNotFoundError(errno.ENOENT, "No existe la carpeta descargada", str(src))
+            dirs, files = _list_files(src)
+            size = sum(s for _, s in files)
+            if _same_device(src, install_dir):
+                with tracer.span("install.move", "install", workshop_id=workshop_id, mode="rename"):
+                    final_path = install_dir / workshop_id
+                    if final_path.exists():
+                        shutil.rmtree(final_path) # Eliminar versión antigua
+                    os.replace(src, final_path)
+                installed_bytes_total.inc(size)
+                installed.append(workshop_id)
+                if on_installed:
+                    on_installed(workshop_id, size)
+            else:
+                to_copy.append((workshop_id, Path(src), dirs, files, size))
+        except OSError as e:
+            errors[workshop_id] = str(e)
+
+    if not to_copy:
+        return installed, errors
+
+    progress = _Progress(sum(entry[4] for entry in to_copy), on_progress)
+    with tracer.span("install.copy", "install", items=len(to_copy), bytes=progress.total), \
+            ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        pending = []
+        for workshop_id, src, dirs, files, size in to_copy:
+            staging = install_dir / f".{workshop_id}{PARTIAL_SUFFIX}"
+            try:
+                if staging.exists():
+                    shutil.rmtree(staging) # Restos de una instalación interrumpida
+                staging.mkdir()
+                for rel_dir in dirs:
+                    (staging / rel_dir).mkdir(parents=True, exist_ok=True)
+            except OSError as e:
+                errors[workshop_id] = str(e)
+                continue
+            futures = [executor.submit(copy_file, src / rel, staging / rel, verify, progress) for rel, _ in files]
+            pending.append((workshop_id, src, staging, size, futures))
+
+        # Cada mod se da por instalado en cuanto terminan sus archivos, sin esperar a los demás
+        for workshop_id, src, staging, size, futures in pending:
+            wait(futures)
+            failures = [f.exception() for f in futures if f.exception() is not None]
+            try:
+                if failures:
+                    raise failures[0]
+                final_path = install_dir / workshop_id
+                if final_path.exists():
+                    shutil.rmtree(final_path)
+                os.replace(staging, final_path)
+                shutil.rmtree(src, ignore_errors=True)
+            except OSError as e:
+                shutil.rmtree(staging, ignore_errors=True)
+                errors[workshop_id] = str(e)
+                continue
+            installed_bytes_total.inc(size)
+            installed.append(workshop_id)
+            if on_installed:
+                on_installed(workshop_id, size)
+    return installed, errors
+
+class InstallSignals(QObject):
+    progress = pyqtSignal('qint64', 'qint64') # (bytes copiados, total a copiar)
+    item_installed = pyqtSignal(str, 'qint64') # (workshop_id, bytes)
+    finished = pyqtSignal(list, dict)          # (workshop_ids instalados, {workshop_id: error})
+
+class InstallWorker(QRunnable):
+    """Ejecuta install_mods fuera del hilo de la UI."""
+    def __init__(self, items: list[tuple[str, Path]], install_dir: Path, workers: int = 4, verify: bool = True):
+        super().__init__()
+        self.signals = InstallSignals()
+        self.items = items
+        self.install_dir = install_dir
+        self.workers = workers
+        self.verify = verify
+        self._last_percent = -1
+
+    def _on_progress(self, done: int, total: int):
+        # Solo se emite cuando cambia el porcentaje para no saturar la cola de eventos de la UI
+        percent = done * 100 // total if total else 100
+        if percent != self._last_percent:
+            self._last_percent = percent
+            self.signals.progress.emit(done, total)
+
+    def run(self):
+        try:
+            with tracer.span("install.run", "install", items=len(self.items)):
+                installed, errors = install_mods(self.items, self.install_dir, self.workers, self.verify,
+                                                 self._on_progress, self.signals.item_installed.emit)
+        except Exception as e: # Cualquier fallo inesperado se informa como error de todos los mods
+            installed, errors = [], {workshop_id: str(e) for workshop_id, _ in self.items}
+        self.signals.finished.emit(installed, errors)
@@ -1,14 +1,99 @@
 #app/core/data_manager.py
 import json
+import os
+import threading
 import time
+from contextlib import contextmanager
 from pathlib import Path
 from app.core.config_manager import config_manager
 
+REGISTRY_FILE = "registry.json"
+
 class DataManager:
     """Gestiona todos los datos específicos de los juegos (infos, mods)."""
     def __init__(self):
         self.gamedata_path = Path(config_manager.get("Paths", "gamedata_path", fallback="gamedata"))
         self.gamedata_path.mkdir(exist_ok=True)
+        self._registry: dict[str, dict] | None = None
+        # Transacciones abiertas: AppID -> {'mods': lista en memoria, 'dirty': bool, 'depth': int, 'thread': id}
+        self._batches: dict[str, dict] = {}
+        # Los workers de io_pool leen el registro y los mods.json mientras la UI los modifica
+        self._lock = threading.RLock()
+        # Funciones a las que se avisa con (app_id, mods) cada vez que cambia la lista de mods de un juego
+        self._mods_listeners: list = []
+
+    def add_mods_listener(self, callback):
+        """Registra una función que se llama tras cada save_mods_for_game (también dentro de un batch())."""
+        self._mods_listeners.append(callback)
+
+    # --- Registro de juegos gestionados ---
+    # Un único registry.json con AppID, nombre, ruta de instalación y recuento de mods de
+    # cada juego, para no tener que recorrer y abrir cada game_info.json (costoso en rutas de red).
+
+    def _registry_file(self) -> Path:
+        return self.gamedata_path / REGISTRY_FILE
+
+    def get_registry(self) -> dict[str, dict]:
+        """
+        Devuelve una copia del registro de juegos gestionados (AppID -> entrada), que se puede recorrer
+        desde cualquier hilo. Lo reconstruye si falta o está dañado.
+        """
+        with self._lock:
+            return {app_id: dict(entry) for app_id, entry in self._load_registry().items()}
+
+    def _load_registry(self) -> dict[str, dict]:
+        if self._registry is None:
+            try:
+                with open(self._registry_file(), 'r', encoding='utf-8') as f:
+                    registry = json.load(f)
+                if not isinstance(registry, dict):
+                    raise TypeError("Formato de registro inválido")
+                self._registry = registry
+            except (FileNotFoundError, json.JSONDecodeError, TypeError):
+                self.rebuild_registry()
+        return self._registry
+
+    def _save_registry(self):
+        with open(self._registry_file(), 'w', encoding='utf-8') as f:
+            json.dump(self._registry, f, indent=4)
+
+    @staticmethod
+    def _count_mods(mods: list[dict]) -> dict:
+        counts = {"installed": 0, "pending": 0}
+        for mod in mods:
+            status = mod.get('status')
+            if status in counts:
+                counts[status] += 1
+        return counts
+
+    def rebuild_registry(self) -> dict[str, dict]:
+        """Reconstruye el registro recorriendo la carpeta gamedata (ruta de reparación)."""
+        registry = {}
+        for p in self.gamedata_path.iterdir():
+            if p.is_dir() and (p / "game_info.json").exists():
+                app_id = p.name
+                info = self.get_game_info(app_id)
+                registry[app_id] = {
+                    "app_id": app_id,
+                    "name": info.get('name', 'Nombre Desconocido'),
+                    "mod_install_path": info.get('mod_install_path', ''),
+                    "mod_counts": self._count_mods(self.get_mods_for_game(app_id))
+                }
+        with self._lock:
+            self._registry = registry
+            self._save_registry()
+        return dict(registry)
+
+    def _update_registry_entry(self, app_id: str, **fields):
+        with self._lock:
+            entry = self._load_registry().setdefault(str(app_id), {
+                "app_id": str(app_id),
+                "name": 'Nombre Desconocido',
+                "mod_install_path": '',
+                "mod_counts": {"installed": 0, "pending": 0}
+            })
+            entry.update(fields)
+            self._save_registry()
 
     def get_game_path(self, app_id: str) -> Path:
         """Devuelve la ruta base para un juego específico."""
@@ -16,11 +101,7 @@ class DataManager:
 
     def list_managed_games(self) -> list[str]:
         """Devuelve una lista de AppIDs de todos los juegos gestionados."""
-        games = []
-        for p in self.gamedata_path.iterdir():
-            if p.is_dir() and (p / "game_info.json").exists():
-                games.append(p.name)
-        return sorted(games)
+        return sorted(self.get_registry().keys())
 
     def get_game_info(self, app_id: str) -> dict:
         """Lee el archivo game_info.json de un juego."""
@@ -40,9 +121,16 @@ class DataManager:
         (game_path / "staging").mkdir(exist_ok=True)
         with open(game_path / "game_info.json", 'w', encoding='utf-8') as f:
             json.dump(data, f, indent=4)
+        self._update_registry_entry(app_id, name=data.get('name', 'Nombre Desconocido'), mod_install_path=data.get('mod_install_path', ''))
 
     def get_mods_for_game(self, app_id: str) -> list[dict]:
-        """Lee el archivo mods.json de un juego."""
+        """
+        Lee el archivo mods.json de un juego. Dentro de un batch() devuelve la lista en memoria, pero
+        solo al hilo que abrió el batch: los demás ven lo último que se guardó.
+        """
+        batch = self._batches.get(str(app_id))
+        if batch is not None and batch['thread'] == threading.get_ident():
+            return batch['mods']
         mods_file = self.get_game_path(app_id) / "mods.json"
         if not mods_file.exists():
             return []
@@ -53,28 +141,125 @@ class DataManager:
             return []
 
     def save_mods_for_game(self, app_id: str, mods_data: list[dict]):
-        """Guarda la lista de mods en el mods.json de un juego."""
+        """Guarda la lista de mods en el mods.json de un juego. Dentro de un batch() la escritura se aplaza."""
+        batch = self._batches.get(str(app_id))
+        if batch is not None and batch['thread'] == threading.get_ident():
+            batch['mods'] = mods_data
+            batch['dirty'] = True
+        else:
+            self._write_mods_file(app_id, mods_data)
+        for callback in self._mods_listeners:
+            callback(str(app_id), mods_data)
+
+    def _write_mods_file(self, app_id: str, mods_data: list[dict]):
         game_path = self.get_game_path(app_id)
         game_path.mkdir(exist_ok=True)
-        with open(game_path / "mods.json", 'w', encoding='utf-8') as f:
-            json.dump(mods_data, f, indent=4)
+        # Se escribe en un temporal y se renombra para que un lector en otro hilo nunca vea el archivo a medias
+        temp_file = game_path / "mods.json.tmp"
+        with self._lock:
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(mods_data, f, indent=4)
+            os.replace(temp_file, game_path / "mods.json")
+        if str(app_id) in self.get_registry():
+            self._update_registry_entry(app_id, mod_counts=self._count_mods(mods_data))
 
-    def add_mod_to_game(self, app_id: str, workshop_id: str, mod_name: str) -> bool:
+    @contextmanager
+    def batch(self, app_id: str):
+        """
+        Agrupa varias modificaciones de mods.json en una sola lectura y una sola escritura.
+        Admite anidamiento; solo el batch más externo escribe al salir, y solo si hubo cambios.
+        Si el bloque lanza una excepción los cambios se descartan y los listeners reciben de
+        nuevo el contenido guardado. No debe mantenerse abierto durante un bucle de eventos anidado
+        (un diálogo modal), porque otras escrituras del mismo juego quedarían retenidas en él.
+        Mientras está abierto, las escrituras desde otros hilos esperan a que termine.
+        """
+        with self._lock:
+            key = str(app_id)
+            batch = self._batches.get(key)
+            if batch is None:
+                batch = {'mods': self.get_mods_for_game(app_id), 'dirty': False, 'depth': 0, 'thread': threading.get_ident()}
+                self._batches[key] = batch
+            batch['depth'] += 1
+            try:
+                yield batch['mods']
+            except BaseException:
+                batch['depth'] -= 1
+                if batch['depth'] == 0:
+                    del self._batches[key]
+                    if batch['dirty']:
+                        saved_mods = self.get_mods_for_game(app_id)
+                        for callback in self._mods_listeners:
+                            callback(key, saved_mods)
+                raise
+            else:
+                batch['depth'] -= 1
+                if batch['depth'] == 0:
+                    del self._batches[key]
+                    if batch['dirty']:
+                        self._write_mods_file(app_id, batch['mods'])
+
+    def add_mod_to_game(self, app_id: str, workshop_id: str, mod_name: str, origin: str | None = None) -> bool:
         """Añade un nuevo mod al estado 'pending' si no existe ya."""
-        mods = self.get_mods_for_game(app_id)
-        
-        if any(mod.get('workshop_id') == workshop_id for mod in mods):
-            return False
-
-        new_mod = {
-            "workshop_id": workshop_id,
-            "name": mod_name.strip(),
-            "status": "pending",
-            "time_updated": int(time.time()),
-            "local_path": ""
-        }
-        mods.append(new_mod)
-        self.save_mods_for_game(app_id, mods)
-        return True
+        return self.add_mods_to_game(app_id, [(workshop_id, mod_name)], origin) == 1
+
+    def add_mods_to_game(self, app_id: str, new_mods: list[tuple[str, str]], origin: str | None = None) -> int:
+        """
+        Añade varios mods (workshop_id, nombre) como 'pending' con una única escritura. Devuelve cuántos se añadieron.
+        `origin` = 'dependency' marca los que se añaden solo por ser dependencia de otro mod (se pueden podar después).
+        """
+        with self._lock:
+            mods = self.get_mods_for_game(app_id)
+            known_ids = {mod.get('workshop_id') for mod in mods}
+            added = 0
+            now = int(time.time())
+            for workshop_id, mod_name in new_mods:
+                if workshop_id in known_ids:
+                    continue
+                known_ids.add(workshop_id)
+                mod = {
+                    "workshop_id": workshop_id,
+                    "name": mod_name.strip(),
+                    "status": "pending",
+                    "time_updated": now,
+                    "local_path": ""
+                }
+                if origin:
+                    mod["origin"] = origin
+                mods.append(mod)
+                added += 1
+            if added:
+                self.save_mods_for_game(app_id, mods)
+            return added
+
+    def remove_mods_from_game(self, app_id: str, workshop_ids, status: str | None = None) -> list[dict]:
+        """Quita varios mods (opcionalmente solo los que tengan un estado dado) con una única escritura. Devuelve los quitados."""
+        with self._lock:
+            ids = set(workshop_ids)
+            kept, removed = [], []
+            for mod in self.get_mods_for_game(app_id):
+                if mod.get('workshop_id') in ids and (status is None or mod.get('status') == status):
+                    removed.append(mod)
+                else:
+                    kept.append(mod)
+            if removed:
+                self.save_mods_for_game(app_id, kept)
+            return removed
+
+    def set_mods_status(self, app_id: str, updates: dict[str, dict]) -> int:
+        """
+        Actualiza campos (p. ej. 'status', 'local_path') de varios mods con una única escritura.
+        `updates` mapea workshop_id -> campos a actualizar. Devuelve cuántos mods se modificaron.
+        """
+        with self._lock:
+            mods = self.get_mods_for_game(app_id)
+            changed = 0
+            for mod in mods:
+                fields = updates.get(mod.get('workshop_id'))
+                if fields:
+                    mod.update(fields)
+                    changed += 1
+            if changed:
+                self.save_mods_for_game(app_id, mods)
+            return changed
 
 data_manager = DataManager()
\ No newline at end of file
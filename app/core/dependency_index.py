@@ -0,0 +1,73 @@
+#app/core/dependency_index.py
+import sqlite3
+from app.core.cache_index import CacheIndex
+from app.core.data_manager import data_manager
+
+class DependencyIndex(CacheIndex):
+    """
+    Índice inverso de dependencias (SQLite) sobre los detalles de mods guardados en caché: para cada
+    dependencia, qué mods la requieren. Hay una base de datos por juego (gamedata/<appid>/dependencies.db)
+    que se actualiza incrementalmente con cada guardado en caché, así que saber quién requiere un mod es
+    una consulta por índice en lugar de recorrer todos los JSON de la caché.
+    """
+    DB_NAME = "dependencies.db"
+    TABLE = "edges"
+    _MAX_PARAMS = 500 # Parámetros por consulta IN (SQLite admite 999 en versiones antiguas)
+
+    def _create_schema(self, conn: sqlite3.Connection):
+        conn.execute("CREATE TABLE IF NOT EXISTS edges (workshop_id TEXT NOT NULL, dep_id TEXT NOT NULL, PRIMARY KEY (workshop_id, dep_id))")
+        conn.execute("CREATE INDEX IF NOT EXISTS edges_by_dep ON edges (dep_id)")
+
+    def _rows_for(self, workshop_id: str, data: dict) -> list[tuple]:
+        dep_ids = {str(dep['id']) for dep in data.get('dependencies', []) if dep.get('id')}
+        return [(str(workshop_id), dep_id) for dep_id in dep_ids if dep_id != str(workshop_id)]
+
+    def _insert_rows(self, conn: sqlite3.Connection, rows: list[tuple]):
+        conn.executemany("INSERT OR IGNORE INTO edges (workshop_id, dep_id) VALUES (?, ?)", rows)
+
+    def required_by(self, app_id: str, workshop_id: str) -> list[str]:
+        """Mods (con detalles en caché) que declaran a workshop_id como dependencia."""
+        with self._lock:
+            rows = self._get_connection(app_id).execute("SELECT workshop_id FROM edges WHERE dep_id = ?", (str(workshop_id),)).fetchall()
+        return [row[0] for row in rows]
+
+    def required_by_many(self, app_id: str, workshop_ids) -> dict[str, set[str]]:
+        """Como required_by, para varios mods a la vez. Solo incluye los que alguien requiere."""
+        ids = [str(wid) for wid in workshop_ids]
+        result: dict[str, set[str]] = {}
+        with self._lock:
+            conn = self._get_connection(app_id)
+            for start in range(0, len(ids), self._MAX_PARAMS):
+                chunk = ids[start:start + self._MAX_PARAMS]
+                placeholders = ",".join("?" * len(chunk))
+                for workshop_id, dep_id in conn.execute(f"SELECT workshop_id, dep_id FROM edges WHERE dep_id IN ({placeholders})", chunk):
+                    result.setdefault(dep_id, set()).add(workshop_id)
+        return result
+
+    @staticmethod
+    def missing_details(app_id: str, workshop_ids) -> list[str]:
+        """Mods sin detalles en caché: no se sabe qué dependencias tienen."""
+        cache_dir = data_manager.get_game_path(app_id) / "cache"
+        return sorted(wid for wid in workshop_ids if not (cache_dir / f"{wid}.json").exists())
+
+    def find_orphans(self, app_id: str, managed_ids, dependency_ids, removing=()) -> list[str]:
+        """
+        Mods de `dependency_ids` (instalados solo como dependencia de otros) a los que ya no requiere
+        ningún mod gestionado (instalado o pendiente), suponiendo eliminados los de `removing`. Se repite
+        hasta que no aparecen más, porque quitar un huérfano puede dejar huérfanas sus dependencias.
+        Solo es fiable si todos los mods gestionados tienen sus detalles en caché (ver missing_details).
+        """
+        managed = set(managed_ids) - set(removing)
+        candidates = set(dependency_ids) & managed
+        dependents = self.required_by_many(app_id, candidates)
+        orphans = []
+        while True:
+            found = [wid for wid in candidates if not (dependents.get(wid, set()) & managed)]
+            if not found:
+                return sorted(orphans)
+            orphans.extend(found)
+            managed.difference_update(found)
+            candidates.difference_update(found)
+
+# Instancia única para ser usada en toda la aplicación
+dependency_index = DependencyIndex()
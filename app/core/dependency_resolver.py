@@ -1,14 +1,20 @@
 #app/core/dependency_resolver.py
+from PyQt6.QtCore import QObject, pyqtSignal, QRunnable
 from PyQt6.QtWidgets import QMessageBox
 from PyQt6.QtGui import QColor
 
 from app.core.data_manager import data_manager
+from app.core.mod_repository import mod_repository
 from app.core.cache_manager import cache_manager
+from app.core.steam_api_handler import steam_api_handler
+from app.core.metadata_warmup import api_item_to_details
+from app.core.tracer import tracer
 from app.ui.dialogs.dependency_dialog import DependencyDialog
 
 def resolve_dependencies(app_id: str, initial_mods: list[dict], parent_widget) -> list[dict] | None:
     """
     Función síncrona y recursiva para resolver todas las dependencias de una lista de mods.
+    Solo lee la caché: los detalles se precargan antes con DependencyPrefetchWorker.
 
     Args:
         app_id (str): El AppID del juego actual.
@@ -18,12 +24,63 @@ def resolve_dependencies(app_id: str, initial_mods: list[dict], parent_widget) -
     Returns:
         list[dict] | None: La lista final y completa de mods a descargar, o None si el usuario cancela.
     """
+    with tracer.span("resolve_dependencies", "resolve", app_id=app_id, mods=len(initial_mods)):
+        return _resolve_dependencies(app_id, initial_mods, parent_widget)
+
+class DependencyPrefetchSignals(QObject):
+    finished = pyqtSignal(int)  # Número de mods que se añadieron a la caché
+
+class DependencyPrefetchWorker(QRunnable):
+    """
+    Guarda en caché, con llamadas por lotes a la API Web, los detalles y dependencias de los mods
+    y de todas sus dependencias (nivel a nivel) que aún no los tengan, para que resolve_dependencies
+    solo tenga que leer la caché desde el hilo de la interfaz. Sin clave de API no hace nada.
+    """
+    def __init__(self, app_id: str, workshop_ids: list[str]):
+        super().__init__()
+        self.app_id = app_id
+        self.workshop_ids = workshop_ids
+        self.signals = DependencyPrefetchSignals()
+
+    def run(self):
+        cached = 0
+        with tracer.span("resolve.prefetch", "resolve", items=len(self.workshop_ids)):
+            try:
+                cached = _prefetch_dependencies(self.app_id, self.workshop_ids)
+            finally:
+                self.signals.finished.emit(cached)
+
+def _prefetch_dependencies(app_id: str, workshop_ids: list[str]) -> int:
+    seen = set(workshop_ids)
+    level = list(workshop_ids)
+    cached = 0
+    while level:
+        missing = [wid for wid in level if not cache_manager.get_mod_cache(app_id, wid)]
+        if missing:
+            details = steam_api_handler.get_published_file_details(missing, include_children=True)
+            if details is None:
+                break
+            for workshop_id, dependencies in steam_api_handler.dependencies_from_details(details).items():
+                cache_manager.save_mod_cache(app_id, workshop_id, api_item_to_details(details[workshop_id], dependencies))
+                cached += 1
+        next_level = []
+        for workshop_id in level:
+            mod_details = cache_manager.get_mod_cache(app_id, workshop_id) or {}
+            for dep in mod_details.get('dependencies', []):
+                dep_id = dep.get('id')
+                if dep_id and dep_id not in seen:
+                    seen.add(dep_id)
+                    next_level.append(dep_id)
+        level = next_level
+    return cached
+
+def _resolve_dependencies(app_id: str, initial_mods: list[dict], parent_widget) -> list[dict] | None:
     full_download_queue = {mod['workshop_id']: mod for mod in initial_mods}
     processed_ids = set()
     ids_to_check = list(full_download_queue.keys())
 
     # Obtener todos los mods ya instalados
-    installed_mods_ids = {mod['workshop_id'] for mod in data_manager.get_mods_for_game(app_id) if mod.get('status') == 'installed'}
+    installed_mods_ids = mod_repository.game(app_id).ids('installed')
 
     while ids_to_check:
         workshop_id = ids_to_check.pop(0)
@@ -58,15 +115,15 @@ def resolve_dependencies(app_id: str, initial_mods: list[dict], parent_widget) -
                 if not newly_added_deps:
                     pass
                 else:
+                    deps_to_register = []
                     for new_dep in newly_added_deps:
                         new_id = new_dep['workshop_id']
                         if new_id not in full_download_queue:
                             full_download_queue[new_id] = new_dep
                             ids_to_check.append(new_id)
-                            # Añadir a la base de datos como pendiente si no estaba ya
-                            data_manager.add_mod_to_game(app_id, new_id, new_dep['name'])
-                    
-                    parent_widget.update_mod_lists()
+                            deps_to_register.append((new_id, new_dep['name']))
+                    # Añadir a la base de datos como pendientes los que no estuvieran ya
+                    data_manager.add_mods_to_game(app_id, deps_to_register, origin='dependency')
             else:
                 QMessageBox.information(parent_widget, "Cancelado", "Proceso de descarga cancelado durante la resolución de dependencias.")
                 return None
@@ -0,0 +1,134 @@
+#app/core/description_renderer.py
+import html
+import re
+from bs4 import NavigableString, Comment, Tag
+
+# Etiquetas que se conservan tal cual (sin atributos)
+ALLOWED_TAGS = {'b', 'strong', 'i', 'em', 'u', 's', 'br', 'p', 'ul', 'ol', 'li', 'blockquote', 'pre', 'code', 'hr',
+                'table', 'tr', 'td', 'th', 'h1', 'h2', 'h3', 'h4'}
+# Clases con las que Steam representa el BBCode, traducidas a HTML sencillo
+STEAM_CLASS_TAGS = {'bb_h1': 'h3', 'bb_h2': 'h4', 'bb_h3': 'h4', 'bb_code': 'pre', 'bb_blockquote': 'blockquote',
+                    'bb_ul': 'ul', 'bb_ol': 'ol', 'bb_table': 'table', 'bb_table_tr': 'tr', 'bb_table_td': 'td',
+                    'bb_table_th': 'th', 'bb_spoiler': 'i'}
+DROPPED_TAGS = {'script', 'style', 'iframe', 'object', 'embed', 'form', 'input', 'button'}
+BLOCK_TAGS = {'p', 'ul', 'ol', 'blockquote', 'pre', 'table', 'h1', 'h2', 'h3', 'h4', 'hr', 'div'}
+
+SHORT_DESCRIPTION_CHARS = 20000 # Las descripciones más largas se muestran primero recortadas
+EXPAND_DESCRIPTION_URL = "moddownloader:full-description"
+
+# Etiquetas BBCode de la Workshop (descripciones que devuelve la API) y su equivalente HTML
+BBCODE_TAGS = {'b': 'b', 'i': 'i', 'u': 'u', 'strike': 's', 'spoiler': 'i', 'h1': 'h3', 'h2': 'h4', 'h3': 'h4',
+               'quote': 'blockquote', 'code': 'pre', 'list': 'ul', 'olist': 'ol', 'table': 'table',
+               'tr': 'tr', 'td': 'td', 'th': 'th'}
+_BBCODE_TAG_RE = re.compile(r"\[(/?)(\*|\w+)(?:=([^\]]*))?\]")
+_BBCODE_URL_RE = re.compile(r"\[url\](.*?)\[/url\]", re.IGNORECASE | re.DOTALL)
+_BBCODE_IMG_RE = re.compile(r"\[img\](.*?)\[/img\]", re.IGNORECASE | re.DOTALL)
+_BLOCK_NEWLINE_RE = re.compile(r"(</?(?:ul|ol|li|table|tr|td|th|h3|h4|pre|blockquote)>|<hr>)\n")
+
+def _render_node(node) -> str:
+    if isinstance(node, Comment):
+        return ""
+    if isinstance(node, NavigableString):
+        return html.escape(str(node), quote=False)
+    if not isinstance(node, Tag) or node.name in DROPPED_TAGS:
+        return ""
+
+    inner = "".join(_render_node(child) for child in node.children)
+    name = node.name
+    for css_class in node.get('class', []):
+        if css_class in STEAM_CLASS_TAGS:
+            name = STEAM_CLASS_TAGS[css_class]
+            break
+
+    if name == 'br':
+        return "<br>"
+    if name == 'hr':
+        return "<hr>"
+    if name == 'a':
+        href = node.get('href', '')
+        if href.startswith(('http://', 'https://')):
+            return f'<a href="{html.escape(href)}">{inner}</a>'
+        return inner
+    if name == 'img':
+        # Las imágenes remotas se enlazan en lugar de incrustarse para no descargarlas al renderizar
+        src = node.get('src', '')
+        return f'<a href="{html.escape(src)}">[imagen]</a>' if src.startswith(('http://', 'https://')) else ""
+    if name in ALLOWED_TAGS:
+        return f"<{name}>{inner}</{name}>"
+    if name == 'div':
+        return f"<p>{inner}</p>" if inner.strip() else ""
+    return inner # span y demás contenedores: solo su contenido
+
+def render_description_html(description_div: Tag) -> tuple[str, str | None]:
+    """
+    Convierte el div de descripción de la Workshop en HTML compacto y seguro para QTextBrowser.
+    Devuelve (html_completo, html_recortado); el recortado es None si la descripción es corta.
+    """
+    blocks, current = [], []
+    for child in description_div.children:
+        rendered = _render_node(child)
+        if not rendered:
+            continue
+        current.append(rendered)
+        # Se corta entre bloques para que el HTML recortado siga bien formado
+        if isinstance(child, Tag) and (child.name in BLOCK_TAGS or child.name == 'br'):
+            blocks.append("".join(current))
+            current = []
+    if current:
+        blocks.append("".join(current))
+
+    full_html = "".join(blocks)
+    if len(full_html) <= SHORT_DESCRIPTION_CHARS:
+        return full_html, None
+    return full_html, _shorten(blocks)
+
+def _shorten(blocks: list[str]) -> str:
+    short_blocks, length = [], 0
+    for block in blocks:
+        if length + len(block) > SHORT_DESCRIPTION_CHARS and short_blocks:
+            break
+        short_blocks.append(block)
+        length += len(block)
+    return "".join(short_blocks) + f'<p><a href="{EXPAND_DESCRIPTION_URL}"><b>Mostrar descripción completa...</b></a></p>'
+
+def text_to_html(text: str) -> str:
+    """Renderiza una descripción en texto plano (cachés antiguas) como HTML escapado."""
+    return html.escape(text, quote=False).replace('\n', '<br>')
+
+def _bbcode_tag_to_html(match: re.Match) -> str:
+    closing, tag, argument = match.group(1), match.group(2).lower(), match.group(3)
+    if tag == 'img':
+        return match.group(0) # Se resuelve después, junto con su URL
+    if tag == '*':
+        return "<li>"
+    if tag == 'hr':
+        return "" if closing else "<hr>"
+    if tag == 'url':
+        if closing:
+            return "</a>"
+        return f'<a href="{argument}">' if argument and argument.startswith(('http://', 'https://')) else "<a>"
+    if tag in BBCODE_TAGS:
+        return f"<{closing}{BBCODE_TAGS[tag]}>"
+    return "" # noparse, previewyoutube y demás etiquetas sin equivalente
+
+def render_bbcode_html(text: str) -> tuple[str, str | None]:
+    """
+    Convierte una descripción en BBCode (la que devuelve la API Web) en HTML para QTextBrowser.
+    Devuelve (html_completo, html_recortado) igual que render_description_html.
+    """
+    escaped = html.escape(text, quote=True)
+    escaped = _BBCODE_URL_RE.sub(lambda m: f'[url={m.group(1).strip()}]{m.group(1).strip()}[/url]', escaped)
+    rendered = _BLOCK_NEWLINE_RE.sub(r"\1", _BBCODE_TAG_RE.sub(_bbcode_tag_to_html, escaped))
+    # Las imágenes remotas se enlazan en lugar de incrustarse, como en render_description_html
+    rendered = _BBCODE_IMG_RE.sub(lambda m: f'<a href="{m.group(1).strip()}">[imagen]</a>'
+                                  if m.group(1).strip().startswith(('http://', 'https://')) else "", rendered)
+    # Se corta por párrafos para que el recortado no parta una línea por la mitad
+    blocks = [block + "<br>" for block in rendered.split("\n")]
+    full_html = "".join(blocks)
+    if len(full_html) <= SHORT_DESCRIPTION_CHARS:
+        return full_html, None
+    return full_html, _shorten(blocks)
+
+def bbcode_to_text(text: str) -> str:
+    """Quita las etiquetas BBCode de una descripción para guardarla como texto plano."""
+    return _BBCODE_TAG_RE.sub("", _BBCODE_IMG_RE.sub("", text)).strip()
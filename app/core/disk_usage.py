@@ -0,0 +1,137 @@
+#app/core/disk_usage.py
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from PyQt6.QtCore import QObject, pyqtSignal, QRunnable
+from app.core.data_manager import data_manager
+from app.core.mod_repository import mod_repository
+from app.core.download_planner import get_staging_path
+from app.core.uninstaller import TRASH_DIR_NAME
+from app.core.tracer import tracer
+
+CACHE_FILE = "disk_usage.json"
+SCAN_WORKERS = 8
+
+class DirSizeCache:
+    """
+    Caché de tamaños por directorio: ruta -> {'mtime', 'files', 'subdirs'}. Si el mtime de un
+    directorio no ha cambiado, sus archivos directos y subdirectorios son los mismos, así que
+    se reutiliza su suma sin volver a listarlo.
+    """
+    def __init__(self, entries: dict | None = None):
+        self.entries = entries or {}
+        self._lock = threading.Lock()
+
+    def dir_size(self, path: str) -> int:
+        total = 0
+        stack = [path]
+        while stack:
+            current = stack.pop()
+            try:
+                mtime = os.stat(current).st_mtime_ns
+            except OSError:
+                continue
+            with self._lock:
+                cached = self.entries.get(current)
+            if cached and cached['mtime'] == mtime:
+                files_bytes, subdirs = cached['files'], cached['subdirs']
+            else:
+                files_bytes, subdirs = 0, []
+                try:
+                    with os.scandir(current) as it:
+                        for entry in it:
+                            try:
+                                if entry.is_dir(follow_symlinks=False):
+                                    subdirs.append(entry.path)
+                                elif entry.is_file(follow_symlinks=False):
+                                    files_bytes += entry.stat(follow_symlinks=False).st_size
+                            except OSError:
+                                continue
+                except OSError:
+                    continue
+                with self._lock:
+                    self.entries[current] = {'mtime': mtime, 'files': files_bytes, 'subdirs': subdirs}
+            total += files_bytes
+            stack.extend(subdirs)
+        return total
+
+    def prune(self, roots: list[str]):
+        """Olvida las entradas que ya no cuelgan de ninguna de las raíces escaneadas."""
+        prefixes = tuple(roots)
+        with self._lock:
+            self.entries = {p: e for p, e in self.entries.items() if p.startswith(prefixes)}
+
+def _load_cache(app_id: str) -> DirSizeCache:
+    try:
+        with open(data_manager.get_game_path(app_id) / CACHE_FILE, 'r', encoding='utf-8') as f:
+            return DirSizeCache(json.load(f))
+    except (OSError, json.JSONDecodeError, TypeError):
+        return DirSizeCache()
+
+def _save_cache(app_id: str, cache: DirSizeCache):
+    try:
+        with open(data_manager.get_game_path(app_id) / CACHE_FILE, 'w', encoding='utf-8') as f:
+            json.dump(cache.entries, f)
+    except OSError as e:
+        print(f"ADVERTENCIA: No se pudo guardar la caché de uso de disco: {e}")
+
+def _list_mod_folders(install_dir: Path) -> list[os.DirEntry]:
+    """Subcarpetas de la ruta de mods (sin la papelera). Las entradas que no se pueden leer se omiten."""
+    folders = []
+    try:
+        with os.scandir(install_dir) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False) and entry.name != TRASH_DIR_NAME:
+                        folders.append(entry)
+                except OSError:
+                    continue
+    except OSError as e:
+        print(f"ADVERTENCIA: No se pudo listar la carpeta de mods '{install_dir}': {e}")
+    return folders
+
+def scan_game(app_id: str) -> dict:
+    """
+    Calcula en paralelo el tamaño de cada carpeta de mod en mod_install_path y el de la carpeta
+    de contenido de SteamCMD del juego. Devuelve:
+    {'mods': {workshop_id: bytes}, 'orphans': {carpeta: bytes}, 'total': bytes, 'staging': bytes}
+    """
+    install_dir = Path(data_manager.get_game_info(app_id).get('mod_install_path', ''))
+    known_ids = mod_repository.game(app_id).ids()
+    staging_dir = get_staging_path() / "content" / str(app_id)
+    cache = _load_cache(app_id)
+
+    folders = []
+    if str(install_dir) not in ('', '.') and install_dir.is_dir():
+        folders = _list_mod_folders(install_dir)
+
+    with tracer.span("disk_usage.scan", "disk", app_id=app_id, folders=len(folders)):
+        with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as executor:
+            sizes = dict(zip((f.name for f in folders), executor.map(lambda f: cache.dir_size(f.path), folders)))
+            staging_size = cache.dir_size(str(staging_dir)) if staging_dir.is_dir() else 0
+
+    cache.prune([p for p in (str(install_dir), str(staging_dir)) if p not in ('', '.')])
+    _save_cache(app_id, cache)
+
+    mods = {name: size for name, size in sizes.items() if name in known_ids}
+    orphans = {name: size for name, size in sizes.items() if name not in known_ids}
+    return {'mods': mods, 'orphans': orphans, 'total': sum(sizes.values()), 'staging': staging_size}
+
+class DiskUsageSignals(QObject):
+    finished = pyqtSignal(str, dict) # (app_id, informe)
+
+class DiskUsageWorker(QRunnable):
+    """Ejecuta scan_game fuera del hilo de la UI."""
+    def __init__(self, app_id: str):
+        super().__init__()
+        self.signals = DiskUsageSignals()
+        self.app_id = app_id
+
+    def run(self):
+        try:
+            report = scan_game(self.app_id)
+        except RuntimeError: # La aplicación se cerró durante el escaneo: no hay informe que mostrar
+            return
+        self.signals.finished.emit(self.app_id, report)
\ No newline at end of file
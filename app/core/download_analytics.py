@@ -0,0 +1,150 @@
+#app/core/download_analytics.py
+import csv
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from app.core.data_manager import data_manager
+from app.core.run_history import list_runs
+
+# Columnas de cada mod en la exportación: las de run_items más las de su ejecución
+EXPORT_FIELDS = ['run_id', 'started', 'attempt', 'shards', 'copy_threads', 'workshop_id', 'name', 'position',
+                 'queue_s', 'download_s', 'bytes', 'install_s', 'outcome', 'failure_reason']
+
+class DownloadAnalytics:
+    """
+    Histórico de las descargas de cada juego en SQLite (gamedata/<appid>/downloads.db): una fila por
+    ejecución de SteamCMD y otra por mod con su tiempo en cola, duración de la descarga, bytes,
+    número de intento en la cadena de reintentos, tiempo de instalación y motivo del fallo. Alimenta el informe de descargas y su
+    exportación a CSV/JSON para ajustar el paralelismo y las ventanas de sincronización.
+    """
+    DB_NAME = "downloads.db"
+
+    def __init__(self):
+        self._connections: dict[str, sqlite3.Connection] = {}
+        self._lock = threading.Lock()
+
+    def _get_connection(self, app_id: str) -> sqlite3.Connection:
+        key = str(app_id)
+        conn = self._connections.get(key)
+        if conn is None:
+            db_path = data_manager.get_game_path(app_id) / self.DB_NAME
+            is_new = not db_path.exists()
+            conn = sqlite3.connect(db_path, check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS runs (run_id TEXT PRIMARY KEY, started REAL NOT NULL, finished REAL, "
+                "attempt INTEGER, shards INTEGER, copy_threads INTEGER, items INTEGER, succeeded INTEGER, "
+                "bytes INTEGER, download_s REAL, install_s REAL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS run_items (run_id TEXT NOT NULL, workshop_id TEXT NOT NULL, position INTEGER, "
+                "queue_s REAL, download_s REAL, bytes INTEGER, attempt INTEGER, install_s REAL, outcome TEXT NOT NULL, "
+                "failure_reason TEXT, PRIMARY KEY (run_id, workshop_id))"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS run_items_by_mod ON run_items (workshop_id)")
+            self._connections[key] = conn
+            if is_new:
+                self._import_run_index(app_id, conn)
+        return conn
+
+    def _import_run_index(self, app_id: str, conn: sqlite3.Connection):
+        """Importa las ejecuciones anteriores al histórico desde el índice de logs (solo resultados, sin tiempos)."""
+        for run in list_runs(app_id):
+            outcomes = run.get('outcomes', {})
+            items = [{'workshop_id': wid, 'position': i, 'outcome': outcomes.get(wid, 'failed')}
+                     for i, wid in enumerate(run.get('items', []))]
+            self._insert_run(conn, dict(run, item_stats=items))
+
+    @staticmethod
+    def _insert_run(conn: sqlite3.Connection, run: dict):
+        items = run.get('item_stats', [])
+        succeeded = [item for item in items if item.get('outcome') == 'succeeded']
+        download_end = run.get('install_started') or run.get('finished')
+        # Las ejecuciones importadas del índice de logs no tienen bytes: quedan fuera del rendimiento
+        total_bytes = sum(item.get('bytes') or 0 for item in succeeded) if any('bytes' in item for item in items) else None
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO runs (run_id, started, finished, attempt, shards, copy_threads, items, succeeded, "
+                "bytes, download_s, install_s) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (run['run_id'], run['started'], run.get('finished'), run.get('attempt', 0), run.get('shards', 1),
+                 run.get('copy_threads'), len(items), len(succeeded), total_bytes,
+                 download_end - run['started'] if download_end else None,
+                 run['finished'] - run['install_started'] if run.get('install_started') and run.get('finished') else None))
+            conn.executemany(
+                "INSERT OR REPLACE INTO run_items (run_id, workshop_id, position, queue_s, download_s, bytes, attempt, "
+                "install_s, outcome, failure_reason) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(run['run_id'], item['workshop_id'], item.get('position'), item.get('queue_s'), item.get('download_s'),
+                  item.get('bytes'), item.get('attempt', run.get('attempt', 0)), item.get('install_s'), item['outcome'], item.get('failure_reason'))
+                 for item in items])
+
+    def record_run(self, app_id: str, run: dict):
+        """Guarda una ejecución tal como la devuelve RunLogWriter.close()."""
+        with self._lock:
+            self._insert_run(self._get_connection(app_id), run)
+
+    def _query(self, app_id: str, sql: str, params=()) -> list[dict]:
+        with self._lock:
+            cursor = self._get_connection(app_id).execute(sql, params)
+            columns = [col[0] for col in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def summary(self, app_id: str) -> dict:
+        return self._query(app_id,
+            "SELECT COUNT(DISTINCT run_id) AS runs, COUNT(*) AS items, COALESCE(SUM(outcome = 'failed'), 0) AS failed, "
+            "AVG(queue_s) AS avg_queue_s, AVG(download_s) AS avg_download_s, AVG(install_s) AS avg_install_s FROM run_items")[0]
+
+    def slowest_mods(self, app_id: str, limit: int = 20) -> list[dict]:
+        """Mods con la descarga media más lenta."""
+        return self._query(app_id,
+            "SELECT workshop_id, COUNT(*) AS downloads, AVG(download_s) AS avg_download_s, MAX(download_s) AS max_download_s, "
+            "AVG(bytes) AS avg_bytes, SUM(outcome = 'failed') AS failed FROM run_items WHERE download_s IS NOT NULL "
+            "GROUP BY workshop_id ORDER BY avg_download_s DESC LIMIT ?", (limit,))
+
+    def failure_rate_by_hour(self, app_id: str) -> list[dict]:
+        """Mods intentados y fallidos según la hora local a la que empezó la ejecución."""
+        return self._query(app_id,
+            "SELECT CAST(strftime('%H', r.started, 'unixepoch', 'localtime') AS INTEGER) AS hour, COUNT(*) AS items, "
+            "SUM(i.outcome = 'failed') AS failed FROM run_items i JOIN runs r USING (run_id) GROUP BY hour ORDER BY hour")
+
+    def throughput_by_parallelism(self, app_id: str) -> list[dict]:
+        """Bytes por segundo de la fase de descarga según los procesos de SteamCMD y los hilos de copia usados."""
+        return self._query(app_id,
+            "SELECT shards, copy_threads, COUNT(*) AS runs, SUM(items) AS items, SUM(bytes) AS bytes, "
+            "SUM(bytes) / SUM(download_s) AS bytes_per_s, AVG(install_s) AS avg_install_s FROM runs "
+            "WHERE download_s > 0 AND bytes IS NOT NULL GROUP BY shards, copy_threads ORDER BY shards, copy_threads")
+
+    def items(self, app_id: str) -> list[dict]:
+        """Todas las filas por mod con los datos de su ejecución, de la más reciente a la más antigua."""
+        return self._query(app_id,
+            "SELECT i.run_id, r.started, i.attempt, r.shards, r.copy_threads, i.workshop_id, i.position, i.queue_s, "
+            "i.download_s, i.bytes, i.install_s, i.outcome, i.failure_reason FROM run_items i "
+            "JOIN runs r USING (run_id) ORDER BY r.started DESC, i.position")
+
+    def export(self, app_id: str, path: str | Path, names: dict[str, str] | None = None) -> int:
+        """
+        Exporta el histórico a CSV (una fila por mod y ejecución) o, si la extensión es .json, a JSON con
+        las filas y los agregados del informe. Devuelve el número de filas exportadas.
+        """
+        names = names or {}
+        rows = [dict(row, name=names.get(row['workshop_id'], '')) for row in self.items(app_id)]
+        path = Path(path)
+        if path.suffix.lower() == '.json':
+            data = {
+                "app_id": str(app_id),
+                "summary": self.summary(app_id),
+                "slowest_mods": self.slowest_mods(app_id),
+                "failure_rate_by_hour": self.failure_rate_by_hour(app_id),
+                "throughput_by_parallelism": self.throughput_by_parallelism(app_id),
+                "items": rows
+            }
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
+        else:
+            with open(path, 'w', encoding='utf-8', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=EXPORT_FIELDS)
+                writer.writeheader()
+                writer.writerows(rows)
+        return len(rows)
+
+# Instancia única para ser usada en toda la aplicación
+download_analytics = DownloadAnalytics()
@@ -0,0 +1,144 @@
+#app/core/download_planner.py
+import os
+import shutil
+from pathlib import Path
+from PyQt6.QtCore import QObject, pyqtSignal, QRunnable
+from app.core.config_manager import config_manager
+from app.core.cache_manager import cache_manager
+from app.core.steam_api_handler import steam_api_handler
+from app.core.workshop_manifest import find_up_to_date
+from app.core.tracer import tracer
+
+API_BATCH_SIZE = 100
+SAFETY_MARGIN_BYTES = 512 * 1024 * 1024 # Margen libre mínimo que se deja en cada unidad
+
+def _existing_ancestor(path: Path) -> Path:
+    """Devuelve la carpeta existente más cercana (disk_usage necesita una ruta que exista)."""
+    path = path.resolve()
+    while not path.exists() and path != path.parent:
+        path = path.parent
+    return path
+
+def get_staging_path() -> Path:
+    """Carpeta donde SteamCMD deja el contenido descargado de la Workshop."""
+    steamcmd_path = Path(config_manager.get("Paths", "steamcmd_path", fallback=""))
+    return steamcmd_path.parent / "steamapps" / "workshop"
+
+class DownloadPlan:
+    """Resultado de la planificación: orden de descarga, tamaños y comprobación de espacio."""
+    def __init__(self, items: list[dict], sizes: dict[str, int], already_current: dict[str, Path] | None = None):
+        self.items = items # Mods que hay que descargar, en orden
+        self.sizes = sizes
+        # Mods que SteamCMD ya tiene en su versión actual: se instalan desde su carpeta sin descargar
+        self.already_current = already_current or {}
+        self.total_bytes = sum(sizes.get(item['workshop_id'], 0) for item in items)
+        self.unknown_sizes = [item['workshop_id'] for item in items if item['workshop_id'] not in sizes]
+        self.space_problems: list[str] = []
+
+    @property
+    def has_enough_space(self) -> bool:
+        return not self.space_problems
+
+def fetch_remote_details(app_id: str, workshop_ids: list[str]) -> tuple[dict[str, int], dict[str, int]]:
+    """
+    Obtiene el tamaño y el time_updated de cada mod de la API Web de Steam, con la caché como
+    respaldo para el tamaño. Devuelve (tamaños, time_updated).
+    """
+    sizes, times = {}, {}
+    for start in range(0, len(workshop_ids), API_BATCH_SIZE):
+        details = steam_api_handler.get_mod_details(workshop_ids[start:start + API_BATCH_SIZE]) or {}
+        for workshop_id, item in details.items():
+            size = int(item.get('file_size', 0) or 0)
+            if size:
+                sizes[workshop_id] = size
+            time_updated = int(item.get('time_updated', 0) or 0)
+            if time_updated:
+                times[workshop_id] = time_updated
+    for workshop_id in workshop_ids:
+        if workshop_id not in sizes:
+            cached = cache_manager.get_mod_cache(app_id, workshop_id) or {}
+            if cached.get('file_size'):
+                sizes[workshop_id] = int(cached['file_size'])
+    return sizes, times
+
+def order_items(items: list[dict], sizes: dict[str, int], strategy: str) -> list[dict]:
+    """
+    Ordena la cola de descarga. 'small_first' da resultados rápidos, 'large_first' deja lo
+    pequeño para el final y cualquier otro valor conserva el orden original.
+    Los mods de tamaño desconocido van siempre al final.
+    """
+    if strategy not in ("small_first", "large_first"):
+        return list(items)
+    known = [item for item in items if item['workshop_id'] in sizes]
+    unknown = [item for item in items if item['workshop_id'] not in sizes]
+    known.sort(key=lambda item: sizes[item['workshop_id']], reverse=(strategy == "large_first"))
+    return known + unknown
+
+def check_free_space(plan: DownloadPlan, staging_path: Path, install_path: Path):
+    """
+    Comprueba que la unidad de SteamCMD y la de instalación de mods pueden alojar la descarga.
+    Si ambas carpetas están en la misma unidad, el movimiento final es un renombrado y basta con
+    tener sitio una sola vez. Si no, la unidad de instalación también recibe la copia de los mods
+    que SteamCMD ya tenía al día.
+    """
+    staging = _existing_ancestor(staging_path)
+    install = _existing_ancestor(install_path)
+    same_device = os.stat(staging).st_dev == os.stat(install).st_dev
+    targets = [("SteamCMD", staging, plan.total_bytes)]
+    if not same_device:
+        current_bytes = sum(plan.sizes.get(workshop_id, 0) for workshop_id in plan.already_current)
+        targets.append(("instalación de mods", install, plan.total_bytes + current_bytes))
+
+    for label, path, nbytes in targets:
+        free = shutil.disk_usage(path).free
+        needed = nbytes + SAFETY_MARGIN_BYTES
+        if free < needed:
+            plan.space_problems.append(
+                f"Unidad de {label} ({path}): libres {format_bytes(free)}, se necesitan {format_bytes(needed)}."
+            )
+
+def plan_downloads(app_id: str, download_list: list[dict], install_path: Path) -> DownloadPlan:
+    """
+    Obtiene tamaños, aparta los mods que SteamCMD ya tiene al día según su manifiesto,
+    ordena el resto según la configuración y comprueba el espacio libre.
+    """
+    workshop_ids = [mod['workshop_id'] for mod in download_list]
+    sizes, remote_times = fetch_remote_details(app_id, workshop_ids)
+    already_current = find_up_to_date(get_staging_path(), app_id, remote_times)
+    to_download = [mod for mod in download_list if mod['workshop_id'] not in already_current]
+    strategy = config_manager.get("Downloads", "order", fallback="small_first")
+    plan = DownloadPlan(order_items(to_download, sizes, strategy), sizes, already_current)
+    check_free_space(plan, get_staging_path(), install_path)
+    return plan
+
+class DownloadPlanSignals(QObject):
+    finished = pyqtSignal(object) # DownloadPlan
+    error = pyqtSignal(str)
+
+class DownloadPlanWorker(QRunnable):
+    """
+    Ejecuta plan_downloads fuera del hilo de la UI: las consultas a la API Web pasan por el
+    network_governor y pueden esperar varios segundos entre reintentos.
+    """
+    def __init__(self, app_id: str, download_list: list[dict], install_path: Path):
+        super().__init__()
+        self.signals = DownloadPlanSignals()
+        self.app_id = app_id
+        self.download_list = download_list
+        self.install_path = install_path
+
+    def run(self):
+        try:
+            with tracer.span("download.plan", "download", app_id=self.app_id, mods=len(self.download_list)):
+                plan = plan_downloads(self.app_id, self.download_list, self.install_path)
+        except Exception as e: # ACF dañado, detalles en caché mal formados, disco...: el botón no debe quedar bloqueado
+            self.signals.error.emit(str(e) or type(e).__name__)
+            return
+        self.signals.finished.emit(plan)
+
+def format_bytes(size: float) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(size) < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
\ No newline at end of file
@@ -0,0 +1,25 @@
+#app/core/image_loader.py
+from PyQt6.QtCore import QObject, pyqtSignal, QRunnable, Qt
+from PyQt6.QtGui import QImage
+
+class ImageDecodeSignals(QObject):
+    finished = pyqtSignal(str, QImage) # (clave de la petición, imagen ya escalada; nula si falló)
+
+class ImageDecodeWorker(QRunnable):
+    """
+    Decodifica y escala una imagen descargada fuera del hilo de la UI.
+    Se usa QImage porque, a diferencia de QPixmap, es seguro usarla desde otros hilos.
+    """
+    def __init__(self, key: str, image_data: bytes, width: int, height: int):
+        super().__init__()
+        self.signals = ImageDecodeSignals()
+        self.key = key
+        self.image_data = image_data
+        self.width = width
+        self.height = height
+
+    def run(self):
+        image = QImage()
+        if image.loadFromData(self.image_data):
+            image = image.scaled(self.width, self.height, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+        self.signals.finished.emit(self.key, image)
\ No newline at end of file
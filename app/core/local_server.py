@@ -3,11 +3,14 @@ import http.server
 import socketserver
 import json
 from PyQt6.QtCore import QObject, pyqtSignal, QThread
+from app.core.metrics import metrics, http_requests_total
 
 SERVER_PORT = 27060
+KNOWN_ENDPOINTS = ('/status', '/add', '/add_batch', '/remove', '/metrics')
 
 class LocalServerSignals(QObject):
     mod_received = pyqtSignal(dict)
+    mods_received = pyqtSignal(list) # Lote de mods añadidos de una vez desde una página de listado
     mod_removed = pyqtSignal(dict)
 
 class HttpRequestHandler(http.server.BaseHTTPRequestHandler):
@@ -23,14 +26,28 @@ class HttpRequestHandler(http.server.BaseHTTPRequestHandler):
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
         self.send_header("Access-Control-Allow-Headers", "X-Requested-With, Content-Type")
 
+    def _count_request(self, method: str):
+        # Las rutas desconocidas se agrupan para no disparar la cardinalidad de las etiquetas
+        endpoint = self.path if self.path in KNOWN_ENDPOINTS else 'other'
+        http_requests_total.inc(endpoint=endpoint, method=method)
+
     def do_OPTIONS(self):
+        self._count_request("OPTIONS")
         self.send_response(200, "ok")
         self._send_cors_headers()
         self.end_headers()
     
     def do_GET(self):
-        """Maneja la petición de estado inicial del script JS."""
-        if self.path == '/status':
+        """Maneja la petición de estado inicial del script JS y la exposición de métricas."""
+        self._count_request("GET")
+        if self.path == '/metrics':
+            body = metrics.render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        elif self.path == '/status':
             try:
                 self.send_response(200)
                 self._send_cors_headers()
@@ -52,11 +69,17 @@ class HttpRequestHandler(http.server.BaseHTTPRequestHandler):
 
     def do_POST(self):
         # ... (La lógica de do_POST se mantiene idéntica a la versión anterior)
+        self._count_request("POST")
         try:
             content_length = int(self.headers['Content-Length'])
             post_data = self.rfile.read(content_length)
             mod_data = json.loads(post_data.decode('utf-8'))
             if self.path == '/add': self.signals.mod_received.emit(mod_data)
+            elif self.path == '/add_batch':
+                app_id = mod_data.get('appId')
+                mods = [{'appId': app_id, 'workshopId': str(m.get('workshopId')), 'modName': m.get('modName')}
+                        for m in mod_data.get('mods', []) if m.get('workshopId')]
+                self.signals.mods_received.emit(mods)
             elif self.path == '/remove': self.signals.mod_removed.emit(mod_data)
             else: self.send_response(404); self.end_headers(); return
             self.send_response(200)
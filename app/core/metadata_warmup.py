@@ -0,0 +1,157 @@
+#app/core/metadata_warmup.py
+from concurrent.futures import Future, wait
+from contextlib import contextmanager
+from PyQt6.QtCore import QObject, pyqtSignal, QRunnable, QThread, QThreadPool
+from app.core.cache_manager import cache_manager
+from app.core.steam_api_handler import steam_api_handler
+from app.core.steam_web_scraper import scrape_mod_details
+from app.core.description_renderer import render_bbcode_html, bbcode_to_text
+from app.core.tracer import tracer
+
+API_BATCH_SIZE = 100
+
+def api_item_to_details(item: dict, dependencies: list[dict] | None = None) -> dict:
+    """
+    Convierte una entrada de GetPublishedFileDetails/GetDetails al formato de detalles usado en la caché.
+    La descripción de la API viene en BBCode y se guarda como texto y como HTML ya renderizado.
+    """
+    bbcode = item.get('file_description') or item.get('description') or ''
+    description_html, description_html_short = render_bbcode_html(bbcode)
+    return {
+        'title': item.get('title', ''),
+        'description': bbcode_to_text(bbcode),
+        'description_html': description_html,
+        'description_html_short': description_html_short,
+        'image_url': item.get('preview_url', ''),
+        'dependencies': dependencies or [],
+        'time_updated': int(item.get('time_updated', 0) or 0),
+        'file_size': int(item.get('file_size', 0) or 0)
+    }
+
+class WarmupSignals(QObject):
+    progress = pyqtSignal(int, int)   # (procesados, total)
+    item_ready = pyqtSignal(str, dict)  # (workshop_id, detalles) cada vez que un mod queda en caché
+    finished = pyqtSignal(int)        # Número de mods que se añadieron a la caché
+
+@contextmanager
+def _low_thread_priority():
+    """Baja la prioridad del hilo actual del grupo durante el bloque y después la restaura."""
+    thread = QThread.currentThread()
+    previous_priority = thread.priority()
+    thread.setPriority(QThread.Priority.LowPriority)
+    try:
+        yield
+    finally:
+        if previous_priority != QThread.Priority.InheritPriority:
+            thread.setPriority(previous_priority)
+        else:
+            thread.setPriority(QThread.Priority.NormalPriority)
+
+class MetadataWarmupWorker(QRunnable):
+    """
+    Precarga en segundo plano los detalles de los mods de un juego que aún no están en caché.
+    Usa llamadas por lotes a la API Web de Steam (detalles y dependencias) y recurre al scraping
+    solo para los mods que la API no resuelve. Se ejecuta con baja prioridad y se puede cancelar.
+    Las páginas se descargan en el mismo grupo de hilos de scraping (`pool`) en el que se ejecuta,
+    encoladas con prioridad baja para que las vistas previas que pide el usuario vayan antes.
+    """
+    def __init__(self, app_id: str, workshop_ids: list[str], pool: QThreadPool):
+        super().__init__()
+        self.signals = WarmupSignals()
+        self.app_id = app_id
+        self.workshop_ids = list(workshop_ids)
+        self.pool = pool
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._cancelled
+
+    def run(self):
+        with _low_thread_priority(), tracer.span("warmup.run", "warmup", app_id=self.app_id, items=len(self.workshop_ids)):
+            self._warm_up()
+
+    def _submit(self, fn, *args) -> Future:
+        """Encola `fn` en el grupo de scraping con prioridad baja y devuelve un Future con su resultado."""
+        future = Future()
+
+        def job():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                with _low_thread_priority():
+                    future.set_result(fn(*args))
+            except Exception as e:
+                future.set_exception(e)
+
+        if self.pool.maxThreadCount() < 2:
+            job() # Este worker ocupa el único hilo del grupo: lo encolado no se ejecutaría nunca
+        else:
+            self.pool.start(QRunnable.create(job), -1)
+        return future
+
+    def _wait(self, future: Future) -> bool:
+        """
+        Espera a un Future mientras la precarga no se cancele. Al cerrar la ventana el grupo descarta
+        los trabajos encolados, así que no se puede esperar sin límite a que terminen.
+        """
+        while not self._cancelled:
+            if wait([future], timeout=0.2).done:
+                return True
+        return False
+
+    def _warm_up(self):
+        pending = [wid for wid in self.workshop_ids if not cache_manager.get_mod_cache(self.app_id, wid)]
+        total = len(pending)
+        done = cached = 0
+        self.signals.progress.emit(done, total)
+
+        for start in range(0, total, API_BATCH_SIZE):
+            if self._cancelled:
+                break
+            batch = pending[start:start + API_BATCH_SIZE]
+            api_details = steam_api_handler.get_published_file_details(batch, include_children=True) or {}
+            dependencies = steam_api_handler.dependencies_from_details(api_details)
+
+            # Las páginas se descargan en los hilos libres del grupo y se analizan en parse_pool, en paralelo
+            futures = [self._submit(self._details_for, wid, api_details.get(wid), dependencies.get(wid)) for wid in batch]
+            for workshop_id, future in zip(batch, futures):
+                if not self._wait(future):
+                    for pending_future in futures:
+                        pending_future.cancel()
+                    break
+                details = future.result()
+                if details is not None and not self._cancelled:
+                    cache_manager.save_mod_cache(self.app_id, workshop_id, details)
+                    self.signals.item_ready.emit(workshop_id, details)
+                    cached += 1
+                done += 1
+                self.signals.progress.emit(done, total)
+
+        self.signals.finished.emit(cached)
+
+    def _details_for(self, workshop_id: str, api_item: dict | None, dependencies: list[dict] | None) -> dict | None:
+        """Usa los datos de la API si los resolvió; si no, los de la página (combinados con la API si los hay)."""
+        if self._cancelled:
+            return None
+        if api_item and api_item.get('result') == 1 and dependencies is not None:
+            return api_item_to_details(api_item, dependencies)
+        try:
+            scraped = scrape_mod_details(workshop_id)
+        except Exception:
+            # Sin dependencias no se guarda en caché, para que una próxima pasada lo reintente.
+            return None
+
+        if api_item and api_item.get('result') == 1:
+            details = api_item_to_details(api_item)
+            details['dependencies'] = scraped['dependencies']
+            # La descripción de la página ya viene como texto y HTML limpio; la de la API está en BBCode.
+            # Si la página no tenía descripción se conserva la renderizada desde el BBCode de la API.
+            if scraped.get('description_html'):
+                for key in ('description', 'description_html', 'description_html_short'):
+                    details[key] = scraped.get(key)
+            return details
+        return scraped
\ No newline at end of file
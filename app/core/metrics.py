@@ -0,0 +1,140 @@
+#app/core/metrics.py
+import threading
+
+class _Metric:
+    """Base de una métrica con etiquetas. Cada combinación de etiquetas tiene su propio valor."""
+    TYPE = ""
+
+    def __init__(self, name: str, help_text: str, lock: threading.Lock):
+        self.name = name
+        self.help_text = help_text
+        self._lock = lock
+        self._values = {}
+
+    @staticmethod
+    def _key(labels: dict) -> tuple:
+        return tuple(sorted(labels.items()))
+
+    @staticmethod
+    def _format_labels(key: tuple, extra: dict | None = None) -> str:
+        pairs = list(key) + list((extra or {}).items())
+        if not pairs:
+            return ""
+        escaped = []
+        for k, v in pairs:
+            value = str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+            escaped.append(f'{k}="{value}"')
+        return "{" + ",".join(escaped) + "}"
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.TYPE}"]
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{self._format_labels(key)} {value}")
+        return lines
+
+class Counter(_Metric):
+    TYPE = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+class Gauge(_Metric):
+    TYPE = "gauge"
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+class Histogram(_Metric):
+    TYPE = "histogram"
+    DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+    def __init__(self, name: str, help_text: str, lock: threading.Lock, buckets: tuple | None = None):
+        super().__init__(name, help_text, lock)
+        self.buckets = tuple(sorted(buckets or self.DEFAULT_BUCKETS))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = {'buckets': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+                self._values[key] = entry
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry['buckets'][i] += 1
+            entry['sum'] += value
+            entry['count'] += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.TYPE}"]
+        with self._lock:
+            items = [(key, {'buckets': list(e['buckets']), 'sum': e['sum'], 'count': e['count']}) for key, e in self._values.items()]
+        for key, entry in items:
+            for bound, count in zip(self.buckets, entry['buckets']):
+                lines.append(f"{self.name}_bucket{self._format_labels(key, {'le': bound})} {count}")
+            lines.append(f"{self.name}_bucket{self._format_labels(key, {'le': '+Inf'})} {entry['count']}")
+            lines.append(f"{self.name}_sum{self._format_labels(key)} {entry['sum']}")
+            lines.append(f"{self.name}_count{self._format_labels(key)} {entry['count']}")
+        return lines
+
+class MetricsRegistry:
+    """
+    Registro en memoria de contadores, gauges e histogramas de la aplicación.
+    Se expone en formato de texto de Prometheus a través del servidor local (/metrics).
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}
+
+    def _get_or_create(self, cls, name: str, help_text: str, **kwargs):
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = cls(name, help_text, threading.Lock(), **kwargs)
+            return self._metrics[name]
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        return self._get_or_create(Counter, name, help_text)
+
+    def gauge(self, name: str, help_text: str) -> Gauge:
+        return self._get_or_create(Gauge, name, help_text)
+
+    def histogram(self, name: str, help_text: str, buckets: tuple | None = None) -> Histogram:
+        return self._get_or_create(Histogram, name, help_text, buckets=buckets)
+
+    def render(self) -> str:
+        """Devuelve todas las métricas en formato de exposición de texto de Prometheus."""
+        with self._lock:
+            registered = list(self._metrics.values())
+        lines = []
+        for metric in registered:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+# Instancia única para ser usada en toda la aplicación
+metrics = MetricsRegistry()
+
+# Métricas conocidas de la aplicación
+cache_requests_total = metrics.counter("moddownloader_cache_requests_total", "Consultas a la caché de detalles de mods, por resultado (hit/miss).")
+scrape_duration_seconds = metrics.histogram("moddownloader_scrape_duration_seconds", "Duración del scraping de la página de un mod.")
+download_queue_depth = metrics.gauge("moddownloader_download_queue_depth", "Mods en la cola de la ejecución de SteamCMD en curso.")
+steamcmd_items_total = metrics.counter("moddownloader_steamcmd_items_total", "Mods procesados por SteamCMD, por resultado (succeeded/failed).")
+installed_bytes_total = metrics.counter("moddownloader_installed_bytes_total", "Bytes instalados en la carpeta de mods de los juegos.")
+http_requests_total = metrics.counter("moddownloader_http_requests_total", "Peticiones recibidas por el servidor local, por endpoint y método.")
+http_client_requests_total = metrics.counter("moddownloader_http_client_requests_total", "Peticiones salientes a Steam, por host y código de estado (error = fallo de conexión).")
+http_client_throttled_total = metrics.counter("moddownloader_http_client_throttled_total", "Respuestas 429/5xx de Steam que obligaron a reducir el ritmo, por host.")
+http_client_concurrency_limit = metrics.gauge("moddownloader_http_client_concurrency_limit", "Peticiones simultáneas permitidas ahora mismo, por host.")
+http_client_rate_limit = metrics.gauge("moddownloader_http_client_rate_limit", "Peticiones por segundo permitidas ahora mismo por el cubo de tokens, por host.")
+http_client_request_rate = metrics.gauge("moddownloader_http_client_request_rate", "Peticiones por segundo completadas en los últimos 10 s, por host.")
@@ -0,0 +1,129 @@
+#app/core/mod_repository.py
+import threading
+from dataclasses import dataclass
+from PyQt6.QtCore import QObject, pyqtSignal
+from app.core.data_manager import data_manager
+
+_RECORD_FIELDS = ('workshop_id', 'name', 'status', 'time_updated', 'local_path', 'origin')
+
+@dataclass(slots=True)
+class ModRecord:
+    """Un mod de mods.json. Los campos sin atributo propio se conservan en `extra` para no perderlos al guardar."""
+    workshop_id: str
+    name: str
+    status: str
+    time_updated: int = 0
+    local_path: str = ""
+    origin: str = "" # 'dependency' si se añadió solo como dependencia de otro mod
+    extra: dict | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'ModRecord':
+        extra = {k: v for k, v in data.items() if k not in _RECORD_FIELDS}
+        return cls(str(data.get('workshop_id', '')), data.get('name', ''), data.get('status', ''),
+                   data.get('time_updated') or 0, data.get('local_path') or "", data.get('origin') or "", extra or None)
+
+    def to_dict(self) -> dict:
+        data = {'workshop_id': self.workshop_id, 'name': self.name, 'status': self.status,
+                'time_updated': self.time_updated, 'local_path': self.local_path}
+        if self.origin:
+            data['origin'] = self.origin
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+class GameMods:
+    """
+    Mods de un juego indexados por workshop_id y por estado. Es inmutable: cada escritura de mods.json
+    crea uno nuevo, así que se puede consultar desde cualquier hilo sin bloqueos.
+    """
+    __slots__ = ('app_id', '_by_id', '_by_status')
+
+    def __init__(self, app_id: str, mods: list[dict]):
+        self.app_id = str(app_id)
+        self._by_id: dict[str, ModRecord] = {}
+        self._by_status: dict[str, dict[str, ModRecord]] = {}
+        for data in mods:
+            record = ModRecord.from_dict(data)
+            self._by_id[record.workshop_id] = record
+            self._by_status.setdefault(record.status, {})[record.workshop_id] = record
+
+    def __contains__(self, workshop_id: str) -> bool:
+        return workshop_id in self._by_id
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def get(self, workshop_id: str) -> ModRecord | None:
+        return self._by_id.get(workshop_id)
+
+    def status_of(self, workshop_id: str) -> str | None:
+        record = self._by_id.get(workshop_id)
+        return record.status if record else None
+
+    def has_status(self, workshop_id: str, status: str) -> bool:
+        return workshop_id in self._by_status.get(status, ())
+
+    def name_of(self, workshop_id: str, default: str | None = None) -> str | None:
+        record = self._by_id.get(workshop_id)
+        return record.name if record else default
+
+    def ids(self, status: str | None = None) -> set[str]:
+        """Ids de todos los mods, o solo de los que tienen un estado."""
+        return set(self._by_id if status is None else self._by_status.get(status, ()))
+
+    def records(self, status: str | None = None) -> list[ModRecord]:
+        """Registros en el orden de mods.json, todos o solo los de un estado."""
+        return list((self._by_id if status is None else self._by_status.get(status, {})).values())
+
+    def installed_dependencies(self) -> set[str]:
+        """Mods instalados que se añadieron solo como dependencia de otros (los únicos que se pueden podar)."""
+        return {record.workshop_id for record in self._by_status.get('installed', {}).values() if record.origin == 'dependency'}
+
+    def count(self, status: str) -> int:
+        return len(self._by_status.get(status, ()))
+
+class ModRepository(QObject):
+    """
+    Caché en memoria de los mods de cada juego, compartida por todas las vistas. Cada mods.json se
+    lee una sola vez; después, cada vez que data_manager guarda la lista de un juego se sustituye
+    su GameMods y se emite `changed` para que las vistas suscritas se actualicen.
+    """
+    changed = pyqtSignal(str) # AppID cuya lista de mods cambió
+
+    def __init__(self):
+        super().__init__()
+        self._games: dict[str, GameMods] = {}
+        self._lock = threading.Lock()
+        data_manager.add_mods_listener(self._on_mods_saved)
+
+    def game(self, app_id: str) -> GameMods:
+        """Mods de un juego; la primera consulta lee mods.json y las demás usan la copia en memoria."""
+        key = str(app_id)
+        with self._lock:
+            game = self._games.get(key)
+        if game is None:
+            game = GameMods(key, data_manager.get_mods_for_game(key))
+            with self._lock:
+                game = self._games.setdefault(key, game)
+        return game
+
+    def invalidate(self, app_id: str | None = None):
+        """
+        Olvida la copia de un juego, o la de todos si no se indica app_id (p. ej. si los mods.json
+        se modificaron fuera de la aplicación). La siguiente consulta vuelve a leer el archivo.
+        """
+        with self._lock:
+            if app_id is None:
+                self._games.clear()
+            else:
+                self._games.pop(str(app_id), None)
+
+    def _on_mods_saved(self, app_id: str, mods: list[dict]):
+        game = GameMods(app_id, mods)
+        with self._lock:
+            self._games[str(app_id)] = game
+        self.changed.emit(str(app_id))
+
+# Instancia única para ser usada en toda la aplicación
+mod_repository = ModRepository()
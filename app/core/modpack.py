@@ -0,0 +1,255 @@
+#app/core/modpack.py
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from pathlib import Path
+from PyQt6.QtCore import QObject, pyqtSignal, QRunnable
+from app.core.data_manager import data_manager
+from app.core.mod_repository import mod_repository
+from app.core.cache_manager import cache_manager
+from app.core.download_planner import fetch_remote_details, get_staging_path
+from app.core.workshop_manifest import get_content_path
+from app.core.tracer import tracer
+
+LOCKFILE_FORMAT = 1
+HASH_CHUNK_SIZE = 1024 * 1024
+HASH_CACHE_FILE = "content_hashes.json"
+
+def hash_mod_folder(folder: Path) -> str:
+    """
+    Hash SHA-256 del contenido de una carpeta de mod: rutas relativas (ordenadas) y bytes
+    de cada archivo. Dos carpetas con los mismos archivos dan el mismo hash en cualquier equipo.
+    """
+    digest = hashlib.sha256()
+    files = sorted(p for p in folder.rglob('*') if p.is_file())
+    for file_path in files:
+        digest.update(file_path.relative_to(folder).as_posix().encode('utf-8'))
+        digest.update(b'\0')
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+def _folder_signature(folder: Path) -> list:
+    """Ruta relativa, mtime y tamaño de cada archivo de la carpeta, ordenados: cambia si cambia cualquier archivo."""
+    signature = []
+    for file_path in folder.rglob('*'):
+        if file_path.is_file():
+            stat = file_path.stat()
+            signature.append([file_path.relative_to(folder).as_posix(), stat.st_mtime_ns, stat.st_size])
+    return sorted(signature)
+
+class FolderHashCache:
+    """
+    Caché de hash_mod_folder por carpeta: ruta -> {'signature', 'hash'}. Si ningún archivo ha
+    cambiado de ruta, mtime o tamaño se reutiliza el hash sin volver a leer el contenido.
+    """
+    def __init__(self, entries: dict | None = None):
+        self.entries = entries or {}
+        self._lock = threading.Lock()
+
+    def folder_hash(self, folder: Path) -> str:
+        key = str(folder)
+        signature = _folder_signature(folder)
+        with self._lock:
+            cached = self.entries.get(key)
+        if cached and cached['signature'] == signature:
+            return cached['hash']
+        content_hash = hash_mod_folder(folder)
+        with self._lock:
+            self.entries[key] = {'signature': signature, 'hash': content_hash}
+        return content_hash
+
+def _load_hash_cache(app_id: str) -> FolderHashCache:
+    try:
+        with open(data_manager.get_game_path(app_id) / HASH_CACHE_FILE, 'r', encoding='utf-8') as f:
+            return FolderHashCache(json.load(f))
+    except (OSError, json.JSONDecodeError, TypeError):
+        return FolderHashCache()
+
+def _save_hash_cache(app_id: str, cache: FolderHashCache):
+    with open(data_manager.get_game_path(app_id) / HASH_CACHE_FILE, 'w', encoding='utf-8') as f:
+        json.dump(cache.entries, f)
+
+def export_lockfile(app_id: str, path: str | Path, progress=None) -> int:
+    """
+    Escribe el lockfile del modpack con los mods instalados de un juego. Devuelve el número de mods.
+    `progress(hechos, total)` se llama tras calcular el hash de cada mod.
+    """
+    installed = [mod.to_dict() for mod in mod_repository.game(app_id).records('installed')]
+    install_dir = Path(data_manager.get_game_info(app_id).get('mod_install_path', ''))
+    _, remote_times = fetch_remote_details(app_id, [mod['workshop_id'] for mod in installed])
+    hashes = _load_hash_cache(app_id)
+
+    locked_mods = []
+    for done, mod in enumerate(sorted(installed, key=lambda m: m['workshop_id']), 1):
+        workshop_id = mod['workshop_id']
+        details = cache_manager.get_mod_cache(app_id, workshop_id) or {}
+        folder = install_dir / workshop_id
+        locked_mods.append({
+            "workshop_id": workshop_id,
+            "name": mod.get('name', ''),
+            "time_updated": remote_times.get(workshop_id) or details.get('time_updated') or mod.get('time_updated', 0),
+            "dependencies": sorted(dep['id'] for dep in details.get('dependencies', []) if dep.get('id')),
+            "content_hash": hashes.folder_hash(folder) if folder.is_dir() else ""
+        })
+        if progress:
+            progress(done, len(installed))
+    _save_hash_cache(app_id, hashes)
+
+    lockfile = {
+        "format": LOCKFILE_FORMAT,
+        "app_id": str(app_id),
+        "game_name": data_manager.get_game_info(app_id).get('name', ''),
+        "created": int(time.time()),
+        "mods": locked_mods
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(lockfile, f, indent=4)
+    return len(locked_mods)
+
+def _is_workshop_id(value) -> bool:
+    return isinstance(value, str) and value.isascii() and value.isdigit()
+
+def _validate_locked_mod(index: int, entry) -> dict:
+    """
+    Valida y normaliza un mod del lockfile. El workshop_id acaba en rutas (install_dir / id, que se
+    borra antes de enlazar) y en el script de SteamCMD, así que solo se aceptan IDs numéricos.
+    """
+    if not isinstance(entry, dict):
+        raise ValueError(f"El mod {index} del lockfile no es un objeto.")
+    workshop_id = entry.get('workshop_id')
+    if not _is_workshop_id(workshop_id):
+        raise ValueError(f"El mod {index} del lockfile tiene un workshop_id inválido: {workshop_id!r}")
+    content_hash = entry.get('content_hash') or ""
+    if not isinstance(content_hash, str) or (content_hash and not re.fullmatch(r"[0-9a-f]{64}", content_hash)):
+        raise ValueError(f"El mod {workshop_id} del lockfile tiene un content_hash inválido.")
+    time_updated = entry.get('time_updated') or 0
+    if not isinstance(time_updated, int) or isinstance(time_updated, bool) or time_updated < 0:
+        raise ValueError(f"El mod {workshop_id} del lockfile tiene un time_updated inválido.")
+    name = entry.get('name')
+    dependencies = entry.get('dependencies')
+    return {
+        "workshop_id": workshop_id,
+        "name": " ".join(str(name).split()) if name is not None else "",
+        "time_updated": time_updated,
+        "dependencies": [dep for dep in dependencies if _is_workshop_id(dep)] if isinstance(dependencies, list) else [],
+        "content_hash": content_hash
+    }
+
+def load_lockfile(path: str | Path) -> dict:
+    """Lee un lockfile y valida su formato y cada uno de sus mods. Lanza ValueError si no es válido."""
+    with open(path, 'r', encoding='utf-8') as f:
+        try:
+            lockfile = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"El lockfile no es JSON válido: {e}")
+    if not isinstance(lockfile, dict) or lockfile.get('format') != LOCKFILE_FORMAT or not isinstance(lockfile.get('mods'), list):
+        raise ValueError("Formato de lockfile no reconocido.")
+    lockfile['mods'] = [_validate_locked_mod(i, entry) for i, entry in enumerate(lockfile['mods'])]
+    return lockfile
+
+def _link_tree(source: Path, target: Path):
+    """Replica una carpeta con enlaces duros; copia los archivos si el enlace no es posible (otra unidad)."""
+    for root, _, files in os.walk(source):
+        relative = Path(root).relative_to(source)
+        (target / relative).mkdir(parents=True, exist_ok=True)
+        for name in files:
+            src, dst = Path(root) / name, target / relative / name
+            try:
+                os.link(src, dst)
+            except OSError:
+                shutil.copy2(src, dst)
+
+class ImportPlan:
+    """Cómo se restaurará cada mod del lockfile: ya coincide, se enlaza desde SteamCMD o se descarga."""
+    def __init__(self):
+        self.matching: list[dict] = []
+        self.linkable: list[tuple[dict, Path]] = []
+        self.to_download: list[dict] = []
+
+def plan_import(app_id: str, lockfile: dict, progress=None) -> ImportPlan:
+    """
+    Compara el lockfile con lo instalado y con el contenido de SteamCMD, por hash de contenido.
+    `progress(hechos, total)` se llama tras comprobar cada mod.
+    """
+    plan = ImportPlan()
+    install_dir = Path(data_manager.get_game_info(app_id).get('mod_install_path', ''))
+    staging = get_staging_path()
+    hashes = _load_hash_cache(app_id)
+    for done, locked in enumerate(lockfile['mods'], 1):
+        workshop_id = locked['workshop_id']
+        expected = locked.get('content_hash')
+        installed_folder = install_dir / workshop_id
+        content_folder = get_content_path(staging, app_id, workshop_id)
+        if expected and installed_folder.is_dir() and hashes.folder_hash(installed_folder) == expected:
+            plan.matching.append(locked)
+        elif expected and content_folder.is_dir() and hashes.folder_hash(content_folder) == expected:
+            plan.linkable.append((locked, content_folder))
+        else:
+            plan.to_download.append(locked)
+        if progress:
+            progress(done, len(lockfile['mods']))
+    _save_hash_cache(app_id, hashes)
+    return plan
+
+def link_import(app_id: str, plan: ImportPlan, progress=None) -> dict[str, dict]:
+    """
+    Instala los mods enlazables desde la carpeta de SteamCMD. Devuelve los cambios de estado
+    (workshop_id -> {'status', 'local_path'}) de los mods que ya coinciden o se han enlazado,
+    para aplicarlos con register_import. `progress(hechos, total)` se llama tras cada mod.
+    """
+    install_dir = Path(data_manager.get_game_info(app_id).get('mod_install_path', ''))
+    installed_updates = {}
+    for locked in plan.matching:
+        installed_updates[locked['workshop_id']] = {'status': 'installed', 'local_path': str(install_dir / locked['workshop_id'])}
+    for done, (locked, source) in enumerate(plan.linkable, 1):
+        target = install_dir / locked['workshop_id']
+        if target.exists():
+            shutil.rmtree(target)
+        _link_tree(source, target)
+        installed_updates[locked['workshop_id']] = {'status': 'installed', 'local_path': str(target)}
+        if progress:
+            progress(done, len(plan.linkable))
+    return installed_updates
+
+def register_import(app_id: str, plan: ImportPlan, installed_updates: dict[str, dict]) -> list[dict]:
+    """
+    Registra todos los mods del lockfile, marca como instalados los de link_import y devuelve
+    la lista de mods (formato de cola de descarga) que aún hay que descargar.
+    """
+    with data_manager.batch(app_id):
+        all_locked = plan.matching + [locked for locked, _ in plan.linkable] + plan.to_download
+        data_manager.add_mods_to_game(app_id, [(m['workshop_id'], m.get('name') or m['workshop_id']) for m in all_locked])
+        data_manager.set_mods_status(app_id, installed_updates)
+
+    return [{'workshop_id': m['workshop_id'], 'name': m.get('name', '')} for m in plan.to_download]
+
+class ModpackSignals(QObject):
+    progress = pyqtSignal(int, int)  # (mods procesados, total)
+    finished = pyqtSignal(object)    # Resultado de la tarea
+    error = pyqtSignal(str)
+
+class ModpackWorker(QRunnable):
+    """
+    Ejecuta fuera del hilo de la UI una de las tareas del modpack que leen o copian carpetas de mods
+    (export_lockfile, plan_import o link_import). La tarea recibe la función de progreso como `progress`.
+    """
+    def __init__(self, task, *args):
+        super().__init__()
+        self.signals = ModpackSignals()
+        self.task = task
+        self.args = args
+
+    def run(self):
+        with tracer.span(f"modpack.{self.task.__name__}", "modpack"):
+            try:
+                result = self.task(*self.args, progress=self.signals.progress.emit)
+            except Exception as e: # Disco, lockfile mal formado...: la interfaz siempre recibe una respuesta
+                self.signals.error.emit(str(e) or type(e).__name__)
+                return
+        self.signals.finished.emit(result)
@@ -0,0 +1,238 @@
+#app/core/network_governor.py
+import random
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+import requests
+from app.core.config_manager import config_manager
+from app.core.tracer import tracer
+from app.core.metrics import (http_client_requests_total, http_client_throttled_total, http_client_concurrency_limit,
+                              http_client_rate_limit, http_client_request_rate)
+
+# Respuestas con las que Steam indica que hay que bajar el ritmo
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+RATE_WINDOW_S = 10.0    # Ventana para calcular las peticiones por segundo observadas
+DECREASE_INTERVAL_S = 1.0 # Varias respuestas 429 seguidas cuentan como un único aviso de saturación
+MAX_BACKOFF_S = 60.0
+# Errores de red que se reintentan; el resto de requests.RequestException (URL inválida, demasiadas
+# redirecciones...) se propaga al primer intento
+TRANSIENT_ERRORS = (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError,
+                    requests.exceptions.ContentDecodingError)
+
+def _host(url: str) -> str:
+    return urlsplit(url).netloc.lower()
+
+def _retry_after(response: requests.Response) -> float | None:
+    """Segundos indicados por la cabecera Retry-After (en segundos o como fecha HTTP)."""
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class _HostLimiter:
+    """
+    Límites de un host: un cubo de tokens (peticiones por segundo con ráfaga) y un máximo de peticiones
+    simultáneas. Ambos se ajustan con AIMD: se reducen a la mitad cuando el host responde 429/5xx o
+    falla la conexión, y crecen poco a poco con cada respuesta correcta hasta los valores configurados.
+    """
+    def __init__(self, host: str, max_rate: float, burst: float, min_concurrency: int, max_concurrency: int):
+        self.host = host
+        self.max_rate = max_rate
+        self.min_rate = min(max_rate, 0.5)
+        self.rate = max_rate
+        self.burst = burst
+        self.tokens = burst
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.limit = float(max(min_concurrency, max_concurrency // 2)) # Arranque prudente; sube con los éxitos
+        self.in_flight = 0
+        self.blocked_until = 0.0
+        self.last_decrease = 0.0
+        self.updated = time.monotonic()
+        self.completed = deque()
+        self.throttled = 0
+        self.cond = threading.Condition()
+        self._publish()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def _take_token(self, now: float) -> float:
+        """Reserva un token y devuelve cuánto hay que esperar a que esté disponible (el saldo puede quedar negativo)."""
+        self._refill(now)
+        self.tokens -= 1
+        token_wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        return max(token_wait, self.blocked_until - now)
+
+    def acquire(self) -> float:
+        """Espera a que haya hueco para una petición más y reserva su token. Devuelve la espera restante."""
+        with self.cond:
+            while True:
+                now = time.monotonic()
+                if self.in_flight < int(self.limit) and now >= self.blocked_until:
+                    break
+                self.cond.wait(timeout=max(0.05, self.blocked_until - now) if now < self.blocked_until else None)
+            self.in_flight += 1
+            return self._take_token(now)
+
+    def reserve(self) -> float:
+        """Reserva un token sin ocupar hueco de concurrencia (para peticiones asíncronas de Qt)."""
+        with self.cond:
+            return self._take_token(time.monotonic())
+
+    def finish(self, status: int | None, retry_after: float | None, counted: bool = True):
+        """Registra el resultado de una petición (status None = error de conexión) y ajusta los límites."""
+        with self.cond:
+            now = time.monotonic()
+            if counted:
+                self.in_flight -= 1
+            self.completed.append(now)
+            while self.completed and self.completed[0] < now - RATE_WINDOW_S:
+                self.completed.popleft()
+            if status is None or status in RETRY_STATUSES:
+                self.throttled += 1
+                if now - self.last_decrease >= DECREASE_INTERVAL_S:
+                    self.last_decrease = now
+                    self.limit = max(float(self.min_concurrency), self.limit / 2)
+                    self.rate = max(self.min_rate, self.rate / 2)
+                if retry_after is not None:
+                    self.blocked_until = max(self.blocked_until, now + min(retry_after, MAX_BACKOFF_S))
+            else:
+                self.limit = min(float(self.max_concurrency), self.limit + 1 / self.limit)
+                self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+            self.cond.notify_all()
+        self._publish()
+
+    def block_for(self, seconds: float):
+        """Detiene todas las peticiones al host durante un tiempo (espera exponencial tras un fallo)."""
+        with self.cond:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+    def stats(self) -> dict:
+        with self.cond:
+            now = time.monotonic()
+            recent = sum(1 for t in self.completed if t >= now - RATE_WINDOW_S)
+            return {
+                'requests_per_s': recent / RATE_WINDOW_S,
+                'rate_limit': self.rate,
+                'concurrency_limit': int(self.limit),
+                'in_flight': self.in_flight,
+                'throttled': self.throttled,
+                'blocked_for_s': max(0.0, self.blocked_until - now)
+            }
+
+    def _publish(self):
+        stats = self.stats()
+        http_client_rate_limit.set(round(stats['rate_limit'], 3), host=self.host)
+        http_client_concurrency_limit.set(stats['concurrency_limit'], host=self.host)
+        http_client_request_rate.set(round(stats['requests_per_s'], 3), host=self.host)
+
+class NetworkGovernor:
+    """
+    Punto único por el que salen todas las peticiones a Steam (scraping, API Web e imágenes).
+    Aplica por host un cubo de tokens y un límite de concurrencia adaptativo, reintenta los 429/5xx
+    con espera exponencial (respetando Retry-After) y expone los ritmos actuales en las métricas.
+    """
+    def __init__(self):
+        self.max_rate = float(config_manager.get("Network", "requests_per_second", fallback="4"))
+        self.burst = float(config_manager.get("Network", "burst", fallback="8"))
+        self.min_concurrency = int(config_manager.get("Network", "min_concurrency", fallback="1"))
+        self.max_concurrency = int(config_manager.get("Network", "max_concurrency", fallback="8"))
+        self.max_retries = int(config_manager.get("Network", "max_retries", fallback="4"))
+        self.timeout = float(config_manager.get("Network", "timeout_s", fallback="15"))
+        self.backoff_base = float(config_manager.get("Network", "backoff_base_s", fallback="1.0"))
+        self._limiters: dict[str, _HostLimiter] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _limiter(self, url: str) -> _HostLimiter:
+        host = _host(url)
+        with self._lock:
+            limiter = self._limiters.get(host)
+            if limiter is None:
+                limiter = _HostLimiter(host, self.max_rate, self.burst, self.min_concurrency, self.max_concurrency)
+                self._limiters[host] = limiter
+            return limiter
+
+    def _session(self) -> requests.Session:
+        # Una sesión por hilo: reutiliza conexiones sin compartir una Session entre hilos
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            self._local.session = session
+        return session
+
+    def _backoff(self, attempt: int) -> float:
+        return min(MAX_BACKOFF_S, self.backoff_base * (2 ** attempt) * random.uniform(0.5, 1.5))
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Como requests.request, pero esperando turno en el host y reintentando los 429/5xx y los errores
+        de red transitorios. Devuelve la última respuesta (el llamador sigue usando raise_for_status) o lanza
+        la última requests.RequestException.
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        limiter = self._limiter(url)
+        for attempt in range(self.max_retries + 1):
+            wait = limiter.acquire()
+            if wait > 0:
+                time.sleep(wait)
+            status, retry_after = None, None
+            try:
+                with tracer.span("network.request", "network", host=limiter.host, attempt=attempt):
+                    response = self._session().request(method, url, **kwargs)
+                status = response.status_code
+                retry_after = _retry_after(response) if status in RETRY_STATUSES else None
+            except TRANSIENT_ERRORS:
+                if attempt == self.max_retries:
+                    raise
+            finally:
+                # Siempre se libera el hueco de concurrencia, también con errores inesperados
+                limiter.finish(status, retry_after)
+                http_client_requests_total.inc(host=limiter.host, status=str(status) if status else "error")
+            if status is None: # Error de red transitorio: se reintenta tras la espera
+                time.sleep(self._backoff(attempt))
+                continue
+            if status not in RETRY_STATUSES or attempt == self.max_retries:
+                return response
+            http_client_throttled_total.inc(host=limiter.host)
+            # Sin Retry-After se espera de forma exponencial; el host queda en pausa también para los demás hilos
+            limiter.block_for(retry_after if retry_after is not None else self._backoff(attempt))
+        return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def reserve(self, url: str) -> float:
+        """Para peticiones asíncronas (QNetworkAccessManager): segundos a esperar antes de lanzarla."""
+        return self._limiter(url).reserve()
+
+    def report(self, url: str, status: int | None, retry_after: float | None = None):
+        """Resultado de una petición reservada con reserve(); status None o 0 si falló la conexión."""
+        limiter = self._limiter(url)
+        limiter.finish(status or None, retry_after, counted=False)
+        http_client_requests_total.inc(host=limiter.host, status=str(status) if status else "error")
+        if status in RETRY_STATUSES:
+            http_client_throttled_total.inc(host=limiter.host)
+
+    def stats(self) -> dict[str, dict]:
+        """Ritmos y límites actuales por host."""
+        with self._lock:
+            limiters = list(self._limiters.values())
+        return {limiter.host: limiter.stats() for limiter in limiters}
+
+# Instancia única para ser usada en toda la aplicación
+network_governor = NetworkGovernor()
@@ -0,0 +1,70 @@
+#app/core/parse_pool.py
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from app.core.config_manager import config_manager
+from app.core.workshop_page_parser import parse_mod_page, parse_browse_page
+
+class ParsePool:
+    """
+    Analiza el HTML de las páginas de la Workshop en procesos aparte. BeautifulSoup/lxml retienen
+    el GIL mientras trabajan, así que en hilos los análisis se ejecutan de uno en uno y hacen que
+    la UI se entrecorte; las descargas siguen en hilos y solo el HTML viaja a los procesos.
+    Si el grupo de procesos no se puede usar, el análisis se hace en el hilo que lo pide.
+    """
+    def __init__(self):
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._disabled = False
+
+    def _max_workers(self) -> int:
+        configured = int(config_manager.get("Performance", "parse_processes", fallback="0"))
+        if configured > 0:
+            return configured
+        return max(1, min(4, (os.cpu_count() or 2) - 1)) # Se deja un núcleo libre para la UI
+
+    def _get_executor(self) -> ProcessPoolExecutor | None:
+        with self._lock:
+            if self._executor is None and not self._disabled:
+                try:
+                    # 'spawn' en todas las plataformas: hacer fork de un proceso con hilos de Qt no es seguro
+                    self._executor = ProcessPoolExecutor(max_workers=self._max_workers(),
+                                                         mp_context=multiprocessing.get_context('spawn'))
+                except (OSError, ValueError, NotImplementedError) as e:
+                    print(f"ADVERTENCIA: No se pudo crear el grupo de procesos de análisis ({e}); se analizará en hilos.")
+                    self._disabled = True
+            return self._executor
+
+    def parse(self, html: str) -> dict:
+        """Analiza una página en un proceso del grupo y devuelve el diccionario de detalles (bloquea el hilo llamante)."""
+        return self._run(parse_mod_page, html)
+
+    def parse_browse(self, html: str) -> list[dict]:
+        """Analiza una página de resultados de la Workshop (ver parse_browse_page)."""
+        return self._run(parse_browse_page, html)
+
+    def _run(self, parser, html: str):
+        executor = self._get_executor()
+        if executor is None:
+            return parser(html)
+        try:
+            return executor.submit(parser, html).result()
+        except (BrokenProcessPool, RuntimeError):
+            # Un proceso murió o el grupo se está cerrando: se descarta el grupo y se analiza aquí
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+            return parser(html)
+
+    def shutdown(self):
+        """Detiene los procesos de análisis (al cerrar la aplicación)."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._disabled = True
+        if executor:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+# Instancia única para ser usada en toda la aplicación
+parse_pool = ParsePool()
@@ -0,0 +1,222 @@
+#app/core/run_history.py
+import gzip
+import json
+import re
+import threading
+import time
+from pathlib import Path
+from app.core.data_manager import data_manager
+
+CHUNK_LINES = 200 # Líneas por miembro gzip; cada miembro se puede descomprimir por separado
+INDEX_FILE = "index.jsonl"
+_ID_RE = re.compile(r"\b\d{5,}\b")
+# Líneas de SteamCMD que marcan el inicio y el final de la descarga de cada mod
+_DOWNLOADING_RE = re.compile(r"Downloading item (\d+)")
+_SUCCESS_RE = re.compile(r'Success\. Downloaded item "?(\d+)"? to "[^"]*"(?: \((\d+) bytes\))?', re.IGNORECASE)
+_FAILED_RE = re.compile(r"ERROR! Download item (\d+) failed \(([^)]*)\)")
+
+def get_logs_dir(app_id: str) -> Path:
+    logs_dir = data_manager.get_game_path(app_id) / "logs"
+    logs_dir.mkdir(parents=True, exist_ok=True)
+    return logs_dir
+
+class RunLogWriter:
+    """
+    Guarda la salida de una ejecución de SteamCMD en gamedata/<appid>/logs/<run_id>.log.gz a medida
+    que se produce. El archivo es una sucesión de miembros gzip independientes; un índice (.idx.json)
+    guarda su posición en bytes y las líneas en las que aparece cada mod, para poder extraer el
+    fragmento de un mod sin descomprimir todo el log.
+
+    También anota cuándo empieza y termina la descarga y la instalación de cada mod; close() devuelve
+    esos tiempos junto con el resumen para guardarlos en download_analytics.
+    """
+    def __init__(self, app_id: str, workshop_ids: list[str], attempt: int = 0, shards: int = 1,
+                 copy_threads: int = 1, expected_sizes: dict[str, int] | None = None):
+        self.app_id = str(app_id)
+        self.run_id = time.strftime("%Y%m%d-%H%M%S") + f"-{int(time.time() * 1000) % 1000:03d}"
+        self.order = list(workshop_ids)
+        self.workshop_ids = set(workshop_ids)
+        self.attempt = attempt # Número de intento dentro de la cadena de reintentos (0 = primera ejecución)
+        self.shards = shards   # Procesos de SteamCMD que descargan a la vez
+        self.copy_threads = copy_threads
+        self.expected_sizes = expected_sizes or {}
+        self.started = time.time()
+        self.install_started: float | None = None
+        # workshop_id -> {'download_started', 'download_finished', 'bytes', 'error', 'installed', 'installed_bytes'}
+        self._timings: dict[str, dict] = {}
+        self.logs_dir = get_logs_dir(app_id)
+        self.log_path = self.logs_dir / f"{self.run_id}.log.gz"
+        self._file = open(self.log_path, 'wb')
+        self._lock = threading.Lock()
+        self._buffer: list[str] = []
+        self._line_count = 0
+        self._chunks: list[dict] = []
+        self._item_lines: dict[str, list[int]] = {}
+        self._closed = False
+
+    def write_line(self, line: str):
+        """Añade una línea al log (se puede llamar desde el hilo de SteamCMD)."""
+        with self._lock:
+            if self._closed:
+                return
+            line = line.rstrip('\n')
+            for match in _ID_RE.findall(line):
+                if match in self.workshop_ids:
+                    self._item_lines.setdefault(match, []).append(self._line_count)
+            self._record_timing(line)
+            self._buffer.append(line)
+            self._line_count += 1
+            if len(self._buffer) >= CHUNK_LINES:
+                self._flush_chunk()
+
+    def _record_timing(self, line: str):
+        now = time.time()
+        if match := _DOWNLOADING_RE.search(line):
+            self._timings.setdefault(match.group(1), {}).setdefault('download_started', now)
+        elif match := _SUCCESS_RE.search(line):
+            timing = self._timings.setdefault(match.group(1), {})
+            timing['download_finished'] = now
+            if match.group(2):
+                timing['bytes'] = int(match.group(2))
+        elif match := _FAILED_RE.search(line):
+            timing = self._timings.setdefault(match.group(1), {})
+            timing['download_finished'] = now
+            timing['error'] = f"SteamCMD: {match.group(2)}"
+
+    def mark_install_started(self):
+        """Fin de la fase de descarga: empieza la instalación de los mods descargados."""
+        with self._lock:
+            self.install_started = time.time()
+
+    def mark_installed(self, workshop_id: str, size: int):
+        with self._lock:
+            timing = self._timings.setdefault(workshop_id, {})
+            timing['installed'] = time.time()
+            timing['installed_bytes'] = size
+
+    def _item_stats(self, outcomes: dict[str, str], reasons: dict[str, str]) -> list[dict]:
+        """Tiempos de cada mod de la ejecución, en segundos desde el inicio de cada fase."""
+        stats = []
+        for position, workshop_id in enumerate(self.order):
+            timing = self._timings.get(workshop_id, {})
+            started, downloaded = timing.get('download_started'), timing.get('download_finished')
+            installed = timing.get('installed')
+            outcome = outcomes.get(workshop_id, 'failed')
+            stats.append({
+                "workshop_id": workshop_id,
+                "position": position,
+                "queue_s": round(started - self.started, 3) if started else None,
+                "download_s": round(downloaded - started, 3) if started and downloaded else None,
+                "bytes": timing.get('installed_bytes') or timing.get('bytes') or self.expected_sizes.get(workshop_id),
+                "attempt": self.attempt,
+                "install_s": round(installed - self.install_started, 3) if installed and self.install_started else None,
+                "outcome": outcome,
+                "failure_reason": None if outcome == 'succeeded' else self._failure_reason(timing, reasons.get(workshop_id))
+            })
+        return stats
+
+    @staticmethod
+    def _failure_reason(timing: dict, reason: str | None) -> str:
+        # El motivo explícito (instalación, carpeta ausente, error al lanzar SteamCMD) va antes que el del log
+        if reason or timing.get('error'):
+            return reason or timing['error']
+        if 'download_started' not in timing:
+            return "SteamCMD se detuvo antes de descargarlo"
+        return "Sin 'Success' en el log de SteamCMD"
+
+    def _flush_chunk(self):
+        if not self._buffer:
+            return
+        data = gzip.compress(("\n".join(self._buffer) + "\n").encode('utf-8'))
+        self._chunks.append({
+            "offset": self._file.tell(),
+            "length": len(data),
+            "first_line": self._line_count - len(self._buffer),
+            "line_count": len(self._buffer)
+        })
+        self._file.write(data)
+        self._file.flush()
+        self._buffer = []
+
+    def close(self, outcomes: dict[str, str], reasons: dict[str, str] | None = None) -> dict | None:
+        """
+        Cierra el log y registra la ejecución en el índice. `outcomes` mapea workshop_id -> 'succeeded'/'failed'
+        y `reasons` el motivo de los fallos que no explica el propio log. Devuelve el resumen con los tiempos
+        por mod en 'item_stats' (None si ya estaba cerrado).
+        """
+        with self._lock:
+            if self._closed:
+                return None
+            self._flush_chunk()
+            self._file.close()
+            self._closed = True
+
+        finished = time.time()
+        with open(self.logs_dir / f"{self.run_id}.idx.json", 'w', encoding='utf-8') as f:
+            json.dump({"chunks": self._chunks, "item_lines": self._item_lines}, f)
+        summary = {
+            "run_id": self.run_id,
+            "started": int(self.started),
+            "finished": int(finished),
+            "items": sorted(self.workshop_ids),
+            "outcomes": outcomes,
+            "lines": self._line_count,
+            "file": self.log_path.name
+        }
+        with open(self.logs_dir / INDEX_FILE, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(summary) + "\n")
+        return dict(summary, attempt=self.attempt, shards=self.shards, copy_threads=self.copy_threads,
+                    started=self.started, finished=finished, install_started=self.install_started,
+                    item_stats=self._item_stats(outcomes, reasons or {}))
+
+def list_runs(app_id: str) -> list[dict]:
+    """Devuelve el resumen de todas las ejecuciones registradas, de la más reciente a la más antigua."""
+    index_path = get_logs_dir(app_id) / INDEX_FILE
+    if not index_path.exists():
+        return []
+    runs = []
+    with open(index_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                runs.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return sorted(runs, key=lambda r: r.get('started', 0), reverse=True)
+
+def find_runs_for_item(app_id: str, workshop_id: str) -> list[dict]:
+    """Ejecuciones en las que participó un mod, consultando solo el índice."""
+    return [run for run in list_runs(app_id) if workshop_id in run.get('items', [])]
+
+def _read_lines(log_path: Path, chunk: dict) -> list[str]:
+    with open(log_path, 'rb') as f:
+        f.seek(chunk['offset'])
+        data = f.read(chunk['length'])
+    return gzip.decompress(data).decode('utf-8', errors='replace').split("\n")[:chunk['line_count']]
+
+def get_item_excerpt(app_id: str, run_id: str, workshop_id: str, context: int = 2) -> list[str]:
+    """
+    Devuelve las líneas de una ejecución relacionadas con un mod (con algunas de contexto),
+    descomprimiendo solo los fragmentos que las contienen.
+    """
+    logs_dir = get_logs_dir(app_id)
+    try:
+        with open(logs_dir / f"{run_id}.idx.json", 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return []
+    wanted = set()
+    for line_no in index.get('item_lines', {}).get(workshop_id, []):
+        wanted.update(range(max(0, line_no - context), line_no + context + 1))
+    if not wanted:
+        return []
+
+    excerpt = []
+    log_path = logs_dir / f"{run_id}.log.gz"
+    for chunk in index.get('chunks', []):
+        first, last = chunk['first_line'], chunk['first_line'] + chunk['line_count']
+        if not any(first <= n < last for n in wanted):
+            continue
+        for i, line in enumerate(_read_lines(log_path, chunk), start=first):
+            if i in wanted:
+                excerpt.append(line)
+    return excerpt
\ No newline at end of file
@@ -0,0 +1,51 @@
+#app/core/search_index.py
+import re
+import sqlite3
+from app.core.cache_index import CacheIndex
+
+class SearchIndex(CacheIndex):
+    """
+    Índice de texto completo (SQLite FTS5) sobre los detalles de mods guardados en caché:
+    título, descripción y nombres de dependencias. Hay una base de datos por juego
+    (gamedata/<appid>/search.db) que se actualiza incrementalmente con cada guardado en caché.
+    """
+    DB_NAME = "search.db"
+    TABLE = "mods"
+
+    def _create_schema(self, conn: sqlite3.Connection):
+        conn.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS mods USING fts5("
+            "workshop_id UNINDEXED, title, description, dependencies, tokenize='unicode61 remove_diacritics 2')"
+        )
+
+    def _rows_for(self, workshop_id: str, data: dict) -> list[tuple]:
+        dependency_names = " ".join(dep.get('name', '') for dep in data.get('dependencies', []))
+        return [(str(workshop_id), data.get('title', ''), data.get('description', ''), dependency_names)]
+
+    def _insert_rows(self, conn: sqlite3.Connection, rows: list[tuple]):
+        conn.executemany("INSERT INTO mods (workshop_id, title, description, dependencies) VALUES (?, ?, ?, ?)", rows)
+
+    @staticmethod
+    def _build_query(text: str) -> str:
+        # Cada palabra se busca como prefijo; se entrecomilla para neutralizar la sintaxis de FTS5.
+        terms = re.findall(r"\w+", text, re.UNICODE)
+        return " ".join(f'"{term}"*' for term in terms)
+
+    def search(self, app_id: str, text: str, limit: int = 500) -> list[str]:
+        """
+        Devuelve los workshop_id que coinciden con el texto, ordenados por relevancia (bm25).
+        El título pesa más que la descripción y los nombres de dependencias.
+        """
+        query = self._build_query(text)
+        if not query:
+            return []
+        with self._lock:
+            conn = self._get_connection(app_id)
+            rows = conn.execute(
+                "SELECT workshop_id FROM mods WHERE mods MATCH ? ORDER BY bm25(mods, 0.0, 10.0, 1.0, 3.0) LIMIT ?",
+                (query, limit)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+# Instancia única para ser usada en toda la aplicación
+search_index = SearchIndex()
\ No newline at end of file
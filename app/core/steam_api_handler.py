@@ -1,13 +1,24 @@
 #app/core/steam_api_handler.py
 import requests
 from app.core.config_manager import config_manager
+from app.core.network_governor import network_governor
+
+STEAM_API_BASE_URL = "https://api.steampowered.com"
 
 class SteamAPIHandler:
     """Gestiona las llamadas a la API Web de Steam."""
-    API_URL = "https://api.steampowered.com/ISteamRemoteStorage/GetPublishedFileDetails/v1/"
+    DETAILS_BATCH_SIZE = 100
+    QUERY_PAGE_SIZE = 100 # Máximo que admite QueryFiles por página
+    QUERY_RANKED_BY_LAST_UPDATED = 21 # EPublishedFileQueryType.k_PublishedFileQueryType_RankedByLastUpdatedDate
 
     def __init__(self):
         self.api_key = config_manager.get("API", "steam_api_key")
+        # Con [Testing] mock_steam_url las llamadas van al servidor simulado de tools/mock_steam_server.py
+        base_url = config_manager.get("Testing", "mock_steam_url", fallback="") or STEAM_API_BASE_URL
+        self.api_url = f"{base_url.rstrip('/')}/ISteamRemoteStorage/GetPublishedFileDetails/v1/"
+        # A diferencia de la anterior, este endpoint devuelve los 'children' (objetos requeridos) de cada mod
+        self.details_url = f"{base_url.rstrip('/')}/IPublishedFileService/GetDetails/v1/"
+        self.query_url = f"{base_url.rstrip('/')}/IPublishedFileService/QueryFiles/v1/"
 
     def get_mod_details(self, workshop_ids: list[str]) -> dict | None:
         """
@@ -26,7 +37,7 @@ class SteamAPIHandler:
         }
         
         try:
-            response = requests.post(self.API_URL, data=payload)
+            response = network_governor.post(self.api_url, data=payload)
             response.raise_for_status()
             data = response.json().get('response', {})
             
@@ -37,5 +48,88 @@ class SteamAPIHandler:
             print(f"Error en la llamada a la API de Steam: {e}")
             return None
 
+    def get_published_file_details(self, workshop_ids: list[str], include_children: bool = False) -> dict | None:
+        """
+        Obtiene los detalles de muchos mods con IPublishedFileService/GetDetails, en lotes de
+        DETAILS_BATCH_SIZE por petición. Devuelve un diccionario workshop_id -> datos del mod
+        (incluida la lista 'children' si include_children es True). Si falla algún lote se devuelven
+        los mods de los lotes que sí respondieron; None si no hay clave o fallan todos.
+        """
+        if not self.api_key:
+            return None
+        details = {}
+        failed_batches = 0
+        for start in range(0, len(workshop_ids), self.DETAILS_BATCH_SIZE):
+            batch = workshop_ids[start:start + self.DETAILS_BATCH_SIZE]
+            params = {
+                'key': self.api_key,
+                'includechildren': 'true' if include_children else 'false',
+                **{f'publishedfileids[{i}]': wid for i, wid in enumerate(batch)}
+            }
+            try:
+                response = network_governor.get(self.details_url, params=params, timeout=30)
+                response.raise_for_status()
+                items = response.json().get('response', {}).get('publishedfiledetails', [])
+            except (requests.RequestException, ValueError) as e:
+                print(f"Error en la llamada a la API de Steam: {e}")
+                failed_batches += 1
+                continue
+            details.update({str(item.get('publishedfileid')): item for item in items})
+        if failed_batches and not details:
+            return None
+        return details
+
+    def query_files(self, app_id: str, cursor: str = "*") -> tuple[list[dict], str | None, int] | None:
+        """
+        Una página del catálogo de la Workshop de un juego con IPublishedFileService/QueryFiles, de la
+        actualización más reciente a la más antigua. Devuelve (mods, cursor de la página siguiente o None
+        al llegar al final, total de mods), o None si no hay clave o falla la API.
+        """
+        if not self.api_key:
+            return None
+        params = {
+            'key': self.api_key,
+            'appid': app_id,
+            'query_type': self.QUERY_RANKED_BY_LAST_UPDATED,
+            'cursor': cursor,
+            'numperpage': self.QUERY_PAGE_SIZE,
+            'return_vote_data': 'true',
+            'return_previews': 'false'
+        }
+        try:
+            response = network_governor.get(self.query_url, params=params, timeout=30)
+            response.raise_for_status()
+            data = response.json().get('response', {})
+        except (requests.RequestException, ValueError) as e:
+            print(f"Error en la llamada a la API de Steam: {e}")
+            return None
+        items = data.get('publishedfiledetails', [])
+        next_cursor = data.get('next_cursor')
+        return items, (next_cursor if items and next_cursor and next_cursor != cursor else None), int(data.get('total', 0))
+
+    def dependencies_from_details(self, details: dict) -> dict[str, list[dict]]:
+        """
+        Extrae las aristas de dependencia de una respuesta de get_published_file_details(include_children=True).
+        Devuelve workshop_id -> [{'id', 'name'}] (el mismo formato que el scraping) solo para los mods que
+        la API resolvió; los títulos de las dependencias que no venían en la respuesta se piden en un lote más.
+        """
+        edges = {
+            wid: [str(child.get('publishedfileid')) for child in item.get('children', []) if child.get('publishedfileid')]
+            for wid, item in details.items() if item.get('result') == 1
+        }
+        titles = {wid: item.get('title') for wid, item in details.items() if item.get('result') == 1}
+        unknown = sorted({dep for deps in edges.values() for dep in deps if dep not in titles})
+        if unknown:
+            extra = self.get_published_file_details(unknown) or {}
+            titles.update({wid: item.get('title') for wid, item in extra.items() if item.get('result') == 1})
+        return {wid: [{'id': dep, 'name': titles.get(dep) or f"Mod ID {dep}"} for dep in deps] for wid, deps in edges.items()}
+
+    def get_dependencies(self, workshop_ids: list[str]) -> dict[str, list[dict]] | None:
+        """Dependencias de muchos mods en unas pocas peticiones. None si la API no está disponible."""
+        details = self.get_published_file_details(workshop_ids, include_children=True)
+        if details is None:
+            return None
+        return self.dependencies_from_details(details)
+
 # Instancia única
 steam_api_handler = SteamAPIHandler()
\ No newline at end of file
@@ -1,8 +1,10 @@
 #app/core/steam_handler.py
 import subprocess
 import re
+import sys
 from pathlib import Path
 from PyQt6.QtCore import QObject, pyqtSignal, QRunnable
+from app.core.tracer import tracer
 
 class SteamCMDWorkerSignals(QObject):
     """Clase separada que hereda de QObject para poder definir y emitir señales."""
@@ -15,7 +17,7 @@ class SteamCMDWorker(QRunnable):
     Ejecuta el proceso de SteamCMD en un hilo separado para no bloquear la UI,
     emitiendo la salida de la consola en tiempo real.
     """
-    def __init__(self, steamcmd_path: str, script_path: str):
+    def __init__(self, steamcmd_path: str, script_path: str, log_writer=None):
         super().__init__()
         
         # --- LÍNEA CRÍTICA AÑADIDA ---
@@ -28,9 +30,15 @@ class SteamCMDWorker(QRunnable):
         # de directorio de trabajo con SteamCMD.
         self.script_path = str(Path(script_path).resolve())
         self.process = None
+        # RunLogWriter opcional para guardar la salida en disco desde este mismo hilo
+        self.log_writer = log_writer
 
     def run(self):
         """El método principal que se ejecuta en el hilo del QThreadPool."""
+        with tracer.span("steamcmd.run", "download", script=self.script_path):
+            self._run_steamcmd()
+
+    def _run_steamcmd(self):
         if not Path(self.steamcmd_path).exists():
             self.signals.error.emit(f"Error: La ruta de SteamCMD no es válida: '{self.steamcmd_path}'")
             return
@@ -43,6 +51,9 @@ class SteamCMDWorker(QRunnable):
             self.steamcmd_path,
             "+runscript", self.script_path
         ]
+        if self.steamcmd_path.endswith('.py'):
+            # SteamCMD simulado para pruebas de carga (tools/fake_steamcmd.py)
+            command.insert(0, sys.executable)
         
         try:
             # Iniciar el proceso de SteamCMD
@@ -60,6 +71,8 @@ class SteamCMDWorker(QRunnable):
             # Leer la salida línea por línea en tiempo real mientras el proceso se ejecuta
             for line in iter(self.process.stdout.readline, ''):
                 self.signals.output.emit(line) # Emitir cada línea a la consola de la UI
+                if self.log_writer:
+                    self.log_writer.write_line(line)
                 full_output += line
             
             # Esperar a que el proceso termine
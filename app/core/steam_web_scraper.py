@@ -1,7 +1,45 @@
 #app/core/steam_web_scraper.py
+import time
 import requests
-from bs4 import BeautifulSoup
 from PyQt6.QtCore import QObject, pyqtSignal, QRunnable, QThreadPool
+from app.core.config_manager import config_manager
+from app.core.tracer import tracer
+from app.core.metrics import scrape_duration_seconds
+from app.core.parse_pool import parse_pool
+from app.core.network_governor import network_governor
+
+# Con [Testing] mock_steam_url las páginas se piden al servidor simulado de tools/mock_steam_server.py
+STEAM_COMMUNITY_URL = (config_manager.get("Testing", "mock_steam_url", fallback="") or "https://steamcommunity.com").rstrip('/')
+WORKSHOP_ITEM_URL = STEAM_COMMUNITY_URL + "/sharedfiles/filedetails/?id={}"
+# Resultados de la Workshop de un juego, de la actualización más reciente a la más antigua (30 por página)
+WORKSHOP_BROWSE_URL = (STEAM_COMMUNITY_URL + "/workshop/browse/?appid={}&browsesort=lastupdated&section=readytouseitems"
+                       "&actualsort=lastupdated&numperpage=30&p={}")
+
+def fetch_mod_page(workshop_id: str) -> str:
+    """Descarga el HTML de la página de un mod. Lanza requests.RequestException si falla."""
+    with tracer.span("scraper.fetch", "scrape", workshop_id=workshop_id):
+        headers = {'User-Agent': 'Mozilla/5.0'}
+        response = network_governor.get(WORKSHOP_ITEM_URL.format(workshop_id), headers=headers)
+        response.raise_for_status()
+        return response.text
+
+def fetch_browse_page(app_id: str, page: int) -> str:
+    """Descarga el HTML de una página de resultados de la Workshop. Lanza requests.RequestException si falla."""
+    with tracer.span("scraper.browse", "scrape", app_id=app_id, page=page):
+        response = network_governor.get(WORKSHOP_BROWSE_URL.format(app_id, page), headers={'User-Agent': 'Mozilla/5.0'})
+        response.raise_for_status()
+        return response.text
+
+def scrape_mod_details(workshop_id: str) -> dict:
+    """Descarga y analiza la página de un mod de forma síncrona (para usar desde hilos de trabajo)."""
+    start = time.perf_counter()
+    try:
+        with tracer.span("scraper.run", "scrape", workshop_id=workshop_id):
+            html = fetch_mod_page(workshop_id)
+            with tracer.span("scraper.parse", "scrape", workshop_id=workshop_id):
+                return parse_pool.parse(html)
+    finally:
+        scrape_duration_seconds.observe(time.perf_counter() - start)
 
 class ScraperSignals(QObject):
     """Señales para el scraper, para comunicación entre hilos."""
@@ -17,47 +55,27 @@ class SteamWebScraper(QRunnable):
         super().__init__()
         self.workshop_id = workshop_id
         self.signals = ScraperSignals()
+        self._cancelled = False
+
+    def cancel(self):
+        """Marca el scraping como descartado: no se analizará la página ni se emitirán resultados."""
+        self._cancelled = True
 
     def run(self):
+        if self._cancelled:
+            return
+        start = time.perf_counter()
         try:
-            url = f"https://steamcommunity.com/sharedfiles/filedetails/?id={self.workshop_id}"
-            headers = {'User-Agent': 'Mozilla/5.0'}
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
-
-            soup = BeautifulSoup(response.text, 'lxml')
-
-            # Extraer datos
-            title = soup.find('div', class_='workshopItemTitle').text.strip()
-            description_div = soup.find('div', class_='workshopItemDescription')
-            description = description_div.get_text(separator='\n', strip=True) if description_div else "No se encontró descripción."
-            
-            # El banner principal
-            image_url = ""
-            preview_image = soup.find('img', id='mainContentsContainer')
-            if preview_image:
-                image_url = preview_image['src']
-
-            # Extraer dependencias
-            dependencies = []
-            required_items_section = soup.find('div', id='RequiredItems')
-            if required_items_section:
-                dependency_links = required_items_section.find_all('a')
-                for link in dependency_links:
-                    dep_name = link.find('div', class_='requiredItem').text.strip()
-                    dep_url = link['href']
-                    dep_id = dep_url.split('id=')[-1]
-                    dependencies.append({'name': dep_name, 'id': dep_id})
-            
-            result = {
-                'title': title,
-                'description': description,
-                'image_url': image_url,
-                'dependencies': dependencies
-            }
+            with tracer.span("scraper.run", "scrape", workshop_id=self.workshop_id):
+                html = fetch_mod_page(self.workshop_id)
+                if self._cancelled:
+                    return
+                with tracer.span("scraper.parse", "scrape", workshop_id=self.workshop_id):
+                    result = parse_pool.parse(html)
             self.signals.finished.emit(result)
-
         except requests.RequestException as e:
             self.signals.error.emit(f"Error de red: {e}")
         except Exception as e:
-            self.signals.error.emit(f"Error de parsing: {e}")
\ No newline at end of file
+            self.signals.error.emit(f"Error de parsing: {e}")
+        finally:
+            scrape_duration_seconds.observe(time.perf_counter() - start)
\ No newline at end of file
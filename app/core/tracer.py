@@ -0,0 +1,74 @@
+#app/core/tracer.py
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from app.core.config_manager import config_manager
+
+class Tracer:
+    """
+    Registro ligero de spans de tiempo para diagnosticar qué etapa es lenta
+    (scraping, caché, resolución de dependencias, descarga e instalación).
+    Los eventos se exportan en formato Chrome trace-event (chrome://tracing, Perfetto).
+    """
+    MAX_EVENTS = 50000
+
+    def __init__(self):
+        self.enabled = config_manager.get("Tracing", "enabled", fallback="false").lower() in ("1", "true", "yes", "on")
+        self.trace_file = Path(config_manager.get("Tracing", "trace_file", fallback="trace.json"))
+        self._events = deque(maxlen=self.MAX_EVENTS)
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def _now_us(self) -> float:
+        return time.perf_counter_ns() / 1000
+
+    @contextmanager
+    def span(self, name: str, category: str = "app", **args):
+        """
+        Context manager que mide la duración del bloque y la registra como un evento completo ('X').
+        Si el trazado está desactivado, el coste es prácticamente nulo.
+        """
+        if not self.enabled:
+            yield
+            return
+        start = self._now_us()
+        try:
+            yield
+        finally:
+            self._add_event({
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": start,
+                "dur": self._now_us() - start,
+                "pid": self._pid,
+                "tid": threading.get_ident(),
+                "args": {k: str(v) for k, v in args.items()}
+            })
+
+    def _add_event(self, event: dict):
+        with self._lock:
+            self._events.append(event)
+
+    def clear(self):
+        """Descarta todos los eventos registrados."""
+        with self._lock:
+            self._events.clear()
+
+    def export(self, path: str | Path | None = None) -> Path | None:
+        """Escribe los eventos registrados como JSON de Chrome trace-event. Devuelve la ruta escrita."""
+        if not self.enabled:
+            return None
+        target = Path(path) if path else self.trace_file
+        with self._lock:
+            events = list(self._events)
+        with open(target, 'w', encoding='utf-8') as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return target
+
+# Instancia única para ser usada en toda la aplicación
+tracer = Tracer()
\ No newline at end of file
@@ -0,0 +1,50 @@
+#app/core/ui_snapshot.py
+import json
+import os
+from PyQt6.QtCore import QObject, pyqtSignal, QRunnable
+from app.core.data_manager import data_manager
+from app.core.mod_repository import mod_repository
+
+SNAPSHOT_FILE = "ui_snapshot.json"
+SNAPSHOT_VERSION = 1
+
+def get_snapshot_path():
+    return data_manager.gamedata_path / SNAPSHOT_FILE
+
+def load_snapshot() -> dict | None:
+    """Lee la instantánea de la última sesión. None si no existe, está dañada o es de otra versión."""
+    try:
+        with open(get_snapshot_path(), 'r', encoding='utf-8') as f:
+            snapshot = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    if not isinstance(snapshot, dict) or snapshot.get('version') != SNAPSHOT_VERSION:
+        return None
+    return snapshot
+
+def save_snapshot(snapshot: dict):
+    """Guarda la instantánea de forma atómica para que un cierre brusco no la deje a medias."""
+    path = get_snapshot_path()
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({**snapshot, 'version': SNAPSHOT_VERSION}, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+class StateLoadSignals(QObject):
+    finished = pyqtSignal(str, list, list) # (app_id, [(app_id, nombre)] de los juegos, mods del juego)
+
+class StateLoadWorker(QRunnable):
+    """
+    Lee en segundo plano los datos reales (registro de juegos y mods.json del juego de la
+    instantánea) para reconciliarlos con lo que ya se pintó desde la instantánea.
+    """
+    def __init__(self, app_id: str):
+        super().__init__()
+        self.signals = StateLoadSignals()
+        self.app_id = app_id
+
+    def run(self):
+        registry = data_manager.get_registry()
+        games = [(app_id, registry[app_id].get('name', 'Nombre Desconocido')) for app_id in data_manager.list_managed_games()]
+        mods = mod_repository.game(self.app_id).records() if self.app_id in registry else []
+        self.signals.finished.emit(self.app_id, games, mods)
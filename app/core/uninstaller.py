@@ -0,0 +1,59 @@
+#app/core/uninstaller.py
+import shutil
+import time
+from pathlib import Path
+from PyQt6.QtCore import QObject, pyqtSignal, QRunnable
+from app.core.tracer import tracer
+
+TRASH_DIR_NAME = ".moddownloader_trash"
+
+class UninstallSignals(QObject):
+    progress = pyqtSignal(int, int)      # (carpetas eliminadas, total)
+    finished = pyqtSignal(list, dict)    # (workshop_ids desinstalados, {workshop_id: error})
+
+class UninstallWorker(QRunnable):
+    """
+    Desinstala varios mods fuera del hilo de la UI. Primero mueve cada carpeta a una papelera
+    dentro de la misma carpeta de mods (un renombrado, casi instantáneo) y después borra la
+    papelera, incluidos los restos de desinstalaciones anteriores que se interrumpieran.
+    """
+    def __init__(self, install_dir: Path, workshop_ids: list[str]):
+        super().__init__()
+        self.signals = UninstallSignals()
+        self.install_dir = Path(install_dir)
+        self.workshop_ids = list(workshop_ids)
+
+    def run(self):
+        with tracer.span("uninstall.run", "install", items=len(self.workshop_ids)):
+            removed, errors = self._uninstall()
+        self.signals.finished.emit(removed, errors)
+
+    def _uninstall(self) -> tuple[list, dict]:
+        trash_dir = self.install_dir / TRASH_DIR_NAME
+        removed, errors = [], {}
+        stamp = int(time.time() * 1000)
+
+        # Fase 1: mover a la papelera
+        for workshop_id in self.workshop_ids:
+            mod_path = self.install_dir / workshop_id
+            if not mod_path.exists():
+                removed.append(workshop_id)
+                continue
+            try:
+                trash_dir.mkdir(exist_ok=True)
+                mod_path.rename(trash_dir / f"{workshop_id}_{stamp}")
+                removed.append(workshop_id)
+            except OSError as e:
+                errors[workshop_id] = str(e)
+
+        # Fase 2: vaciar la papelera
+        if trash_dir.exists():
+            trashed = list(trash_dir.iterdir())
+            for i, path in enumerate(trashed, start=1):
+                shutil.rmtree(path, ignore_errors=True)
+                self.signals.progress.emit(i, len(trashed))
+            try:
+                trash_dir.rmdir()
+            except OSError:
+                pass # Queda algo bloqueado; se reintentará en la próxima desinstalación
+        return removed, errors
\ No newline at end of file
@@ -0,0 +1,53 @@
+#app/core/vdf_parser.py
+import re
+
+# Un token es: cadena entre comillas (con escapes), llave, o palabra sin comillas. Los comentarios // se ignoran.
+_TOKEN_RE = re.compile(r'"((?:[^"\\]|\\.)*)"|(\{)|(\})|//[^\n]*|([^\s{}"]+)')
+_ESCAPES = {'n': '\n', 't': '\t', '\\': '\\', '"': '"'}
+_ESCAPE_RE = re.compile(r'\\(.)')
+
+class VDFParseError(ValueError):
+    """El texto no es un VDF/ACF válido."""
+
+def _unescape(value: str) -> str:
+    if '\\' not in value:
+        return value
+    return _ESCAPE_RE.sub(lambda m: _ESCAPES.get(m.group(1), m.group(1)), value)
+
+def parse_vdf(text: str) -> dict:
+    """
+    Analiza texto en formato KeyValues de Valve (VDF/ACF) y devuelve diccionarios anidados.
+    Las claves repetidas conservan el último valor, como hace Steam.
+    """
+    root = {}
+    stack = [root]
+    key = None
+    for match in _TOKEN_RE.finditer(text):
+        quoted, open_brace, close_brace, bare = match.groups()
+        if open_brace:
+            if key is None:
+                raise VDFParseError(f"Bloque sin clave en la posición {match.start()}")
+            child = {}
+            stack[-1][key] = child
+            stack.append(child)
+            key = None
+        elif close_brace:
+            if len(stack) == 1:
+                raise VDFParseError(f"Llave de cierre sin abrir en la posición {match.start()}")
+            stack.pop()
+            key = None
+        elif quoted is not None or bare is not None:
+            token = _unescape(quoted) if quoted is not None else bare
+            if key is None:
+                key = token
+            else:
+                stack[-1][key] = token
+                key = None
+    if len(stack) != 1:
+        raise VDFParseError("Faltan llaves de cierre")
+    return root
+
+def load_vdf(path) -> dict:
+    """Lee y analiza un archivo VDF/ACF."""
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        return parse_vdf(f.read())
\ No newline at end of file
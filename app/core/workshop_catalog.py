@@ -0,0 +1,205 @@
+#app/core/workshop_catalog.py
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from PyQt6.QtCore import QObject, pyqtSignal, QRunnable
+from app.core.config_manager import config_manager
+from app.core.data_manager import data_manager
+from app.core.steam_api_handler import steam_api_handler
+from app.core.steam_web_scraper import fetch_browse_page
+from app.core.parse_pool import parse_pool
+from app.core.tracer import tracer
+
+class WorkshopCatalog:
+    """
+    Catálogo local de la Workshop de cada juego (gamedata/<appid>/catalog.db): id, título, valoración,
+    votos y fecha de actualización de cada mod, para filtrar y elegir mods sin abrir el navegador.
+    Lo rellena CatalogCrawler; las consultas se hacen contra SQLite sin tocar la red.
+    """
+    DB_NAME = "catalog.db"
+    ORDERS = {
+        'updated': "time_updated IS NULL, time_updated DESC, seen_at DESC, position",
+        'rating': "rating IS NULL, rating DESC, votes DESC",
+        'title': "title COLLATE NOCASE"
+    }
+
+    def __init__(self):
+        self._connections: dict[str, sqlite3.Connection] = {}
+        self._lock = threading.Lock()
+
+    def _get_connection(self, app_id: str) -> sqlite3.Connection:
+        key = str(app_id)
+        conn = self._connections.get(key)
+        if conn is None:
+            conn = sqlite3.connect(data_manager.get_game_path(app_id) / self.DB_NAME, check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS items (workshop_id TEXT PRIMARY KEY, title TEXT NOT NULL, rating REAL, votes INTEGER, "
+                "time_updated INTEGER, preview_url TEXT, seen_at INTEGER NOT NULL, position INTEGER NOT NULL)"
+            )
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            self._connections[key] = conn
+        return conn
+
+    def upsert(self, app_id: str, items: list[dict]):
+        """Añade o actualiza mods. Los campos que falten (p. ej. la fecha al venir del HTML) conservan su valor."""
+        rows = [(item['workshop_id'], item.get('title', ''), item.get('rating'), item.get('votes'), item.get('time_updated'),
+                 item.get('preview_url', ''), item['seen_at'], item['position']) for item in items]
+        with self._lock:
+            conn = self._get_connection(app_id)
+            with conn:
+                conn.executemany(
+                    "INSERT INTO items (workshop_id, title, rating, votes, time_updated, preview_url, seen_at, position) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT(workshop_id) DO UPDATE SET "
+                    "title = excluded.title, rating = COALESCE(excluded.rating, rating), votes = COALESCE(excluded.votes, votes), "
+                    "time_updated = COALESCE(excluded.time_updated, time_updated), preview_url = excluded.preview_url, "
+                    "seen_at = excluded.seen_at, position = excluded.position", rows)
+
+    def known_ids(self, app_id: str, workshop_ids: list[str]) -> set[str]:
+        """Cuáles de los ids ya están en el catálogo."""
+        if not workshop_ids:
+            return set()
+        with self._lock:
+            rows = self._get_connection(app_id).execute(
+                f"SELECT workshop_id FROM items WHERE workshop_id IN ({','.join('?' * len(workshop_ids))})", workshop_ids).fetchall()
+        return {row[0] for row in rows}
+
+    def get_meta(self, app_id: str, key: str, default: str | None = None) -> str | None:
+        with self._lock:
+            row = self._get_connection(app_id).execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, app_id: str, key: str, value):
+        with self._lock:
+            conn = self._get_connection(app_id)
+            with conn:
+                conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+    @staticmethod
+    def _where(text: str) -> tuple[str, list]:
+        terms = text.split()
+        if not terms:
+            return "", []
+        return " WHERE " + " AND ".join("(title LIKE ? OR workshop_id = ?)" for _ in terms), [p for t in terms for p in (f"%{t}%", t)]
+
+    def query(self, app_id: str, text: str = "", order: str = 'updated', limit: int = 1000) -> list[dict]:
+        """Mods del catálogo cuyo título contiene todas las palabras de `text` (o cuyo id es una de ellas)."""
+        where, params = self._where(text)
+        with self._lock:
+            rows = self._get_connection(app_id).execute(
+                f"SELECT workshop_id, title, rating, votes, time_updated FROM items{where} ORDER BY {self.ORDERS[order]} LIMIT ?",
+                params + [limit]).fetchall()
+        return [{'workshop_id': r[0], 'title': r[1], 'rating': r[2], 'votes': r[3], 'time_updated': r[4]} for r in rows]
+
+    def count(self, app_id: str, text: str = "") -> int:
+        where, params = self._where(text)
+        with self._lock:
+            return self._get_connection(app_id).execute(f"SELECT COUNT(*) FROM items{where}", params).fetchone()[0]
+
+# Instancia única para ser usada en toda la aplicación
+workshop_catalog = WorkshopCatalog()
+
+class CatalogCrawlerSignals(QObject):
+    progress = pyqtSignal(int, int)  # (páginas leídas, mods guardados)
+    finished = pyqtSignal(int, str)  # (mods guardados, error o "" si terminó bien)
+
+class CatalogCrawler(QRunnable):
+    """
+    Recorre la Workshop de un juego ordenada por "actualizados recientemente" y guarda cada página en
+    workshop_catalog. Con clave de API usa QueryFiles (100 mods por página, con fecha y votos); sin ella,
+    las páginas de /workshop/browse/, varias a la vez. Si no es un refresco completo, se detiene al llegar
+    a mods que ya estaban en el catálogo sin cambios desde el recorrido anterior.
+    """
+    def __init__(self, app_id: str, full: bool = False):
+        super().__init__()
+        self.signals = CatalogCrawlerSignals()
+        self.app_id = str(app_id)
+        self.full = full
+        self.threads = max(1, int(config_manager.get("Performance", "crawl_threads", fallback="4")))
+        self.max_pages = int(config_manager.get("Performance", "crawl_max_pages", fallback="500"))
+        self.seen_at = int(time.time())
+        self.saved = 0
+        self.pages = 0
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        error = ""
+        try:
+            with tracer.span("catalog.crawl", "catalog", app_id=self.app_id, full=self.full):
+                if steam_api_handler.api_key:
+                    self._crawl_api()
+                else:
+                    self._crawl_html()
+            if not self._cancelled:
+                workshop_catalog.set_meta(self.app_id, 'last_crawl', self.seen_at)
+        except Exception as e: # Red, sqlite3, análisis de páginas o RuntimeError si la aplicación se cerró
+            error = str(e) or type(e).__name__
+        finally:
+            # Siempre se avisa, para que el diálogo no se quede esperando a un recorrido que ya terminó
+            if not self._cancelled:
+                self.signals.finished.emit(self.saved, error)
+
+    def _save_page(self, items: list[dict]):
+        workshop_catalog.upsert(self.app_id, items)
+        self.saved += len(items)
+        self.pages += 1
+        self.signals.progress.emit(self.pages, self.saved)
+
+    def _crawl_api(self):
+        watermark = 0 if self.full else int(workshop_catalog.get_meta(self.app_id, 'api_time_updated', '0'))
+        newest, cursor = watermark, "*"
+        while cursor and self.pages < self.max_pages and not self._cancelled:
+            result = steam_api_handler.query_files(self.app_id, cursor)
+            if result is None:
+                raise requests.RequestException("La API Web de Steam no respondió a QueryFiles")
+            items, cursor, _ = result
+            page = []
+            for item in items:
+                vote_data = item.get('vote_data') or {}
+                votes = vote_data.get('votes_up', 0) + vote_data.get('votes_down', 0)
+                page.append({
+                    'workshop_id': str(item.get('publishedfileid')),
+                    'title': item.get('title', ''),
+                    'rating': round(vote_data['score'] * 5, 2) if votes and 'score' in vote_data else None,
+                    'votes': votes,
+                    'time_updated': item.get('time_updated'),
+                    'preview_url': item.get('preview_url', ''),
+                    'seen_at': self.seen_at,
+                    'position': self.saved + len(page)
+                })
+            self._save_page(page)
+            newest = max([newest] + [item['time_updated'] or 0 for item in page])
+            # Ordenados por fecha de actualización: lo que queda por debajo ya se guardó en el recorrido anterior
+            if watermark and any((item['time_updated'] or 0) < watermark for item in page):
+                cursor = None
+        # Solo se avanza la marca si se llegó hasta ella o al final; si no, el siguiente recorrido completa el hueco
+        if cursor is None and not self._cancelled:
+            workshop_catalog.set_meta(self.app_id, 'api_time_updated', newest)
+
+    def _fetch_page(self, page: int) -> list[dict]:
+        return parse_pool.parse_browse(fetch_browse_page(self.app_id, page))
+
+    def _crawl_html(self):
+        # Las páginas se piden en tandas de `threads`; el network_governor limita el ritmo por host
+        with ThreadPoolExecutor(max_workers=self.threads) as executor:
+            next_page = 1
+            while next_page <= self.max_pages and not self._cancelled:
+                batch = list(range(next_page, min(next_page + self.threads, self.max_pages + 1)))
+                next_page = batch[-1] + 1
+                results = list(executor.map(self._fetch_page, batch))
+                all_known = True
+                for items in results:
+                    if not items:
+                        return # Fin del catálogo
+                    known = workshop_catalog.known_ids(self.app_id, [item['workshop_id'] for item in items])
+                    all_known = all_known and len(known) == len(items)
+                    for i, item in enumerate(items):
+                        item.update(seen_at=self.seen_at, position=self.saved + i)
+                    self._save_page(items)
+                # Sin fechas en el HTML: una tanda entera de mods ya conocidos marca el final de lo nuevo
+                if all_known and not self.full:
+                    return
@@ -0,0 +1,53 @@
+#app/core/workshop_manifest.py
+from pathlib import Path
+from app.core.vdf_parser import load_vdf, VDFParseError
+
+def get_manifest_path(workshop_root: Path, app_id: str) -> Path:
+    """Ruta del appworkshop_<appid>.acf que SteamCMD mantiene para un juego."""
+    return workshop_root / f"appworkshop_{app_id}.acf"
+
+def get_content_path(workshop_root: Path, app_id: str, workshop_id: str) -> Path:
+    """Carpeta donde SteamCMD deja el contenido descargado de un mod."""
+    return workshop_root / "content" / str(app_id) / str(workshop_id)
+
+def load_installed_items(workshop_root: Path, app_id: str) -> dict[str, dict]:
+    """
+    Devuelve lo que SteamCMD ya tiene de un juego según su manifiesto:
+    workshop_id -> {'timeupdated': int, 'size': int, 'content_path': Path}.
+    Solo se incluyen los mods cuya carpeta de contenido sigue existiendo.
+    """
+    manifest_path = get_manifest_path(workshop_root, app_id)
+    if not manifest_path.exists():
+        return {}
+    try:
+        manifest = load_vdf(manifest_path).get('AppWorkshop', {})
+    except (VDFParseError, OSError):
+        return {}
+
+    items = {}
+    installed = manifest.get('WorkshopItemsInstalled', {})
+    for workshop_id, entry in installed.items():
+        if not isinstance(entry, dict):
+            continue
+        content_path = get_content_path(workshop_root, app_id, workshop_id)
+        if not content_path.is_dir():
+            continue
+        items[workshop_id] = {
+            'timeupdated': int(entry.get('timeupdated', 0) or 0),
+            'size': int(entry.get('size', 0) or 0),
+            'content_path': content_path
+        }
+    return items
+
+def find_up_to_date(workshop_root: Path, app_id: str, remote_time_updated: dict[str, int]) -> dict[str, Path]:
+    """
+    Cruza el manifiesto con el time_updated de la API y devuelve los mods cuya copia local
+    de SteamCMD ya es la versión actual: workshop_id -> carpeta de contenido.
+    """
+    local_items = load_installed_items(workshop_root, app_id)
+    current = {}
+    for workshop_id, remote_time in remote_time_updated.items():
+        local = local_items.get(workshop_id)
+        if local and remote_time and local['timeupdated'] >= remote_time:
+            current[workshop_id] = local['content_path']
+    return current
\ No newline at end of file
@@ -0,0 +1,68 @@
+#app/core/workshop_page_parser.py
+# Sin dependencias de Qt ni de la configuración: este módulo se importa en los procesos de parse_pool.
+import re
+from bs4 import BeautifulSoup
+from app.core.description_renderer import render_description_html
+
+def parse_mod_page(html: str) -> dict:
+    """Extrae título, descripción, banner y dependencias del HTML de la página de un mod."""
+    soup = BeautifulSoup(html, 'lxml')
+
+    # Extraer datos
+    title = soup.find('div', class_='workshopItemTitle').text.strip()
+    description_div = soup.find('div', class_='workshopItemDescription')
+    description = description_div.get_text(separator='\n', strip=True) if description_div else "No se encontró descripción."
+    # El HTML se limpia una sola vez aquí y se guarda en caché junto al resto de detalles
+    description_html, description_html_short = render_description_html(description_div) if description_div else ("", None)
+
+    # El banner principal
+    image_url = ""
+    preview_image = soup.find('img', id='mainContentsContainer')
+    if preview_image:
+        image_url = preview_image['src']
+
+    # Extraer dependencias
+    dependencies = []
+    required_items_section = soup.find('div', id='RequiredItems')
+    if required_items_section:
+        dependency_links = required_items_section.find_all('a')
+        for link in dependency_links:
+            dep_name = link.find('div', class_='requiredItem').text.strip()
+            dep_url = link['href']
+            dep_id = dep_url.split('id=')[-1]
+            dependencies.append({'name': dep_name, 'id': dep_id})
+
+    return {
+        'title': title,
+        'description': description,
+        'description_html': description_html,
+        'description_html_short': description_html_short,
+        'image_url': image_url,
+        'dependencies': dependencies
+    }
+
+_RATING_RE = re.compile(r"(\d)-star")
+
+def parse_browse_page(html: str) -> list[dict]:
+    """
+    Extrae los mods de una página de resultados de /workshop/browse/. Devuelve una lista de
+    {'workshop_id', 'title', 'rating', 'preview_url'} en el orden de la página; 'rating' son las
+    estrellas (0-5) de la imagen de valoración, o None si el mod aún no tiene suficientes votos.
+    """
+    soup = BeautifulSoup(html, 'lxml')
+    items = []
+    for item_div in soup.find_all('div', class_='workshopItem'):
+        link = item_div.find('a', attrs={'data-publishedfileid': True})
+        if not link:
+            continue
+        title_div = item_div.find('div', class_='workshopItemTitle')
+        rating_img = item_div.find('img', class_='fileRating')
+        rating_match = _RATING_RE.search(rating_img.get('src', '')) if rating_img else None
+        preview_img = item_div.find('img', class_='workshopItemPreviewImage')
+        items.append({
+            'workshop_id': link['data-publishedfileid'],
+            'title': title_div.text.strip() if title_div else "",
+            'rating': int(rating_match.group(1)) if rating_match else None,
+            'preview_url': preview_img.get('src', '') if preview_img else ""
+        })
+    return items
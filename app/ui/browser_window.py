@@ -27,6 +27,7 @@ class BrowserWindow(QMainWindow):
         self.server_signals = LocalServerSignals()
         self.server_thread = ServerThread(self.server_signals, self.staged_mods, self.managed_mod_ids)
         self.server_signals.mod_received.connect(self._add_mod_to_stage)
+        self.server_signals.mods_received.connect(self._add_mods_to_stage)
         self.server_signals.mod_removed.connect(self._remove_mod_from_stage)
         self.server_thread.start()
 
@@ -89,6 +90,7 @@ class BrowserWindow(QMainWindow):
         self.browser.urlChanged.connect(self._update_toolbar_state)
         # Conectar el cambio en el carrito para actualizar el botón de la toolbar
         self.server_signals.mod_received.connect(lambda: self._update_toolbar_state(self.browser.url()))
+        self.server_signals.mods_received.connect(lambda: self._update_toolbar_state(self.browser.url()))
         self.server_signals.mod_removed.connect(lambda: self._update_toolbar_state(self.browser.url()))
         
         self._update_toolbar_state(self.browser.url())
@@ -140,12 +142,28 @@ class BrowserWindow(QMainWindow):
             QMessageBox.warning(self, "Error", f"No se pudo procesar la URL actual.\nError: {e}")
 
     def _add_mod_to_stage(self, mod_data: dict):
-        workshop_id = mod_data.get('workshopId')
-        if workshop_id and workshop_id not in self.managed_mod_ids and workshop_id not in self.staged_mods:
-            self.staged_mods[workshop_id] = mod_data
-            item = QListWidgetItem(f"{mod_data.get('modName', 'N/A')} ({workshop_id})")
-            item.setData(Qt.ItemDataRole.UserRole, workshop_id)
-            self.staged_list_widget.addItem(item)
+        self._add_mods_to_stage([mod_data])
+
+    def _add_mods_to_stage(self, mods: list[dict]):
+        """Añade varios mods al carrito repintando la lista una sola vez."""
+        new_mods = []
+        for mod_data in mods:
+            workshop_id = mod_data.get('workshopId')
+            if workshop_id and workshop_id not in self.managed_mod_ids and workshop_id not in self.staged_mods:
+                self.staged_mods[workshop_id] = mod_data
+                new_mods.append(mod_data)
+        if not new_mods:
+            return
+
+        self.staged_list_widget.setUpdatesEnabled(False)
+        try:
+            for mod_data in new_mods:
+                item = QListWidgetItem(f"{mod_data.get('modName') or 'N/A'} ({mod_data['workshopId']})")
+                item.setData(Qt.ItemDataRole.UserRole, mod_data['workshopId'])
+                self.staged_list_widget.addItem(item)
+        finally:
+            self.staged_list_widget.setUpdatesEnabled(True)
+        self.staged_list_widget.scrollToBottom()
             
     def _remove_mod_from_stage(self, mod_data: dict):
         workshop_id = mod_data.get('workshopId')
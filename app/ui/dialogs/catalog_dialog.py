@@ -0,0 +1,148 @@
+#app/ui/dialogs/catalog_dialog.py
+import time
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLineEdit, QComboBox, QTableWidget,
+                             QTableWidgetItem, QPushButton, QLabel, QAbstractItemView, QHeaderView)
+from PyQt6.QtCore import Qt, QTimer, QThreadPool, pyqtSignal
+from PyQt6.QtGui import QColor
+from app.core.workshop_catalog import workshop_catalog, CatalogCrawler
+
+class CatalogDialog(QDialog):
+    """
+    Lista nativa del catálogo local de la Workshop de un juego: filtrar, ordenar y marcar mods para
+    añadirlos a pendientes sin abrir el navegador. El catálogo se rellena con CatalogCrawler.
+    """
+    DISPLAY_LIMIT = 2000
+    ORDERS = [("Actualizados recientemente", 'updated'), ("Mejor valorados", 'rating'), ("Título", 'title')]
+    mods_selected = pyqtSignal(list) # [{'appId', 'workshopId', 'modName'}], el formato del panel del navegador
+
+    def __init__(self, app_id: str, managed_mod_ids: list[str], crawl_pool: QThreadPool, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Catálogo de la Workshop")
+        self.setMinimumSize(900, 600)
+        self.app_id = app_id
+        self.managed_mod_ids = set(managed_mod_ids)
+        self.crawler: CatalogCrawler | None = None
+        # El grupo es de la ventana principal: un recorrido cancelado puede terminar su tanda
+        # después de que el diálogo se haya cerrado y destruido sin bloquear la interfaz
+        self.crawl_pool = crawl_pool
+
+        layout = QVBoxLayout(self)
+        filter_layout = QHBoxLayout()
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("Filtrar por título o Workshop ID...")
+        self.filter_edit.setClearButtonEnabled(True)
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(200)
+        self.filter_timer.timeout.connect(self.load_items)
+        self.filter_edit.textChanged.connect(self.filter_timer.start)
+        filter_layout.addWidget(self.filter_edit)
+        self.order_combo = QComboBox()
+        for label, order in self.ORDERS:
+            self.order_combo.addItem(label, userData=order)
+        self.order_combo.currentIndexChanged.connect(self.load_items)
+        filter_layout.addWidget(self.order_combo)
+        layout.addLayout(filter_layout)
+
+        self.table = QTableWidget(0, 4)
+        self.table.setHorizontalHeaderLabels(["Título", "Workshop ID", "Valoración", "Actualizado"])
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        layout.addWidget(self.table)
+
+        self.status_label = QLabel()
+        layout.addWidget(self.status_label)
+
+        button_layout = QHBoxLayout()
+        self.refresh_button = QPushButton("Actualizar Catálogo")
+        self.refresh_button.setToolTip("Descarga solo lo actualizado desde el último recorrido")
+        self.refresh_button.clicked.connect(lambda: self.start_crawl(full=False))
+        button_layout.addWidget(self.refresh_button)
+        self.full_crawl_button = QPushButton("Recorrido Completo")
+        self.full_crawl_button.setToolTip("Vuelve a recorrer todo el catálogo (valoraciones y títulos al día)")
+        self.full_crawl_button.clicked.connect(lambda: self.start_crawl(full=True))
+        button_layout.addWidget(self.full_crawl_button)
+        button_layout.addStretch()
+        self.add_button = QPushButton("Añadir Marcados a Pendientes")
+        self.add_button.clicked.connect(self.add_checked_mods)
+        button_layout.addWidget(self.add_button)
+        layout.addLayout(button_layout)
+
+        self.load_items()
+        if not workshop_catalog.count(self.app_id):
+            self.start_crawl(full=True)
+
+    def load_items(self):
+        text = self.filter_edit.text().strip()
+        items = workshop_catalog.query(self.app_id, text, self.order_combo.currentData(), self.DISPLAY_LIMIT)
+        self.table.setUpdatesEnabled(False)
+        self.table.setRowCount(len(items))
+        for row, item in enumerate(items):
+            managed = item['workshop_id'] in self.managed_mod_ids
+            title_item = QTableWidgetItem(item['title'] + (" (gestionado)" if managed else ""))
+            title_item.setData(Qt.ItemDataRole.UserRole, item)
+            if managed:
+                title_item.setFlags(title_item.flags() & ~Qt.ItemFlag.ItemIsEnabled)
+            else:
+                title_item.setFlags(title_item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+                title_item.setCheckState(Qt.CheckState.Unchecked)
+            rating = item['rating']
+            cells = [
+                title_item,
+                QTableWidgetItem(item['workshop_id']),
+                QTableWidgetItem("—" if rating is None else "★" * round(rating) + "☆" * (5 - round(rating))),
+                QTableWidgetItem(time.strftime("%Y-%m-%d", time.localtime(item['time_updated'])) if item['time_updated'] else "—")
+            ]
+            for column, cell in enumerate(cells):
+                if managed:
+                    cell.setForeground(QColor("gray"))
+                self.table.setItem(row, column, cell)
+        self.table.setUpdatesEnabled(True)
+        self._update_status(len(items), workshop_catalog.count(self.app_id, text))
+
+    def _update_status(self, shown: int, total: int, crawling: str = ""):
+        last_crawl = workshop_catalog.get_meta(self.app_id, 'last_crawl')
+        updated = time.strftime("%Y-%m-%d %H:%M", time.localtime(int(last_crawl))) if last_crawl else "nunca"
+        self.status_label.setText(crawling or f"Mostrando {shown} de {total} mods. Catálogo actualizado: {updated}.")
+
+    def start_crawl(self, full: bool):
+        if self.crawler:
+            return
+        self.crawler = CatalogCrawler(self.app_id, full)
+        self.crawler.signals.progress.connect(self.on_crawl_progress)
+        self.crawler.signals.finished.connect(self.on_crawl_finished)
+        self.refresh_button.setEnabled(False)
+        self.full_crawl_button.setEnabled(False)
+        self._update_status(0, 0, "Recorriendo la Workshop...")
+        self.crawl_pool.start(self.crawler)
+
+    def on_crawl_progress(self, pages: int, saved: int):
+        self._update_status(0, 0, f"Recorriendo la Workshop: {pages} páginas, {saved} mods guardados...")
+
+    def on_crawl_finished(self, saved: int, error: str):
+        self.crawler = None
+        self.refresh_button.setEnabled(True)
+        self.full_crawl_button.setEnabled(True)
+        self.load_items()
+        if error:
+            self.status_label.setText(f"El recorrido se interrumpió tras guardar {saved} mods: {error}")
+
+    def add_checked_mods(self):
+        mods = []
+        for row in range(self.table.rowCount()):
+            title_item = self.table.item(row, 0)
+            if title_item.checkState() == Qt.CheckState.Checked:
+                item = title_item.data(Qt.ItemDataRole.UserRole)
+                mods.append({'appId': self.app_id, 'workshopId': item['workshop_id'], 'modName': item['title']})
+        if not mods:
+            return
+        self.mods_selected.emit(mods)
+        self.managed_mod_ids.update(mod['workshopId'] for mod in mods)
+        self.load_items()
+
+    def done(self, result: int):
+        if self.crawler:
+            self.crawler.cancel() # Termina la tanda en curso y se detiene sin emitir
+        super().done(result)
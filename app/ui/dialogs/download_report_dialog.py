@@ -0,0 +1,91 @@
+#app/ui/dialogs/download_report_dialog.py
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QTabWidget, QTableWidget, QTableWidgetItem,
+                             QPushButton, QLabel, QHeaderView, QAbstractItemView, QFileDialog, QMessageBox)
+from app.core.download_analytics import download_analytics
+from app.core.download_planner import format_bytes
+from app.core.mod_repository import mod_repository
+
+def _seconds(value) -> str:
+    return "—" if value is None else f"{value:.1f} s"
+
+def _percent(failed: int, total: int) -> str:
+    return f"{failed * 100 / total:.1f} %" if total else "—"
+
+class DownloadReportDialog(QDialog):
+    """
+    Informe del histórico de descargas de un juego: mods más lentos, tasa de fallos por hora y
+    rendimiento según el paralelismo, con exportación de todas las filas a CSV o JSON.
+    """
+    def __init__(self, app_id: str, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Informe de Descargas")
+        self.setMinimumSize(800, 500)
+        self.app_id = app_id
+        self.names = {mod.workshop_id: mod.name for mod in mod_repository.game(app_id).records()}
+
+        layout = QVBoxLayout(self)
+        self.summary_label = QLabel()
+        layout.addWidget(self.summary_label)
+
+        tabs = QTabWidget()
+        self.slowest_table = self._add_table(tabs, "Mods más Lentos",
+                                             ["Mod", "Descargas", "Media", "Máximo", "Tamaño medio", "Fallos"])
+        self.hourly_table = self._add_table(tabs, "Fallos por Hora", ["Hora", "Mods", "Fallidos", "Tasa de fallos"])
+        self.throughput_table = self._add_table(tabs, "Rendimiento por Paralelismo",
+                                                ["Procesos SteamCMD", "Hilos de copia", "Ejecuciones", "Mods", "Descargado",
+                                                 "Velocidad", "Instalación media"])
+        layout.addWidget(tabs)
+
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        export_button = QPushButton("Exportar...")
+        export_button.clicked.connect(self.export)
+        button_layout.addWidget(export_button)
+        layout.addLayout(button_layout)
+
+        self.load_report()
+
+    @staticmethod
+    def _add_table(tabs: QTabWidget, title: str, headers: list[str]) -> QTableWidget:
+        table = QTableWidget(0, len(headers))
+        table.setHorizontalHeaderLabels(headers)
+        table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        table.verticalHeader().setVisible(False)
+        tabs.addTab(table, title)
+        return table
+
+    @staticmethod
+    def _fill(table: QTableWidget, rows: list[list[str]]):
+        table.setRowCount(len(rows))
+        for row, values in enumerate(rows):
+            for column, value in enumerate(values):
+                table.setItem(row, column, QTableWidgetItem(value))
+
+    def load_report(self):
+        summary = download_analytics.summary(self.app_id)
+        self.summary_label.setText(
+            f"{summary['runs']} ejecuciones, {summary['items']} descargas de mods, fallos: {_percent(summary['failed'], summary['items'])}. "
+            f"Medias: en cola {_seconds(summary['avg_queue_s'])}, descarga {_seconds(summary['avg_download_s'])}, "
+            f"instalación {_seconds(summary['avg_install_s'])}.")
+
+        self._fill(self.slowest_table, [[
+            f"{self.names.get(row['workshop_id'], row['workshop_id'])} (ID: {row['workshop_id']})", str(row['downloads']),
+            _seconds(row['avg_download_s']), _seconds(row['max_download_s']),
+            format_bytes(int(row['avg_bytes'])) if row['avg_bytes'] else "—", str(row['failed'])
+        ] for row in download_analytics.slowest_mods(self.app_id)])
+        self._fill(self.hourly_table, [[
+            f"{row['hour']:02d}:00", str(row['items']), str(row['failed']), _percent(row['failed'], row['items'])
+        ] for row in download_analytics.failure_rate_by_hour(self.app_id)])
+        self._fill(self.throughput_table, [[
+            str(row['shards']), str(row['copy_threads'] or "—"), str(row['runs']), str(row['items']), format_bytes(row['bytes']),
+            f"{format_bytes(int(row['bytes_per_s']))}/s" if row['bytes_per_s'] else "—", _seconds(row['avg_install_s'])
+        ] for row in download_analytics.throughput_by_parallelism(self.app_id)])
+
+    def export(self):
+        filepath, _ = QFileDialog.getSaveFileName(self, "Exportar Histórico de Descargas", f"descargas_{self.app_id}.csv",
+                                                  "CSV (*.csv);;JSON (*.json)")
+        if not filepath:
+            return
+        count = download_analytics.export(self.app_id, filepath, self.names)
+        QMessageBox.information(self, "Histórico Exportado", f"{count} filas exportadas a '{filepath}'.")
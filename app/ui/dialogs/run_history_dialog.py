@@ -0,0 +1,69 @@
+#app/ui/dialogs/run_history_dialog.py
+import time
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLineEdit, QListWidget,
+                             QListWidgetItem, QTextEdit, QSplitter, QLabel)
+from PyQt6.QtCore import Qt
+from app.core import run_history
+
+class RunHistoryDialog(QDialog):
+    """
+    Diálogo para consultar las ejecuciones anteriores de SteamCMD de un juego y
+    ver el fragmento del log correspondiente a un mod concreto.
+    """
+    def __init__(self, app_id: str, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Historial de Descargas")
+        self.setMinimumSize(900, 600)
+        self.app_id = app_id
+
+        layout = QVBoxLayout(self)
+        filter_layout = QHBoxLayout()
+        filter_layout.addWidget(QLabel("Filtrar por Workshop ID:"))
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("Ej: 3532474381 (vacío para ver todas las ejecuciones)")
+        self.filter_edit.textChanged.connect(self.load_runs)
+        filter_layout.addWidget(self.filter_edit)
+        layout.addLayout(filter_layout)
+
+        splitter = QSplitter()
+        self.runs_list = QListWidget()
+        self.runs_list.currentItemChanged.connect(self.show_run)
+        splitter.addWidget(self.runs_list)
+        self.details_view = QTextEdit()
+        self.details_view.setReadOnly(True)
+        self.details_view.setStyleSheet("background-color: #1e1e1e; color: #dcdcdc; font-family: Consolas, 'Courier New', monospace;")
+        splitter.addWidget(self.details_view)
+        splitter.setSizes([300, 600])
+        layout.addWidget(splitter)
+
+        self.load_runs()
+
+    def load_runs(self):
+        self.runs_list.clear()
+        self.details_view.clear()
+        workshop_id = self.filter_edit.text().strip()
+        runs = run_history.find_runs_for_item(self.app_id, workshop_id) if workshop_id else run_history.list_runs(self.app_id)
+        for run in runs:
+            outcomes = run.get('outcomes', {})
+            succeeded = sum(1 for o in outcomes.values() if o == 'succeeded')
+            started = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(run.get('started', 0)))
+            item = QListWidgetItem(f"{started}  ({succeeded}/{len(run.get('items', []))} OK)")
+            item.setData(Qt.ItemDataRole.UserRole, run)
+            self.runs_list.addItem(item)
+
+    def show_run(self, current_item, previous_item=None):
+        if not current_item:
+            self.details_view.clear()
+            return
+        run = current_item.data(Qt.ItemDataRole.UserRole)
+        workshop_id = self.filter_edit.text().strip()
+        if workshop_id:
+            outcome = run.get('outcomes', {}).get(workshop_id, 'desconocido')
+            excerpt = run_history.get_item_excerpt(self.app_id, run['run_id'], workshop_id)
+            text = f"Mod {workshop_id} en la ejecución {run['run_id']}: {outcome}\n\n" + ("\n".join(excerpt) or "(Sin líneas en el log)")
+        else:
+            lines = [f"Ejecución: {run['run_id']}", f"Duración: {run.get('finished', 0) - run.get('started', 0)} s",
+                     f"Líneas de log: {run.get('lines', 0)}", ""]
+            lines += [f"{wid}: {outcome}" for wid, outcome in sorted(run.get('outcomes', {}).items())]
+            text = "\n".join(lines)
+        self.details_view.setPlainText(text)
\ No newline at end of file
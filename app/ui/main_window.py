@@ -1,7 +1,6 @@
 #app/ui/main_window.py
 import sys
 import os
-import shutil
 import re
 import subprocess
 from pathlib import Path
@@ -11,25 +10,46 @@ from PyQt6.QtWidgets import (
     QPushButton, QListWidget, QLabel, QSplitter,
     QStatusBar, QMessageBox, QLineEdit, QProgressBar,
     QComboBox, QListWidgetItem, QMenu, QTextBrowser,
-    QToolBar
+    QToolBar, QFileDialog, QAbstractItemView
 )
-from PyQt6.QtCore import Qt, pyqtSlot, QUrl, QSize, QThreadPool, QPoint
-from PyQt6.QtGui import QIcon, QAction, QPixmap, QColor
-from PyQt6.QtNetwork import QNetworkAccessManager, QNetworkRequest
+from PyQt6.QtCore import Qt, pyqtSlot, QUrl, QSize, QThreadPool, QPoint, QTimer
+from PyQt6.QtGui import QIcon, QAction, QPixmap, QColor, QImage, QDesktopServices
+from PyQt6.QtNetwork import QNetworkAccessManager, QNetworkRequest, QNetworkReply
+from PyQt6 import sip
 
 # Importaciones de módulos del proyecto
 from app.core.data_manager import data_manager
+from app.core.mod_repository import mod_repository, ModRecord
 from app.core.config_manager import config_manager
 from app.core.steam_api_handler import steam_api_handler
 from app.core.steam_web_scraper import SteamWebScraper
+from app.core.image_loader import ImageDecodeWorker
+from app.core.uninstaller import UninstallWorker
+from app.core.run_history import RunLogWriter
+from app.core.download_analytics import download_analytics
+from app.core.disk_usage import DiskUsageWorker
+from app.core.copy_engine import InstallWorker
+from app.core import ui_snapshot
+from app.core.description_renderer import text_to_html, EXPAND_DESCRIPTION_URL
 from app.core.cache_manager import cache_manager
+from app.core.search_index import search_index
+from app.core.dependency_index import dependency_index
+from app.core.network_governor import network_governor
 from app.core.steam_handler import SteamCMDWorker
-from app.core.dependency_resolver import resolve_dependencies
+from app.core.metadata_warmup import MetadataWarmupWorker
+from app.core.download_planner import DownloadPlanWorker, DownloadPlan, format_bytes
+from app.core import modpack
+from app.core.dependency_resolver import resolve_dependencies, DependencyPrefetchWorker
+from app.core.tracer import tracer
+from app.core.metrics import download_queue_depth, steamcmd_items_total
 from app.ui.web_view.steam_browser import SteamBrowser
 from app.ui.dialogs.settings_dialog import SettingsDialog
 from app.ui.dialogs.add_game_dialog import AddGameDialog
 from app.ui.dialogs.dependency_dialog import DependencyDialog
 from app.ui.dialogs.console_dialog import ConsoleDialog
+from app.ui.dialogs.run_history_dialog import RunHistoryDialog
+from app.ui.dialogs.download_report_dialog import DownloadReportDialog
+from app.ui.dialogs.catalog_dialog import CatalogDialog
 from app.ui.web_view.steam_browser import SteamBrowser 
 from app.ui.browser_window import BrowserWindow
 
@@ -60,16 +80,55 @@ class MainWindow(QMainWindow):
         self.console_dialog: ConsoleDialog | None = None
         self.steam_cmd_worker: SteamCMDWorker | None = None
         self.browser_window: WorkshopBrowserWindow | None = None
+        self.warmup_worker: MetadataWarmupWorker | None = None
+        self.run_log: RunLogWriter | None = None
+        self.download_attempt = 0 # Reintentos encadenados de la descarga en curso
+        self.disk_usage: dict = {} # Último informe de uso de disco del juego actual
+
+        self.search_text = ""
+        # Pendientes que el usuario desmarcó; se guarda aparte porque la lista solo muestra los que pasan el filtro
+        self.unchecked_pending: set[str] = set()
+        # Estado de la vista previa: solo los resultados del mod seleccionado llegan al panel
+        self.selected_workshop_id: str | None = None
+        self.active_scraper: SteamWebScraper | None = None
+        self.banner_reply: QNetworkReply | None = None
+        self.preview_image_url: str | None = None
+        self.preview_loaded = False # Si el panel muestra los datos del mod seleccionado (y no "Cargando..." o un error)
 
         self.network_manager = QNetworkAccessManager(self)
-        self.thread_pool = QThreadPool(self)
-        self.thread_pool.setMaxThreadCount(3)
+        # Grupos de hilos separados para que una descarga larga no bloquee las vistas previas
+        self.download_pool = self._create_thread_pool("download_threads", 1)
+        self.scrape_pool = self._create_thread_pool("scrape_threads", 3)
+        self.image_pool = self._create_thread_pool("image_threads", 2)
+        self.io_pool = self._create_thread_pool("io_threads", 1)
+        self.crawl_pool = QThreadPool(self) # Recorridos del catálogo de la Workshop, de uno en uno
+        self.crawl_pool.setMaxThreadCount(1)
+
+        self.preview_timer = QTimer(self)
+        self.preview_timer.setSingleShot(True)
+        self.preview_timer.setInterval(int(config_manager.get("Performance", "preview_debounce_ms", fallback="150")))
+        self.preview_timer.timeout.connect(self.load_selected_preview)
 
         self._setup_ui()
         self._create_menus()
-        self.populate_game_selector()
+        # Las listas se actualizan solas cada vez que cambia mods.json, venga el cambio de donde venga
+        mod_repository.changed.connect(self.on_mods_changed)
+        # Con una instantánea de la sesión anterior la ventana se pinta al instante y los datos
+        # reales se cargan y reconcilian en segundo plano
+        snapshot = ui_snapshot.load_snapshot()
+        if not (snapshot and self.restore_snapshot(snapshot)):
+            self.populate_game_selector()
         self.statusBar().showMessage("Bienvenido. Selecciona un juego o añádelo con el botón '+'.", 5000)
 
+    def _create_thread_pool(self, option: str, default: int) -> QThreadPool:
+        pool = QThreadPool(self)
+        try:
+            size = int(config_manager.get("Performance", option, fallback=str(default)))
+        except ValueError:
+            size = default
+        pool.setMaxThreadCount(max(1, size))
+        return pool
+
     def _setup_ui(self):
         main_widget = QWidget()
         self.setCentralWidget(main_widget)
@@ -93,6 +152,11 @@ class MainWindow(QMainWindow):
         self.open_workshop_button.clicked.connect(self.open_workshop_browser)
         top_panel_layout.addWidget(self.open_workshop_button)
 
+        self.open_catalog_button = QPushButton("Catálogo")
+        self.open_catalog_button.setToolTip("Buscar y añadir mods desde el catálogo local de la workshop, sin navegador")
+        self.open_catalog_button.clicked.connect(self.open_catalog_dialog)
+        top_panel_layout.addWidget(self.open_catalog_button)
+
         top_panel_layout.addStretch()
         main_layout.addLayout(top_panel_layout)
 
@@ -116,6 +180,10 @@ class MainWindow(QMainWindow):
         
         self.mod_desc_browser = QTextBrowser()
         self.mod_desc_browser.setReadOnly(True)
+        self.mod_desc_browser.setOpenLinks(False)
+        self.mod_desc_browser.anchorClicked.connect(self.on_description_link_clicked)
+        self.full_description_html = ""
+        self.short_description_html = ""
         preview_layout.addWidget(self.mod_desc_browser)
         
         preview_layout.addWidget(QLabel("<b>Dependencias (clic en las rojas para añadir):</b>"))
@@ -124,14 +192,33 @@ class MainWindow(QMainWindow):
         self.mod_deps_list.itemClicked.connect(self.on_dependency_clicked)
         preview_layout.addWidget(self.mod_deps_list)
 
+        preview_layout.addWidget(QLabel("<b>Requerido por (clic para seleccionarlo):</b>"))
+        self.mod_required_by_list = QListWidget()
+        self.mod_required_by_list.setMaximumHeight(80)
+        self.mod_required_by_list.itemClicked.connect(self.on_required_by_clicked)
+        preview_layout.addWidget(self.mod_required_by_list)
+
         main_splitter.addWidget(preview_panel)
 
         mods_panel = QWidget()
         mods_layout = QVBoxLayout(mods_panel)
         mods_layout.setContentsMargins(5, 5, 5, 5)
 
-        mods_layout.addWidget(QLabel("<b>Mods Instalados</b> (Clic derecho para opciones)"))
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Buscar mods por nombre, descripción o dependencias...")
+        self.search_edit.setClearButtonEnabled(True)
+        # Esperar a que el usuario deje de escribir antes de consultar el índice
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(200)
+        self.search_timer.timeout.connect(self.apply_search)
+        self.search_edit.textChanged.connect(self.search_timer.start)
+        mods_layout.addWidget(self.search_edit)
+
+        self.installed_label = QLabel("<b>Mods Instalados</b> (Clic derecho para opciones)")
+        mods_layout.addWidget(self.installed_label)
         self.installed_mods_list = QListWidget()
+        self.installed_mods_list.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
         self.installed_mods_list.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.installed_mods_list.customContextMenuRequested.connect(self.show_installed_mod_context_menu)
         self.installed_mods_list.currentItemChanged.connect(self.on_mod_selected)
@@ -142,6 +229,7 @@ class MainWindow(QMainWindow):
         self.pending_mods_list.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.pending_mods_list.customContextMenuRequested.connect(self.show_pending_mod_context_menu)
         self.pending_mods_list.currentItemChanged.connect(self.on_mod_selected)
+        self.pending_mods_list.itemChanged.connect(self.on_pending_item_changed)
         mods_layout.addWidget(self.pending_mods_list)
         
         action_layout = QHBoxLayout()
@@ -164,6 +252,31 @@ class MainWindow(QMainWindow):
         settings_action = QAction("Configuración...", self)
         settings_action.triggered.connect(self.open_settings_dialog)
         file_menu.addAction(settings_action)
+        export_trace_action = QAction("Exportar Traza de Rendimiento...", self)
+        export_trace_action.triggered.connect(self.export_trace)
+        file_menu.addAction(export_trace_action)
+        export_modpack_action = QAction("Exportar Modpack (Lockfile)...", self)
+        export_modpack_action.triggered.connect(self.export_modpack)
+        file_menu.addAction(export_modpack_action)
+        import_modpack_action = QAction("Importar Modpack (Lockfile)...", self)
+        import_modpack_action.triggered.connect(self.import_modpack)
+        file_menu.addAction(import_modpack_action)
+        run_history_action = QAction("Historial de Descargas...", self)
+        run_history_action.triggered.connect(self.open_run_history)
+        file_menu.addAction(run_history_action)
+        download_report_action = QAction("Informe de Descargas...", self)
+        download_report_action.triggered.connect(self.open_download_report)
+        file_menu.addAction(download_report_action)
+        disk_usage_action = QAction("Analizar Uso de Disco...", self)
+        disk_usage_action.triggered.connect(self.show_disk_usage_report)
+        file_menu.addAction(disk_usage_action)
+        prune_orphans_action = QAction("Eliminar Dependencias Huérfanas...", self)
+        prune_orphans_action.triggered.connect(self.prune_orphaned_dependencies)
+        file_menu.addAction(prune_orphans_action)
+        file_menu.addSeparator()
+        rebuild_registry_action = QAction("Reparar Registro de Juegos", self)
+        rebuild_registry_action.triggered.connect(self.rebuild_game_registry)
+        file_menu.addAction(rebuild_registry_action)
         file_menu.addSeparator()
         exit_action = QAction("Salir", self)
         exit_action.triggered.connect(self.close)
@@ -179,9 +292,9 @@ class MainWindow(QMainWindow):
             self.current_app_id = None
         else:
             self.game_selector_combo.setEnabled(True)
+            registry = data_manager.get_registry()
             for app_id in managed_games:
-                info = data_manager.get_game_info(app_id)
-                game_name = info.get('name', 'Nombre Desconocido')
+                game_name = registry[app_id].get('name', 'Nombre Desconocido')
                 self.game_selector_combo.addItem(f"{game_name} [AppID: {app_id}]", userData=app_id)
         self.game_selector_combo.blockSignals(False)
         self.on_game_selected(self.game_selector_combo.currentIndex())
@@ -189,8 +302,80 @@ class MainWindow(QMainWindow):
     @pyqtSlot(int)
     def on_game_selected(self, index):
         self.current_app_id = self.game_selector_combo.itemData(index)
+        self.unchecked_pending.clear()
         self.update_mod_lists()
         self.clear_preview_panel()
+        self.start_metadata_warmup()
+        self.start_disk_usage_scan()
+
+    def start_disk_usage_scan(self):
+        """Recalcula en segundo plano el espacio que ocupan los mods del juego actual."""
+        self.disk_usage = {}
+        if not self.current_app_id:
+            return
+        worker = DiskUsageWorker(self.current_app_id)
+        worker.signals.finished.connect(self.on_disk_usage_scanned)
+        self.io_pool.start(worker)
+
+    def on_disk_usage_scanned(self, app_id: str, report: dict):
+        if app_id != self.current_app_id:
+            return
+        self.disk_usage = report
+        self.installed_label.setText(f"<b>Mods Instalados</b> — {format_bytes(report['total'])} (Clic derecho para opciones)")
+        self._sync_mod_lists(mod_repository.game(app_id).records())
+        if report['orphans']:
+            self.statusBar().showMessage(f"{len(report['orphans'])} carpetas en la ruta de mods no están gestionadas. Ver 'Archivo > Analizar Uso de Disco'.", 6000)
+
+    @pyqtSlot()
+    def show_disk_usage_report(self):
+        if not self.current_app_id:
+            QMessageBox.warning(self, "Sin Juego", "Por favor, selecciona un juego primero.")
+            return
+        if not self.disk_usage:
+            self.start_disk_usage_scan()
+            QMessageBox.information(self, "Analizando", "El análisis de disco está en curso. Inténtalo de nuevo en unos segundos.")
+            return
+        report = self.disk_usage
+        largest = sorted(report['mods'].items(), key=lambda kv: kv[1], reverse=True)[:10]
+        lines = [f"Total en la carpeta de mods: {format_bytes(report['total'])}",
+                 f"Contenido en SteamCMD (staging): {format_bytes(report['staging'])}", "",
+                 "Mods más grandes:"]
+        lines += [f"  {wid}: {format_bytes(size)}" for wid, size in largest]
+        if report['orphans']:
+            lines += ["", "Carpetas no gestionadas (huérfanas):"]
+            lines += [f"  {name}: {format_bytes(size)}" for name, size in sorted(report['orphans'].items())]
+        QMessageBox.information(self, "Uso de Disco", "\n".join(lines))
+
+    def start_metadata_warmup(self):
+        """Lanza la precarga en segundo plano de los detalles de los mods del juego actual."""
+        if self.warmup_worker:
+            self.warmup_worker.cancel()
+            self.warmup_worker = None
+        if not self.current_app_id:
+            return
+
+        game = mod_repository.game(self.current_app_id)
+        workshop_ids = [mod.workshop_id for mod in game.records('installed') + game.records('pending')]
+        if not workshop_ids:
+            return
+
+        worker = MetadataWarmupWorker(self.current_app_id, workshop_ids, self.scrape_pool)
+        worker.signals.progress.connect(lambda done, total, w=worker: self.on_warmup_progress(w, done, total))
+        worker.signals.finished.connect(lambda cached, w=worker: self.on_warmup_finished(w, cached))
+        self.warmup_worker = worker
+        self.scrape_pool.start(worker, -1) # Prioridad baja: las acciones del usuario van primero
+
+    def on_warmup_progress(self, worker: MetadataWarmupWorker, done: int, total: int):
+        if worker is not self.warmup_worker or worker.is_cancelled or not total:
+            return
+        self.statusBar().showMessage(f"Precargando detalles de mods: {done}/{total}...")
+
+    def on_warmup_finished(self, worker: MetadataWarmupWorker, cached: int):
+        if worker is not self.warmup_worker:
+            return
+        self.warmup_worker = None
+        if cached:
+            self.statusBar().showMessage(f"Detalles de {cached} mods precargados.", 3000)
 
     def on_mod_selected(self, current_item, previous_item=None):
         if not current_item:
@@ -201,7 +386,17 @@ class MainWindow(QMainWindow):
         if not workshop_id: return
 
         self.clear_preview_panel()
+        self.selected_workshop_id = workshop_id
+        self.preview_loaded = False
         self.mod_title_label.setText(f"Cargando {workshop_id}...")
+        # Al navegar rápido por la lista solo se carga el último mod en el que se detiene el usuario
+        self.preview_timer.start()
+
+    @pyqtSlot()
+    def load_selected_preview(self):
+        workshop_id = self.selected_workshop_id
+        if not workshop_id or not self.current_app_id:
+            return
 
         cached_data = cache_manager.get_mod_cache(self.current_app_id, workshop_id)
         if cached_data:
@@ -210,49 +405,260 @@ class MainWindow(QMainWindow):
 
         scraper = SteamWebScraper(workshop_id)
         scraper.signals.finished.connect(lambda data, app_id=self.current_app_id, wid=workshop_id: self.on_scraping_finished(data, app_id, wid))
-        scraper.signals.error.connect(lambda e: self.mod_title_label.setText(f"Error al cargar: {e}"))
-        self.thread_pool.start(scraper)
+        scraper.signals.error.connect(lambda e, wid=workshop_id: self.on_scraping_error(e, wid))
+        self.active_scraper = scraper
+        self.scrape_pool.start(scraper)
+
+    def _cancel_active_scraper(self):
+        """Descarta el scraping de un mod que ya no está seleccionado (lo saca de la cola si aún no empezó)."""
+        if self.active_scraper:
+            self.active_scraper.cancel()
+            # El grupo destruye el QRunnable al terminar run(); si ya terminó no queda nada que sacar de la cola
+            if not sip.isdeleted(self.active_scraper):
+                self.scrape_pool.tryTake(self.active_scraper)
+            self.active_scraper = None
 
     def on_scraping_finished(self, data: dict, app_id: str, workshop_id: str):
         cache_manager.save_mod_cache(app_id, workshop_id, data)
-        self.update_preview_panel(data)
+        if app_id == self.current_app_id and workshop_id == self.selected_workshop_id:
+            self.active_scraper = None
+            self.update_preview_panel(data)
+
+    def on_scraping_error(self, error: str, workshop_id: str):
+        if workshop_id == self.selected_workshop_id:
+            self.active_scraper = None
+            self.mod_title_label.setText(f"Error al cargar: {error}")
 
-    def update_mod_lists(self):
+    @pyqtSlot()
+    def apply_search(self):
+        self.search_text = self.search_edit.text().strip()
+        self.update_mod_lists()
+
+    def _filter_mods_by_search(self, mods: list[ModRecord]) -> list[ModRecord]:
+        """Filtra y ordena los mods por relevancia según el texto de búsqueda actual."""
+        ranked_ids = search_index.search(self.current_app_id, self.search_text)
+        rank = {wid: i for i, wid in enumerate(ranked_ids)}
+        needle = self.search_text.lower()
+        # Los mods sin detalles en caché solo se pueden encontrar por nombre o ID
+        matches = [mod for mod in mods if mod.workshop_id in rank
+                   or needle in mod.name.lower() or needle in mod.workshop_id]
+        return sorted(matches, key=lambda x: (rank.get(x.workshop_id, len(rank)), x.name.lower()))
+
+    def _mod_list_entries(self, mods: list[ModRecord]) -> tuple[list[list[str]], list[list[str]]]:
+        """Calcula el contenido de las listas (instalados, pendientes) como pares [workshop_id, texto]."""
+        if self.search_text:
+            mods = self._filter_mods_by_search(mods)
+        else:
+            mods = sorted(mods, key=lambda x: x.name.lower())
+        mod_sizes = self.disk_usage.get('mods', {})
+        installed, pending = [], []
+        for mod in mods:
+            item_text = f"{mod.name or 'N/A'} (ID: {mod.workshop_id or 'N/A'})"
+            if mod.status == 'installed' and mod.workshop_id in mod_sizes:
+                item_text += f" — {format_bytes(mod_sizes[mod.workshop_id])}"
+            if mod.status == 'installed':
+                installed.append([mod.workshop_id, item_text])
+            elif mod.status == 'pending':
+                pending.append([mod.workshop_id, item_text])
+        return installed, pending
+
+    def _fill_mod_lists(self, installed: list[list[str]], pending: list[list[str]]):
         self.installed_mods_list.clear()
         self.pending_mods_list.clear()
-        if not self.current_app_id: return
-
-        all_mods = data_manager.get_mods_for_game(self.current_app_id)
-        for mod in sorted(all_mods, key=lambda x: x.get('name', '').lower()):
-            item_text = f"{mod.get('name', 'N/A')} (ID: {mod.get('workshop_id', 'N/A')})"
+        for workshop_id, item_text in installed:
             item = QListWidgetItem(item_text)
-            item.setData(Qt.ItemDataRole.UserRole, mod.get('workshop_id'))
-            
-            if mod.get('status') == 'installed':
-                self.installed_mods_list.addItem(item)
-            elif mod.get('status') == 'pending':
-                item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
-                item.setCheckState(Qt.CheckState.Checked)
-                self.pending_mods_list.addItem(item)
-    
+            item.setData(Qt.ItemDataRole.UserRole, workshop_id)
+            self.installed_mods_list.addItem(item)
+        for workshop_id, item_text in pending:
+            item = QListWidgetItem(item_text)
+            item.setData(Qt.ItemDataRole.UserRole, workshop_id)
+            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+            item.setCheckState(Qt.CheckState.Unchecked if workshop_id in self.unchecked_pending else Qt.CheckState.Checked)
+            self.pending_mods_list.addItem(item)
+
+    def on_pending_item_changed(self, item: QListWidgetItem):
+        workshop_id = item.data(Qt.ItemDataRole.UserRole)
+        if item.checkState() == Qt.CheckState.Checked:
+            self.unchecked_pending.discard(workshop_id)
+        else:
+            self.unchecked_pending.add(workshop_id)
+
+    def _pending_download_list(self, only_checked: bool) -> list[dict]:
+        """Mods pendientes del juego actual (todos o solo los marcados), aunque el filtro de búsqueda oculte alguno."""
+        return [{'workshop_id': mod.workshop_id, 'name': mod.name} for mod in mod_repository.game(self.current_app_id).records('pending')
+                if not (only_checked and mod.workshop_id in self.unchecked_pending)]
+
+    @staticmethod
+    def _list_entries(list_widget: QListWidget) -> list[list[str]]:
+        """Contenido actual de una lista como pares [workshop_id, texto]."""
+        return [[list_widget.item(i).data(Qt.ItemDataRole.UserRole), list_widget.item(i).text()] for i in range(list_widget.count())]
+
+    def update_mod_lists(self, mods: list[ModRecord] | None = None):
+        if not self.current_app_id:
+            self.installed_mods_list.clear()
+            self.pending_mods_list.clear()
+            return
+        if mods is None:
+            mods = mod_repository.game(self.current_app_id).records()
+        self._fill_mod_lists(*self._mod_list_entries(mods))
+
+    def on_mods_changed(self, app_id: str):
+        """Refleja en las listas cualquier cambio en los mods del juego actual, sin perder la selección."""
+        if app_id == self.current_app_id:
+            self._sync_mod_lists(mod_repository.game(app_id).records())
+
+    # --- Instantánea de la interfaz ---
+
+    def build_snapshot(self) -> dict:
+        """Estado visible de la ventana (juegos, listas, vista previa) para el siguiente arranque."""
+        preview = None
+        if self.selected_workshop_id and self.preview_loaded:
+            preview = {
+                'workshop_id': self.selected_workshop_id,
+                'title': self.mod_title_label.text(),
+                'description_html': self.full_description_html,
+                'description_html_short': self.short_description_html,
+                'dependencies': [self._dependency_entry(self.mod_deps_list.item(i)) for i in range(self.mod_deps_list.count())],
+                'required_by': [self._dependency_entry(self.mod_required_by_list.item(i)) for i in range(self.mod_required_by_list.count())],
+                'image_url': self.preview_image_url
+            }
+        return {
+            'games': [[self.game_selector_combo.itemData(i), self.game_selector_combo.itemText(i)]
+                      for i in range(self.game_selector_combo.count()) if self.game_selector_combo.itemData(i)],
+            'current_app_id': self.current_app_id,
+            'search_text': self.search_text,
+            'installed': self._list_entries(self.installed_mods_list),
+            'pending': self._list_entries(self.pending_mods_list),
+            'installed_label': self.installed_label.text(),
+            'disk_usage': self.disk_usage,
+            'preview': preview
+        }
+
+    @staticmethod
+    def _dependency_entry(item: QListWidgetItem) -> list:
+        """[texto, color, datos] de un elemento de las listas de dependencias ("Ninguna" no lleva color)."""
+        dep = item.data(Qt.ItemDataRole.UserRole)
+        return [item.text(), item.foreground().color().name() if dep else None, dep]
+
+    def restore_snapshot(self, snapshot: dict) -> bool:
+        """Pinta la ventana desde la instantánea sin leer los datos de los juegos. False si no sirve."""
+        games = snapshot.get('games') or []
+        app_id = snapshot.get('current_app_id')
+        if not games or app_id not in [game[0] for game in games]:
+            return False
+
+        self.game_selector_combo.blockSignals(True)
+        self.game_selector_combo.clear()
+        for game_app_id, label in games:
+            self.game_selector_combo.addItem(label, userData=game_app_id)
+        self.game_selector_combo.setCurrentIndex(self.game_selector_combo.findData(app_id))
+        self.game_selector_combo.blockSignals(False)
+        self.current_app_id = app_id
+
+        self.search_text = snapshot.get('search_text', '')
+        self.search_edit.blockSignals(True)
+        self.search_edit.setText(self.search_text)
+        self.search_edit.blockSignals(False)
+        self.disk_usage = snapshot.get('disk_usage') or {}
+        self.installed_label.setText(snapshot.get('installed_label') or self.installed_label.text())
+        self._fill_mod_lists(snapshot.get('installed', []), snapshot.get('pending', []))
+
+        preview = snapshot.get('preview')
+        if preview:
+            self.selected_workshop_id = preview['workshop_id']
+            self.preview_loaded = True
+            self.mod_title_label.setText(preview.get('title', ''))
+            self.full_description_html = preview.get('description_html', '')
+            self.short_description_html = preview.get('description_html_short', '')
+            self.mod_desc_browser.setHtml(self.short_description_html or self.full_description_html)
+            for text, color, dep in preview.get('dependencies', []):
+                item = QListWidgetItem(text)
+                if dep:
+                    item.setData(Qt.ItemDataRole.UserRole, dep)
+                    item.setForeground(QColor(color))
+                self.mod_deps_list.addItem(item)
+            for text, color, dependent_id in preview.get('required_by', []):
+                item = QListWidgetItem(text)
+                if dependent_id:
+                    item.setData(Qt.ItemDataRole.UserRole, dependent_id)
+                    item.setForeground(QColor(color))
+                self.mod_required_by_list.addItem(item)
+            self._select_in_lists(preview['workshop_id'])
+            self.load_banner(preview.get('image_url'))
+
+        worker = ui_snapshot.StateLoadWorker(app_id)
+        worker.signals.finished.connect(self.on_state_loaded)
+        self.io_pool.start(worker)
+        return True
+
+    def _select_in_lists(self, workshop_id: str):
+        """Marca un mod como seleccionado sin relanzar la carga de su vista previa."""
+        for list_widget in (self.installed_mods_list, self.pending_mods_list):
+            for i in range(list_widget.count()):
+                if list_widget.item(i).data(Qt.ItemDataRole.UserRole) == workshop_id:
+                    list_widget.blockSignals(True)
+                    list_widget.setCurrentRow(i)
+                    list_widget.blockSignals(False)
+                    return
+
+    def _sync_mod_lists(self, mods: list[ModRecord]):
+        """Rellena las listas solo si su contenido cambia, conservando el mod seleccionado y su vista previa."""
+        installed, pending = self._mod_list_entries(mods)
+        if installed == self._list_entries(self.installed_mods_list) and pending == self._list_entries(self.pending_mods_list):
+            return
+        for list_widget in (self.installed_mods_list, self.pending_mods_list):
+            list_widget.blockSignals(True)
+        self._fill_mod_lists(installed, pending)
+        for list_widget in (self.installed_mods_list, self.pending_mods_list):
+            list_widget.blockSignals(False)
+        if self.selected_workshop_id:
+            self._select_in_lists(self.selected_workshop_id)
+
+    def on_state_loaded(self, app_id: str, games: list, mods: list):
+        """Reconcilia lo pintado desde la instantánea con los datos reales leídos en segundo plano."""
+        labels = [[game_app_id, f"{name} [AppID: {game_app_id}]"] for game_app_id, name in games]
+        shown = [[self.game_selector_combo.itemData(i), self.game_selector_combo.itemText(i)] for i in range(self.game_selector_combo.count())]
+        if labels != shown:
+            self.populate_game_selector()
+            return # populate_game_selector ya carga el juego seleccionado desde cero
+        if app_id != self.current_app_id:
+            return # El usuario cambió de juego mientras se cargaban los datos
+
+        self._sync_mod_lists(mods)
+        if self.selected_workshop_id:
+            self.load_selected_preview() # Sustituye la vista previa guardada por la de la caché
+        self.start_metadata_warmup()
+        self.start_disk_usage_scan()
+
     def clear_preview_panel(self):
+        self.preview_timer.stop()
+        self._cancel_active_scraper()
+        if self.banner_reply:
+            self.banner_reply.abort()
+            self.banner_reply = None
+        self.selected_workshop_id = None
+        self.preview_image_url = None
+        self.preview_loaded = False
         self.mod_title_label.setText("Selecciona un mod para ver sus detalles")
         self.mod_banner_label.clear()
         self.mod_banner_label.setText("")
         self.mod_desc_browser.clear()
         self.mod_deps_list.clear()
+        self.mod_required_by_list.clear()
     
     @pyqtSlot(dict)
     def update_preview_panel(self, data: dict):
+        self.preview_loaded = True
         self.mod_title_label.setText(data.get('title', 'Título no disponible'))
-        self.mod_desc_browser.setHtml(data.get('description', '').replace('\n', '<br>'))
+        self.full_description_html = data.get('description_html') or text_to_html(data.get('description', ''))
+        # Las descripciones muy largas se muestran recortadas hasta que el usuario pide verlas completas
+        self.short_description_html = data.get('description_html_short') or ''
+        self.mod_desc_browser.setHtml(self.short_description_html or self.full_description_html)
         
         self.mod_deps_list.clear()
         dependencies = data.get('dependencies', [])
         
-        all_game_mods = data_manager.get_mods_for_game(self.current_app_id)
-        installed_ids = {mod['workshop_id'] for mod in all_game_mods if mod.get('status') == 'installed'}
-        pending_ids = {mod['workshop_id'] for mod in all_game_mods if mod.get('status') == 'pending'}
+        game = mod_repository.game(self.current_app_id)
 
         if not dependencies:
             self.mod_deps_list.addItem("Ninguna")
@@ -263,43 +669,174 @@ class MainWindow(QMainWindow):
                 item = QListWidgetItem(item_text)
                 item.setData(Qt.ItemDataRole.UserRole, dep)
 
-                if dep_id in installed_ids:
+                if game.has_status(dep_id, 'installed'):
                     item.setForeground(QColor("lightgreen"))
-                elif dep_id in pending_ids:
+                elif game.has_status(dep_id, 'pending'):
                     item.setForeground(QColor("yellow"))
                 else:
                     item.setForeground(QColor("orangered"))
                 
                 self.mod_deps_list.addItem(item)
-        
-        image_url = data.get('image_url')
+
+        self.mod_required_by_list.clear()
+        dependents = [game.get(wid) for wid in dependency_index.required_by(self.current_app_id, self.selected_workshop_id) if wid in game]
+        if not dependents:
+            self.mod_required_by_list.addItem("Ninguno")
+        for mod in sorted(dependents, key=lambda m: m.name.lower()):
+            item = QListWidgetItem(f"{mod.name or 'N/A'} (ID: {mod.workshop_id})")
+            item.setData(Qt.ItemDataRole.UserRole, mod.workshop_id)
+            item.setForeground(QColor("lightgreen" if mod.status == 'installed' else "yellow"))
+            self.mod_required_by_list.addItem(item)
+
+        self.load_banner(data.get('image_url'))
+
+    def load_banner(self, image_url: str | None):
+        self.preview_image_url = image_url
         if image_url:
-            req = QNetworkRequest(QUrl(image_url))
-            reply = self.network_manager.get(req)
-            reply.finished.connect(lambda rep=reply: self.set_banner_image(rep))
+            # Las imágenes también cuentan para el límite de peticiones del host
+            delay = network_governor.reserve(image_url)
+            if delay > 0:
+                QTimer.singleShot(int(delay * 1000), lambda url=image_url: self._request_banner(url))
+            else:
+                self._request_banner(image_url)
         else:
             self.mod_banner_label.setText("Imagen no disponible")
 
+    def _request_banner(self, image_url: str):
+        if image_url != self.preview_image_url:
+            return # El usuario seleccionó otro mod mientras se esperaba turno
+        req = QNetworkRequest(QUrl(image_url))
+        reply = self.network_manager.get(req)
+        self.banner_reply = reply
+        reply.finished.connect(lambda rep=reply: self.set_banner_image(rep))
+
+    @pyqtSlot(QUrl)
+    def on_description_link_clicked(self, url: QUrl):
+        if url.toString() == EXPAND_DESCRIPTION_URL:
+            self.mod_desc_browser.setHtml(self.full_description_html)
+        else:
+            QDesktopServices.openUrl(url)
+
     def set_banner_image(self, reply):
-        if reply.error() == QNetworkRequest.NetworkError.NoError:
-            image_data = reply.readAll()
-            pixmap = QPixmap()
-            pixmap.loadFromData(image_data)
-            self.mod_banner_label.setPixmap(pixmap.scaled(
-                self.mod_banner_label.width(),
-                self.mod_banner_label.height(),
-                Qt.AspectRatioMode.KeepAspectRatio,
-                Qt.TransformationMode.SmoothTransformation
-            ))
+        reply.deleteLater()
+        if reply.error() != QNetworkReply.NetworkError.OperationCanceledError:
+            retry_after = bytes(reply.rawHeader(b"Retry-After")).decode() or None
+            network_governor.report(reply.url().toString(), reply.attribute(QNetworkRequest.Attribute.HttpStatusCodeAttribute),
+                                    float(retry_after) if retry_after and retry_after.isdigit() else None)
+        if reply is not self.banner_reply:
+            return # Respuesta de un mod que ya no está seleccionado
+        self.banner_reply = None
+        if reply.error() == QNetworkReply.NetworkError.NoError:
+            key = reply.url().toString()
+            worker = ImageDecodeWorker(key, bytes(reply.readAll()), self.mod_banner_label.width(), self.mod_banner_label.height())
+            worker.signals.finished.connect(lambda k, image, sid=self.selected_workshop_id: self.on_banner_decoded(sid, image))
+            self.image_pool.start(worker)
         else:
             self.mod_banner_label.setText("Error al cargar imagen")
-        reply.deleteLater()
+
+    def on_banner_decoded(self, workshop_id: str, image: QImage):
+        if workshop_id != self.selected_workshop_id:
+            return
+        if image.isNull():
+            self.mod_banner_label.setText("Error al cargar imagen")
+        else:
+            self.mod_banner_label.setPixmap(QPixmap.fromImage(image))
 
     @pyqtSlot()
     def open_settings_dialog(self):
         dialog = SettingsDialog(self)
         dialog.exec()
 
+    @pyqtSlot()
+    def export_trace(self):
+        if not tracer.enabled:
+            QMessageBox.information(self, "Trazado Desactivado", "Activa 'enabled' en la sección [Tracing] de config.ini y reinicia la aplicación.")
+            return
+        filepath, _ = QFileDialog.getSaveFileName(self, "Exportar Traza", str(tracer.trace_file), "Chrome Trace (*.json)")
+        if filepath:
+            tracer.export(filepath)
+            self.statusBar().showMessage(f"Traza exportada a '{filepath}'.", 4000)
+
+    @pyqtSlot()
+    def export_modpack(self):
+        if not self.current_app_id:
+            QMessageBox.warning(self, "Sin Juego", "Por favor, selecciona un juego primero.")
+            return
+        filepath, _ = QFileDialog.getSaveFileName(self, "Exportar Modpack", f"modpack_{self.current_app_id}.lock.json", "Lockfile (*.json)")
+        if not filepath:
+            return
+        worker = modpack.ModpackWorker(modpack.export_lockfile, self.current_app_id, filepath)
+        worker.signals.progress.connect(lambda done, total: self.statusBar().showMessage(f"Exportando modpack: {done}/{total}..."))
+        worker.signals.finished.connect(lambda count: self.statusBar().showMessage(f"Modpack con {count} mods exportado a '{filepath}'.", 4000))
+        worker.signals.error.connect(self.on_modpack_error)
+        self.io_pool.start(worker)
+
+    @pyqtSlot()
+    def import_modpack(self):
+        if not self.current_app_id:
+            QMessageBox.warning(self, "Sin Juego", "Por favor, selecciona un juego primero.")
+            return
+        filepath, _ = QFileDialog.getOpenFileName(self, "Importar Modpack", "", "Lockfile (*.json)")
+        if not filepath:
+            return
+        try:
+            lockfile = modpack.load_lockfile(filepath)
+        except (ValueError, OSError) as e:
+            QMessageBox.critical(self, "Lockfile Inválido", str(e))
+            return
+        if lockfile.get('app_id') != self.current_app_id:
+            QMessageBox.warning(self, "Juego Diferente", f"El modpack es para el AppID {lockfile.get('app_id')}. Cambia al juego correcto para importarlo.")
+            return
+
+        # Comparar hashes y enlazar carpetas se hace en io_pool; el registro sigue en on_modpack_linked
+        app_id = self.current_app_id
+        worker = modpack.ModpackWorker(modpack.plan_import, app_id, lockfile)
+        worker.signals.progress.connect(lambda done, total: self.statusBar().showMessage(f"Comprobando modpack: {done}/{total}..."))
+        worker.signals.finished.connect(lambda plan, a=app_id: self.on_modpack_planned(a, plan))
+        worker.signals.error.connect(self.on_modpack_error)
+        self.io_pool.start(worker)
+
+    def on_modpack_planned(self, app_id: str, plan: modpack.ImportPlan):
+        worker = modpack.ModpackWorker(modpack.link_import, app_id, plan)
+        worker.signals.progress.connect(lambda done, total: self.statusBar().showMessage(f"Instalando desde SteamCMD: {done}/{total}..."))
+        worker.signals.finished.connect(lambda updates, a=app_id: self.on_modpack_linked(a, plan, updates))
+        worker.signals.error.connect(self.on_modpack_error)
+        self.io_pool.start(worker)
+
+    def on_modpack_linked(self, app_id: str, plan: modpack.ImportPlan, installed_updates: dict):
+        self.statusBar().clearMessage()
+        to_download = modpack.register_import(app_id, plan, installed_updates)
+        QMessageBox.information(self, "Modpack Importado",
+                                f"Ya coincidían: {len(plan.matching)}\nInstalados desde SteamCMD: {len(plan.linkable)}\nPor descargar: {len(to_download)}")
+        if to_download and app_id == self.current_app_id:
+            self.execute_steamcmd(to_download)
+
+    def on_modpack_error(self, error: str):
+        self.statusBar().clearMessage()
+        QMessageBox.critical(self, "Error del Modpack", f"No se pudo completar la operación:\n{error}")
+
+    @pyqtSlot()
+    def open_run_history(self):
+        if not self.current_app_id:
+            QMessageBox.warning(self, "Sin Juego", "Por favor, selecciona un juego primero.")
+            return
+        RunHistoryDialog(self.current_app_id, self).exec()
+
+    @pyqtSlot()
+    def open_download_report(self):
+        if not self.current_app_id:
+            QMessageBox.warning(self, "Sin Juego", "Por favor, selecciona un juego primero.")
+            return
+        DownloadReportDialog(self.current_app_id, self).exec()
+
+    @pyqtSlot()
+    def rebuild_game_registry(self):
+        registry = data_manager.rebuild_registry()
+        # La reparación existe para cambios hechos fuera de la aplicación: descartar las copias en memoria
+        mod_repository.invalidate()
+        self.populate_game_selector()
+        self.statusBar().showMessage(f"Registro reconstruido: {len(registry)} juegos encontrados.", 4000)
+
     @pyqtSlot()
     def open_add_game_dialog(self):
         dialog = AddGameDialog(self)
@@ -326,7 +863,6 @@ class MainWindow(QMainWindow):
 
         if data_manager.add_mod_to_game(app_id, workshop_id, mod_name):
             self.statusBar().showMessage(f"Mod '{mod_name}' añadido a pendientes (desde navegador).", 3000)
-            self.update_mod_lists() # Actualizar la UI
         else:
             self.statusBar().showMessage(f"Mod '{mod_name}' (ID: {workshop_id}) ya está en la lista.", 3000)
 
@@ -338,8 +874,7 @@ class MainWindow(QMainWindow):
             return
         
         # Recopilar los IDs de todos los mods gestionados para este juego
-        all_managed_mods = data_manager.get_mods_for_game(self.current_app_id)
-        managed_mod_ids = [mod['workshop_id'] for mod in all_managed_mods]
+        managed_mod_ids = list(mod_repository.game(self.current_app_id).ids())
         
         workshop_url = f"https://steamcommunity.com/app/{self.current_app_id}/workshop/"
         
@@ -351,36 +886,39 @@ class MainWindow(QMainWindow):
         
         self.browser_window.show()
 
+    @pyqtSlot()
+    def open_catalog_dialog(self):
+        if not self.current_app_id:
+            QMessageBox.warning(self, "Sin Juego", "Por favor, selecciona un juego primero.")
+            return
+        managed_mod_ids = list(mod_repository.game(self.current_app_id).ids())
+        dialog = CatalogDialog(self.current_app_id, managed_mod_ids, self.crawl_pool, self)
+        dialog.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        dialog.mods_selected.connect(self.handle_confirmed_mods)
+        dialog.exec()
+
     @pyqtSlot(list)
     def handle_direct_download_request(self, mods_to_add: list):
         """Añade los mods y comienza inmediatamente el proceso de descarga."""
         self.handle_confirmed_mods(mods_to_add) # Primero los añade
         
         # Selecciona TODOS los mods pendientes para el proceso de descarga, no solo los nuevos
-        all_pending_mods = []
-        for i in range(self.pending_mods_list.count()):
-            item = self.pending_mods_list.item(i)
-            workshop_id = item.data(Qt.ItemDataRole.UserRole)
-            name = item.text().split(" (ID:")[0]
-            all_pending_mods.append({'workshop_id': workshop_id, 'name': name})
-            
+        all_pending_mods = self._pending_download_list(only_checked=False)
+
         if all_pending_mods:
             # Reutilizamos el mismo flujo de descarga que ya teníamos
-            final_download_list = resolve_dependencies(self.current_app_id, all_pending_mods, self)
-            if final_download_list is not None:
-                self.execute_steamcmd(final_download_list)
+            self.resolve_and_download(all_pending_mods)
     
     @pyqtSlot(list)
     def handle_confirmed_mods(self, mods_to_add: list):
         """Recibe la lista de mods del panel lateral y los añade a pendientes."""
-        added_count = 0
+        mods_by_game = {}
         for mod_data in mods_to_add:
-            if data_manager.add_mod_to_game(mod_data['appId'], mod_data['workshopId'], mod_data['modName']):
-                added_count += 1
+            mods_by_game.setdefault(mod_data['appId'], []).append((mod_data['workshopId'], mod_data['modName']))
+        added_count = sum(data_manager.add_mods_to_game(app_id, mods) for app_id, mods in mods_by_game.items())
         
         if added_count > 0:
             self.statusBar().showMessage(f"{added_count} mods añadidos a la lista de pendientes.", 4000)
-            self.update_mod_lists()
 
     @pyqtSlot()
     def start_download_process(self):
@@ -388,19 +926,29 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Error", "Selecciona un juego primero.")
             return
 
-        mods_to_download = []
-        for i in range(self.pending_mods_list.count()):
-            item = self.pending_mods_list.item(i)
-            if item.checkState() == Qt.CheckState.Checked:
-                workshop_id = item.data(Qt.ItemDataRole.UserRole)
-                name = item.text().split(" (ID:")[0]
-                mods_to_download.append({'workshop_id': workshop_id, 'name': name})
-        
+        mods_to_download = self._pending_download_list(only_checked=True)
+
         if not mods_to_download:
             QMessageBox.information(self, "Información", "No hay mods marcados para descargar.")
             return
 
-        final_download_list = resolve_dependencies(self.current_app_id, mods_to_download, self)
+        self.resolve_and_download(mods_to_download)
+
+    def resolve_and_download(self, mods: list[dict]):
+        """Precarga en segundo plano los detalles de las dependencias; la resolución sigue en on_dependencies_prefetched."""
+        app_id = self.current_app_id
+        self.download_button.setEnabled(False)
+        self.statusBar().showMessage(f"Comprobando las dependencias de {len(mods)} mods...")
+        worker = DependencyPrefetchWorker(app_id, [mod['workshop_id'] for mod in mods])
+        worker.signals.finished.connect(lambda _, a=app_id: self.on_dependencies_prefetched(a, mods))
+        self.io_pool.start(worker)
+
+    def on_dependencies_prefetched(self, app_id: str, mods: list[dict]):
+        self.download_button.setEnabled(True)
+        self.statusBar().clearMessage()
+        if app_id != self.current_app_id:
+            return
+        final_download_list = resolve_dependencies(app_id, mods, self)
 
         if final_download_list is not None:
             if not final_download_list:
@@ -408,90 +956,183 @@ class MainWindow(QMainWindow):
                 return
             self.execute_steamcmd(final_download_list)
 
-    def execute_steamcmd(self, download_list: list[dict]):
-        game_path = data_manager.get_game_path(self.current_app_id)
+    def execute_steamcmd(self, download_list: list[dict], attempt: int = 0):
+        """Descarga e instala los mods. `attempt` cuenta los reintentos de los que fallaron en la ejecución anterior."""
+        self.download_attempt = attempt
+        app_id = self.current_app_id
+        install_path = Path(data_manager.get_game_info(app_id).get("mod_install_path", ""))
+        # Tamaños y espacio libre se calculan en segundo plano; la descarga sigue en on_download_planned
+        self.download_button.setEnabled(False)
+        self.statusBar().showMessage(f"Preparando la descarga de {len(download_list)} mods...")
+        worker = DownloadPlanWorker(app_id, download_list, install_path)
+        worker.signals.finished.connect(lambda plan, a=app_id: self.on_download_planned(a, download_list, plan))
+        worker.signals.error.connect(self.on_download_plan_error)
+        self.io_pool.start(worker)
+
+    def on_download_plan_error(self, error: str):
+        self.download_button.setEnabled(True)
+        self.statusBar().clearMessage()
+        QMessageBox.critical(self, "Error", f"No se pudo preparar la descarga: {error}")
+
+    def on_download_planned(self, app_id: str, download_list: list[dict], plan: DownloadPlan):
+        self.download_button.setEnabled(True)
+        self.statusBar().clearMessage()
+        if app_id != self.current_app_id:
+            self.statusBar().showMessage("Descarga cancelada: se cambió de juego mientras se preparaba.", 4000)
+            return
+        if not plan.has_enough_space:
+            reply = QMessageBox.question(
+                self, "Espacio Insuficiente",
+                f"La descarga ocupa aproximadamente {format_bytes(plan.total_bytes)}.\n\n" + "\n".join(plan.space_problems) +
+                "\n\n¿Continuar de todos modos?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+            )
+            if reply == QMessageBox.StandardButton.No:
+                return
+        ready_paths = plan.already_current
+
+        self.console_dialog = ConsoleDialog(self)
+        self.console_dialog.show()
+        if ready_paths:
+            self.console_dialog.append_log(f"{len(ready_paths)} mods ya están actualizados en la carpeta de SteamCMD; se instalarán sin descargarlos de nuevo.\n")
+        if not plan.items:
+            self.on_steamcmd_finished(app_id, "", download_list, ready_paths)
+            return
+
+        game_path = data_manager.get_game_path(app_id)
         script_path = game_path / "download_script.txt"
         try:
             with open(script_path, 'w') as f:
                 f.write("@ShutdownOnFailedCommand 1\n")
                 f.write("@NoPromptForPassword 1\n")
                 f.write("login anonymous\n")
-                for mod in download_list:
-                    f.write(f"workshop_download_item {self.current_app_id} {mod['workshop_id']}\n")
+                for mod in plan.items:
+                    f.write(f"workshop_download_item {app_id} {mod['workshop_id']}\n")
                 f.write("quit\n")
         except IOError as e:
+            self.console_dialog.cancel_button.setEnabled(False)
             QMessageBox.critical(self, "Error", f"No se pudo escribir el script de descarga: {e}")
             return
-        
-        self.console_dialog = ConsoleDialog(self)
-        self.console_dialog.show()
 
         steamcmd_path = config_manager.get("Paths", "steamcmd_path")
-        self.steam_cmd_worker = SteamCMDWorker(steamcmd_path, str(script_path))
+        self.run_log = RunLogWriter(app_id, [mod['workshop_id'] for mod in plan.items], attempt=self.download_attempt,
+                                    copy_threads=int(config_manager.get("Performance", "copy_threads", fallback="4")),
+                                    expected_sizes=plan.sizes)
+        self.steam_cmd_worker = SteamCMDWorker(steamcmd_path, str(script_path), self.run_log)
         self.steam_cmd_worker.signals.output.connect(self.console_dialog.append_log)
-        self.steam_cmd_worker.signals.finished.connect(lambda log: self.on_steamcmd_finished(log, download_list))
+        self.steam_cmd_worker.signals.finished.connect(lambda log, a=app_id: self.on_steamcmd_finished(a, log, download_list, ready_paths))
         self.steam_cmd_worker.signals.error.connect(lambda err: self.console_dialog.append_log(f"ERROR CRÍTICO: {err}"))
+        self.steam_cmd_worker.signals.error.connect(lambda err: download_queue_depth.set(0))
+        self.steam_cmd_worker.signals.error.connect(
+            lambda err, items=plan.items: self._close_run_log([], [m['workshop_id'] for m in items], {m['workshop_id']: err for m in items}))
         self.console_dialog.cancel_button.clicked.connect(self.steam_cmd_worker.cancel)
         
-        self.thread_pool.start(self.steam_cmd_worker)
+        download_queue_depth.set(len(plan.items))
+        self.download_pool.start(self.steam_cmd_worker)
 
-    def on_steamcmd_finished(self, log: str, original_download_list: list[dict]):
+    def _close_run_log(self, succeeded_ids: list[str], failed_ids: list[str], reasons: dict[str, str] | None = None):
+        """Cierra el log persistente de la ejecución en curso con el resultado de cada mod y la guarda en el histórico."""
+        if not self.run_log:
+            return
+        run_ids = self.run_log.workshop_ids # Los mods instalados sin descargar no forman parte de la ejecución
+        outcomes = {wid: 'succeeded' for wid in succeeded_ids if wid in run_ids}
+        outcomes.update({wid: 'failed' for wid in failed_ids if wid in run_ids})
+        run = self.run_log.close(outcomes, reasons)
+        if run:
+            download_analytics.record_run(self.run_log.app_id, run)
+        self.run_log = None
+
+    @staticmethod
+    def _find_downloaded_path(mod_id: str, log: str, ready_paths: dict[str, Path]) -> Path | None:
+        """Ruta del contenido de un mod: la ya existente en SteamCMD o la que reporta el log."""
+        if mod_id in ready_paths:
+            return ready_paths[mod_id]
+        # --- LÓGICA DE PARSEO CORREGIDA Y ROBUSTA ---
+        # Usamos re.escape para manejar cualquier caracter especial en el mod_id, y re.IGNORECASE para robustez
+        # SteamCMD escribe el ID sin comillas (Downloaded item 123 to "ruta"); se aceptan también entre comillas
+        success_pattern = re.compile(r"Success\. Downloaded item \"?{}\"? to \"(.*?)\"".format(re.escape(mod_id)), re.IGNORECASE)
+        success_match = success_pattern.search(log)
+        if success_match:
+            # Extraer la ruta y quitarle las comillas y espacios extra
+            return Path(success_match.group(1).strip())
+        return None
+
+    def on_steamcmd_finished(self, app_id: str, log: str, original_download_list: list[dict], ready_paths: dict[str, Path] | None = None):
+        """`app_id` es el juego de la ejecución, que puede no ser el seleccionado si se cambió durante la descarga."""
+        download_queue_depth.set(0)
         self.console_dialog.cancel_button.setEnabled(False)
         self.console_dialog.setWindowTitle("Salida de SteamCMD (Completado)")
 
-        all_game_mods = data_manager.get_mods_for_game(self.current_app_id)
-        final_install_dir = Path(data_manager.get_game_info(self.current_app_id).get("mod_install_path", ""))
-        
-        moved_ids, failed_ids = [], []
+        final_install_dir = Path(data_manager.get_game_info(app_id).get("mod_install_path", ""))
         
+        to_install, failed_ids, reasons = [], [], {}
         for mod_to_check in original_download_list:
             mod_id = mod_to_check['workshop_id']
-            # --- LÓGICA DE PARSEO CORREGIDA Y ROBUSTA ---
-            # Usamos re.escape para manejar cualquier caracter especial en el mod_id, y re.IGNORECASE para robustez
-            success_pattern = re.compile(r"Success. Downloaded item \"{}\" to \"(.*?)\"".format(re.escape(mod_id)), re.IGNORECASE)
-            success_match = success_pattern.search(log)
-
-            if success_match:
-                # Extraer la ruta y quitarle las comillas y espacios extra
-                downloaded_path_str = success_match.group(1).strip()
-                downloaded_path = Path(downloaded_path_str)
+            downloaded_path = self._find_downloaded_path(mod_id, log, ready_paths or {})
 
+            if downloaded_path:
                 if not downloaded_path.exists():
                     self.console_dialog.append_log(f"FALLO (Post-descarga): La carpeta del mod {mod_id} no existe en la ruta reportada: {downloaded_path}")
                     failed_ids.append(mod_id)
+                    reasons[mod_id] = "La carpeta descargada no existe"
                     continue
-                
-                # El destino final es la carpeta de mods del juego. El mod se moverá *dentro* de ella.
-                final_mod_path = final_install_dir / mod_id
-                if final_mod_path.exists():
-                    shutil.rmtree(final_mod_path) # Eliminar versión antigua
-                
-                try:
-                    # Mover la carpeta del mod descargado (ej: .../3532474381) a la carpeta de mods final.
-                    shutil.move(str(downloaded_path), str(final_install_dir))
-                    moved_ids.append(mod_id)
-                except Exception as e:
-                    self.console_dialog.append_log(f"ERROR al mover mod {mod_id}: {e}")
-                    failed_ids.append(mod_id)
+                to_install.append((mod_id, downloaded_path))
             else:
                 failed_ids.append(mod_id)
                 self.console_dialog.append_log(f"FALLO (SteamCMD): Mod {mod_id} no se descargó (no se encontró 'Success' en el log).")
 
+        if not to_install:
+            self.on_install_finished(app_id, original_download_list, [], {}, failed_ids, reasons)
+            return
+        if self.run_log:
+            self.run_log.mark_install_started()
+
+        # Mover/copiar las carpetas descargadas a la carpeta de mods final fuera del hilo de la UI
+        self.console_dialog.append_log(f"Instalando {len(to_install)} mods en {final_install_dir}...")
+        worker = InstallWorker(
+            to_install, final_install_dir,
+            workers=int(config_manager.get("Performance", "copy_threads", fallback="4")),
+            verify=config_manager.get("Downloads", "verify_copies", fallback="true").lower() == "true"
+        )
+        worker.signals.progress.connect(self.on_install_progress)
+        worker.signals.item_installed.connect(lambda mod_id, size: self.console_dialog.append_log(f"Instalado: {mod_id} ({format_bytes(size)})"))
+        if self.run_log:
+            worker.signals.item_installed.connect(self.run_log.mark_installed)
+        worker.signals.finished.connect(lambda moved, errors, a=app_id: self.on_install_finished(a, original_download_list, moved, errors, failed_ids, reasons))
+        self.download_pool.start(worker)
+
+    @pyqtSlot('qint64', 'qint64')
+    def on_install_progress(self, done: int, total: int):
+        percent = done * 100 // total if total else 100
+        self.console_dialog.setWindowTitle(f"Salida de SteamCMD (Instalando {percent}% - {format_bytes(done)} de {format_bytes(total)})")
+
+    def on_install_finished(self, app_id: str, original_download_list: list[dict], moved_ids: list[str], errors: dict[str, str],
+                            failed_ids: list[str], reasons: dict[str, str] | None = None):
+        final_install_dir = Path(data_manager.get_game_info(app_id).get("mod_install_path", ""))
+        self.console_dialog.setWindowTitle("Salida de SteamCMD (Completado)")
+        for mod_id, error in errors.items():
+            self.console_dialog.append_log(f"ERROR al mover mod {mod_id}: {error}")
+        failed_ids = failed_ids + list(errors)
+        reasons = dict(reasons or {}, **{mod_id: f"Instalación: {error}" for mod_id, error in errors.items()})
+
+        self._close_run_log(moved_ids, failed_ids, reasons)
+        steamcmd_items_total.inc(len(moved_ids), result="succeeded")
+        steamcmd_items_total.inc(len(failed_ids), result="failed")
+
         # Actualizar base de datos
-        for mod in all_game_mods:
-            if mod['workshop_id'] in moved_ids:
-                mod['status'] = 'installed'
-                mod['local_path'] = str(final_install_dir / mod['workshop_id'])
-        data_manager.save_mods_for_game(self.current_app_id, all_game_mods)
-        self.update_mod_lists()
+        data_manager.set_mods_status(app_id, {
+            mod_id: {'status': 'installed', 'local_path': str(final_install_dir / mod_id)} for mod_id in moved_ids
+        })
+        if app_id == self.current_app_id:
+            self.start_disk_usage_scan()
 
-        # Gestionar reintentos
-        if failed_ids:
+        # Gestionar reintentos (execute_steamcmd descarga para el juego seleccionado)
+        if failed_ids and app_id == self.current_app_id:
             failed_mods_info = [mod for mod in original_download_list if mod['workshop_id'] in failed_ids]
             reply = QMessageBox.question(self, "Descargas Fallidas", f"{len(failed_mods_info)} mods fallaron. ¿Reintentar?", QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
             if reply == QMessageBox.StandardButton.Yes:
                 self.console_dialog.close()
-                self.execute_steamcmd(failed_mods_info)
+                self.execute_steamcmd(failed_mods_info, self.download_attempt + 1)
                 return
 
         QMessageBox.information(self, "Proceso Terminado", f"Proceso de descarga finalizado.\nÉxitos: {len(moved_ids)}\nFallos: {len(failed_ids)}")
@@ -505,13 +1146,24 @@ class MainWindow(QMainWindow):
         workshop_id = dep_info['id']
         name = dep_info['name']
         
-        if data_manager.add_mod_to_game(self.current_app_id, workshop_id, name):
+        if data_manager.add_mod_to_game(self.current_app_id, workshop_id, name, origin='dependency'):
             QMessageBox.information(self, "Mod Añadido", f"'{name}' ha sido añadido a la lista de pendientes.")
             item.setForeground(QColor("yellow")) # Cambiar color al instante
-            self.update_mod_lists() # Refrescar la lista principal
         else:
             QMessageBox.information(self, "Mod Existente", f"'{name}' ya está en la lista de gestión.")
 
+    def on_required_by_clicked(self, item: QListWidgetItem):
+        workshop_id = item.data(Qt.ItemDataRole.UserRole)
+        if not workshop_id:
+            return
+        for list_widget in (self.installed_mods_list, self.pending_mods_list):
+            for i in range(list_widget.count()):
+                if list_widget.item(i).data(Qt.ItemDataRole.UserRole) == workshop_id:
+                    list_widget.setCurrentRow(i)
+                    list_widget.setFocus()
+                    return
+        self.statusBar().showMessage(f"El mod {workshop_id} no aparece en las listas con el filtro de búsqueda actual.", 3000)
+
     @pyqtSlot(QPoint)
     def show_pending_mod_context_menu(self, pos: QPoint):
         item = self.pending_mods_list.itemAt(pos)
@@ -524,51 +1176,129 @@ class MainWindow(QMainWindow):
             menu.exec(self.pending_mods_list.mapToGlobal(pos))
             
     def remove_from_pending(self, workshop_id: str):
-        all_mods = data_manager.get_mods_for_game(self.current_app_id)
-        mod_to_remove = next((mod for mod in all_mods if mod['workshop_id'] == workshop_id and mod['status'] == 'pending'), None)
-        if mod_to_remove:
-            all_mods.remove(mod_to_remove)
-            data_manager.save_mods_for_game(self.current_app_id, all_mods)
-            self.update_mod_lists()
+        data_manager.remove_mods_from_game(self.current_app_id, [workshop_id], status='pending')
 
     @pyqtSlot(QPoint)
     def show_installed_mod_context_menu(self, pos: QPoint):
         item = self.installed_mods_list.itemAt(pos)
         if item:
             menu = QMenu(self)
-            workshop_id = item.data(Qt.ItemDataRole.UserRole)
-            if workshop_id:
+            if not item.isSelected():
+                self.installed_mods_list.setCurrentItem(item)
+            selected_ids = [i.data(Qt.ItemDataRole.UserRole) for i in self.installed_mods_list.selectedItems() if i.data(Qt.ItemDataRole.UserRole)]
+            if len(selected_ids) > 1:
+                remove_action = QAction(f"Eliminar {len(selected_ids)} Mods Seleccionados (Local y Gestión)", self)
+                remove_action.triggered.connect(lambda: self.remove_mods(selected_ids))
+                menu.addAction(remove_action)
+            elif selected_ids:
                 remove_action = QAction("Eliminar Mod (Local y Gestión)", self)
-                remove_action.triggered.connect(lambda: self.remove_mod(workshop_id))
+                remove_action.triggered.connect(lambda: self.remove_mod(selected_ids[0]))
                 menu.addAction(remove_action)
             menu.exec(self.installed_mods_list.mapToGlobal(pos))
 
     def remove_mod(self, workshop_id: str):
-        reply = QMessageBox.question(self, "Confirmar Eliminación", f"¿Seguro que quieres eliminar el mod {workshop_id}?", QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+        self.remove_mods([workshop_id])
+
+    def remove_mods(self, workshop_ids: list[str]):
+        """Desinstala varios mods en segundo plano y actualiza mods.json con una sola escritura al terminar."""
+        app_id = self.current_app_id
+        ids_to_remove = set(workshop_ids)
+        game = mod_repository.game(app_id)
+
+        text = f"¿Seguro que quieres eliminar el mod {workshop_ids[0]}?" if len(workshop_ids) == 1 else f"¿Seguro que quieres eliminar {len(workshop_ids)} mods?"
+        # Avisar si algún mod gestionado que se queda depende de los que se van a eliminar
+        still_required = []
+        for dep_id, dependents in dependency_index.required_by_many(app_id, workshop_ids).items():
+            names = sorted(game.name_of(wid) for wid in dependents if wid in game and wid not in ids_to_remove)
+            if names:
+                still_required.append(f"• {game.name_of(dep_id, dep_id)}: requerido por {', '.join(names)}")
+        if still_required:
+            text = "Otros mods gestionados dependen de lo que vas a eliminar:\n\n" + "\n".join(still_required) + "\n\n" + text
+        reply = QMessageBox.question(self, "Confirmar Eliminación", text, QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
         if reply == QMessageBox.StandardButton.No: return
 
-        all_mods = data_manager.get_mods_for_game(self.current_app_id)
-        mod_to_remove = next((mod for mod in all_mods if mod['workshop_id'] == workshop_id), None)
-        if mod_to_remove:
-            if mod_to_remove.get('status') == 'installed':
-                final_mod_path = Path(data_manager.get_game_info(self.current_app_id).get('mod_install_path', '')) / workshop_id
-                if final_mod_path.exists():
-                    try:
-                        shutil.rmtree(final_mod_path)
-                    except Exception as e:
-                        QMessageBox.critical(self, "Error al Eliminar", f"No se pudo eliminar la carpeta: {e}")
-                        return
-            
-            all_mods.remove(mod_to_remove)
-            data_manager.save_mods_for_game(self.current_app_id, all_mods)
-            self.update_mod_lists()
-            self.clear_preview_panel()
-            self.statusBar().showMessage(f"Mod '{mod_to_remove.get('name', workshop_id)}' eliminado.", 3000)
+        # Dependencias que solo usaban los mods eliminados. Si a algún mod que se queda le faltan los
+        # detalles no se sabe qué requiere, así que no se propone eliminar nada más
+        if dependency_index.missing_details(app_id, game.ids() - ids_to_remove):
+            orphans = []
+        else:
+            orphans = dependency_index.find_orphans(app_id, game.ids(), game.installed_dependencies(), removing=ids_to_remove)
+        if orphans:
+            names = "\n".join(f"• {game.name_of(wid, wid)} (ID: {wid})" for wid in orphans)
+            reply = QMessageBox.question(self, "Dependencias sin Uso",
+                                         f"Estas dependencias ya no las necesita ningún otro mod gestionado:\n\n{names}\n\n¿Eliminarlas también?",
+                                         QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+            if reply == QMessageBox.StandardButton.Yes:
+                workshop_ids = list(workshop_ids) + orphans
+        self._start_uninstall(workshop_ids)
+
+    @pyqtSlot()
+    def prune_orphaned_dependencies(self):
+        """Elimina de una vez los mods añadidos como dependencia que ya no requiere ningún mod gestionado."""
+        if not self.current_app_id:
+            QMessageBox.warning(self, "Sin Juego", "Por favor, selecciona un juego primero.")
+            return
+        game = mod_repository.game(self.current_app_id)
+        missing = dependency_index.missing_details(self.current_app_id, game.ids())
+        if missing:
+            QMessageBox.warning(self, "Faltan Detalles",
+                                f"{len(missing)} mods gestionados aún no tienen sus detalles en caché, así que no se sabe qué dependencias "
+                                f"necesitan (p. ej. {', '.join(missing[:5])}).\n\nEspera a que termine la precarga de detalles o abre su "
+                                "vista previa e inténtalo de nuevo.")
+            return
+        orphans = dependency_index.find_orphans(self.current_app_id, game.ids(), game.installed_dependencies())
+        if not orphans:
+            QMessageBox.information(self, "Sin Dependencias Huérfanas", "Todas las dependencias instaladas siguen siendo necesarias.")
+            return
+        names = "\n".join(f"• {game.name_of(wid, wid)} (ID: {wid})" for wid in orphans)
+        reply = QMessageBox.question(self, "Eliminar Dependencias Huérfanas",
+                                     f"Ningún mod gestionado requiere ya estas {len(orphans)} dependencias:\n\n{names}\n\n¿Eliminarlas?",
+                                     QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+        if reply == QMessageBox.StandardButton.Yes:
+            self._start_uninstall(orphans)
+
+    def _start_uninstall(self, workshop_ids: list[str]):
+        app_id = self.current_app_id
+        install_dir = Path(data_manager.get_game_info(app_id).get('mod_install_path', ''))
+        ids_to_remove = set(workshop_ids)
+
+        # Efecto visible inmediato: quitar los elementos de la lista sin esperar al borrado
+        for i in reversed(range(self.installed_mods_list.count())):
+            if self.installed_mods_list.item(i).data(Qt.ItemDataRole.UserRole) in ids_to_remove:
+                self.installed_mods_list.takeItem(i)
+        self.clear_preview_panel()
+
+        worker = UninstallWorker(install_dir, workshop_ids)
+        worker.signals.progress.connect(lambda done, total: self.statusBar().showMessage(f"Eliminando mods: {done}/{total}..."))
+        worker.signals.finished.connect(lambda removed, errors, a=app_id: self.on_uninstall_finished(a, removed, errors))
+        self.io_pool.start(worker)
+
+    def on_uninstall_finished(self, app_id: str, removed: list, errors: dict):
+        data_manager.remove_mods_from_game(app_id, removed)
+        if app_id == self.current_app_id:
+            self.start_disk_usage_scan()
+        if errors:
+            details = "\n".join(f"{wid}: {err}" for wid, err in errors.items())
+            QMessageBox.critical(self, "Error al Eliminar", f"No se pudieron eliminar {len(errors)} mods:\n{details}")
+        self.statusBar().showMessage(f"{len(removed)} mods eliminados.", 3000)
 
     @pyqtSlot()
     def check_for_updates(self):
         # La lógica de check_for_updates se mantiene igual que en la versión anterior.
         pass
 
+    def closeEvent(self, event):
+        try:
+            ui_snapshot.save_snapshot(self.build_snapshot())
+        except OSError as e:
+            print(f"ADVERTENCIA: No se pudo guardar la instantánea de la interfaz: {e}")
+        # Cancelar el trabajo en segundo plano para que no emita señales durante el cierre
+        if self.warmup_worker:
+            self.warmup_worker.cancel()
+        self._cancel_active_scraper()
+        self.scrape_pool.clear()
+        self.image_pool.clear()
+        super().closeEvent(event)
+
     def show_about_dialog(self):
         QMessageBox.about(self, "Acerca de Steam Workshop Mod Manager", "<b>Steam Workshop Mod Manager v1.4</b><br>Desarrollado con PyQt6.")
\ No newline at end of file
@@ -1,10 +1,10 @@
-// assets/js/injector.js - Versión 15.0 - Arquitectura "Server First" y Sincronización
+// assets/js/injector.js - Versión 16.0 - Arquitectura "Server First", Sincronización y Añadido en Lote
 (function() {
     'use strict';
     
     if (typeof MOD_MANAGER_PORT === 'undefined') { return; }
     
-    console.log(`ModManager Injector v15.0: Iniciado. Conectando al puerto ${MOD_MANAGER_PORT}.`);
+    console.log(`ModManager Injector v16.0: Iniciado. Conectando al puerto ${MOD_MANAGER_PORT}.`);
     const API_URL = `http://127.0.0.1:${MOD_MANAGER_PORT}`;
 
     // --- 1. Inyección de Estilos CSS (sin cambios) ---
@@ -26,6 +26,12 @@
             border-radius: 50%; font-size: 32px;
         }
         #mod-manager-floating-btn.remove { font-size: 28px; }
+        #mod-manager-add-all-btn {
+            position: fixed; bottom: 20px; right: 20px; padding: 12px 18px; border-radius: 28px;
+            background-color: #28a745; color: white; font-size: 15px; font-weight: bold;
+            cursor: pointer; z-index: 1002; border: 1px solid rgba(0,0,0,0.4); box-shadow: 0 2px 8px rgba(0,0,0,0.5);
+        }
+        #mod-manager-add-all-btn.disabled { background-color: #6c757d; cursor: default; }
     `;
     const styleSheet = document.createElement("style");
     styleSheet.innerText = styles;
@@ -54,6 +60,7 @@
                 processDetailPage();
             } else {
                 startObserver();
+                if (isListingPage()) createAddAllButton();
             }
         })
         .catch(err => console.error("ModManager: No se pudo obtener el estado inicial del servidor. Los botones no funcionarán correctamente.", err));
@@ -62,6 +69,7 @@
     async function handleAddClick(workshopId, modName) {
         stagedMods.add(workshopId);
         syncAllButtonsForId(workshopId, modName);
+        updateAddAllButton();
         try {
             await fetch(`${API_URL}/add`, {
                 method: 'POST', headers: { 'Content-Type': 'application/json' },
@@ -73,6 +81,7 @@
     async function handleRemoveClick(workshopId, modName) {
         stagedMods.delete(workshopId);
         syncAllButtonsForId(workshopId, modName);
+        updateAddAllButton();
         try {
             await fetch(`${API_URL}/remove`, {
                 method: 'POST', headers: { 'Content-Type': 'application/json' },
@@ -81,6 +90,59 @@
         } catch (error) { console.error('ModManager: Error al quitar mod:', error); }
     }
 
+    // Recoge los mods visibles de la página (ya procesados por el observador) que aún no están en el carrito
+    function collectPendingPageMods() {
+        const mods = new Map();
+        document.querySelectorAll('.mod-manager-anchor > .mod-manager-btn[data-workshop-id]').forEach(button => {
+            const workshopId = button.dataset.workshopId;
+            if (button.offsetParent === null || mods.has(workshopId)) return; // Oculto o repetido
+            if (managedMods.has(workshopId) || stagedMods.has(workshopId)) return;
+            mods.set(workshopId, { workshopId, modName: button.dataset.modName });
+        });
+        return [...mods.values()];
+    }
+
+    async function handleAddAllClick() {
+        const mods = collectPendingPageMods();
+        if (mods.length === 0) return;
+        mods.forEach(mod => {
+            stagedMods.add(mod.workshopId);
+            syncAllButtonsForId(mod.workshopId, mod.modName);
+        });
+        updateAddAllButton();
+        try {
+            await fetch(`${API_URL}/add_batch`, {
+                method: 'POST', headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ appId: currentAppId, mods })
+            });
+        } catch (error) { console.error('ModManager: Error al añadir los mods de la página:', error); }
+    }
+
+    // Solo los listados de exploración y búsqueda (/workshop/browse/) tienen una página de resultados que añadir
+    function isListingPage() {
+        return new URL(window.location.href).pathname.startsWith('/workshop/browse');
+    }
+
+    function createAddAllButton() {
+        if (document.getElementById('mod-manager-add-all-btn')) return;
+        const button = document.createElement('div');
+        button.id = 'mod-manager-add-all-btn';
+        button.onclick = (e) => { e.preventDefault(); e.stopPropagation(); handleAddAllClick(); };
+        document.body.appendChild(button);
+        updateAddAllButton();
+    }
+
+    function updateAddAllButton() {
+        const button = document.getElementById('mod-manager-add-all-btn');
+        if (!button) return;
+        const count = collectPendingPageMods().length;
+        const text = count > 0 ? `+ Añadir todos los de esta página (${count})` : '✓ Página añadida';
+        // Solo se toca el DOM si cambia, para no volver a disparar el MutationObserver
+        if (button.textContent !== text) button.textContent = text;
+        button.classList.toggle('disabled', count === 0);
+        button.title = 'Añade al carrito todos los mods visibles que aún no están en él';
+    }
+
     function syncAllButtonsForId(workshopId, modName) {
         const buttons = document.querySelectorAll(`[data-workshop-id="${workshopId}"]`);
         buttons.forEach(button => updateButtonState(button, workshopId, modName));
@@ -132,6 +194,7 @@
             targetNode.querySelectorAll(masterSelector).forEach(link => processModLink(link));
         }
         applyProcessing(document.body);
+        let counterTimer = null;
         const observer = new MutationObserver((mutations) => {
             for (const mutation of mutations) {
                 mutation.addedNodes.forEach(node => {
@@ -143,6 +206,9 @@
                     }
                 });
             }
+            // Las páginas cargan resultados de forma dinámica; el contador se recalcula con retardo
+            clearTimeout(counterTimer);
+            counterTimer = setTimeout(updateAddAllButton, 300);
         });
         observer.observe(document.body, { childList: true, subtree: true });
     }
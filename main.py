@@ -1,11 +1,16 @@
 import sys
 import os
-from PyQt6.QtWidgets import QApplication, QMessageBox
-from app.ui.main_window import MainWindow
-from app.core.config_manager import config_manager
+import multiprocessing
+
+# Los módulos de la aplicación se importan dentro de las funciones: los procesos de análisis
+# (parse_pool, con 'spawn') vuelven a importar este archivo y solo necesitan workshop_page_parser,
+# no PyQt6 ni las instancias únicas de la aplicación.
 
 def initial_setup_check():
     """Verifica la configuración inicial crítica, como la ruta de SteamCMD."""
+    from PyQt6.QtWidgets import QMessageBox
+    from app.core.config_manager import config_manager
+
     steamcmd_path = config_manager.get("Paths", "steamcmd_path")
     if not steamcmd_path or not os.path.exists(steamcmd_path):
         msg_box = QMessageBox()
@@ -19,6 +24,11 @@ def initial_setup_check():
         # En una app completa, aquí se abriría directamente el diálogo de configuración.
 
 def main():
+    from PyQt6.QtWidgets import QApplication
+    from app.ui.main_window import MainWindow
+    from app.core.tracer import tracer
+    from app.core.parse_pool import parse_pool
+
     # Crear carpetas necesarias si no existen
     os.makedirs("gamedata", exist_ok=True)
     os.makedirs("assets/js", exist_ok=True)
@@ -35,7 +45,11 @@ def main():
     QApplication.instance().processEvents() # Permite que la ventana se dibuje
     initial_setup_check()
 
-    sys.exit(app.exec())
+    exit_code = app.exec()
+    parse_pool.shutdown()
+    tracer.export() # Solo escribe el archivo si el trazado está activado
+    sys.exit(exit_code)
 
 if __name__ == '__main__':
+    multiprocessing.freeze_support() # Necesario para los procesos de análisis en un ejecutable empaquetado
     main()
\ No newline at end of file
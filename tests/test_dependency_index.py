@@ -0,0 +1,66 @@
+#tests/test_dependency_index.py
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+from app.core.data_manager import data_manager
+from app.core.dependency_index import DependencyIndex
+
+APP_ID = "294100"
+
+class FindOrphansTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        patcher = mock.patch.object(data_manager, 'gamedata_path', Path(tmp.name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        data_manager.get_game_path(APP_ID).mkdir()
+        self.index = DependencyIndex()
+        self.addCleanup(lambda: [conn.close() for conn in self.index._connections.values()])
+
+    def depends(self, workshop_id: str, *dep_ids):
+        self.index.index_mod(APP_ID, workshop_id, {'dependencies': [{'id': dep_id} for dep_id in dep_ids]})
+
+    def test_required_by(self):
+        self.depends("1", "10", "11")
+        self.depends("2", "10")
+        self.assertEqual(sorted(self.index.required_by(APP_ID, "10")), ["1", "2"])
+        self.assertEqual(self.index.required_by_many(APP_ID, ["10", "11", "12"]), {"10": {"1", "2"}, "11": {"1"}})
+
+    def test_reindexing_replaces_dependencies(self):
+        self.depends("1", "10")
+        self.depends("1", "11")
+        self.assertEqual(self.index.required_by(APP_ID, "10"), [])
+
+    def test_dependency_still_required_is_not_an_orphan(self):
+        self.depends("1", "10")
+        self.depends("2", "10")
+        self.assertEqual(self.index.find_orphans(APP_ID, ["1", "2", "10"], ["10"], removing=["1"]), [])
+
+    def test_removing_the_last_dependent_orphans_the_dependency(self):
+        self.depends("1", "10")
+        self.depends("2", "11")
+        self.assertEqual(self.index.find_orphans(APP_ID, ["1", "2", "10", "11"], ["10", "11"], removing=["1"]), ["10"])
+
+    def test_orphans_cascade(self):
+        # 1 -> 10 -> 11: sin 1, 10 queda huérfano y, sin 10, también 11
+        self.depends("1", "10")
+        self.depends("10", "11")
+        self.assertEqual(self.index.find_orphans(APP_ID, ["1", "10", "11"], ["10", "11"], removing=["1"]), ["10", "11"])
+
+    def test_mods_installed_by_the_user_are_never_orphans(self):
+        self.depends("1", "10")
+        self.assertEqual(self.index.find_orphans(APP_ID, ["1", "10"], [], removing=["1"]), [])
+
+    def test_existing_cache_is_indexed_on_first_use(self):
+        cache_dir = data_manager.get_game_path(APP_ID) / "cache"
+        cache_dir.mkdir()
+        (cache_dir / "1.json").write_text('{"dependencies": [{"id": "10"}, {"id": "1"}]}', encoding='utf-8')
+        (cache_dir / "2.json").write_text('no es json', encoding='utf-8')
+        self.assertEqual(self.index.required_by(APP_ID, "10"), ["1"])
+        self.assertEqual(self.index.required_by(APP_ID, "1"), [])
+        self.assertEqual(self.index.missing_details(APP_ID, ["1", "3"]), ["3"])
+
+if __name__ == '__main__':
+    unittest.main()
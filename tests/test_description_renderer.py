@@ -0,0 +1,50 @@
+#tests/test_description_renderer.py
+import unittest
+from app.core.description_renderer import render_bbcode_html, bbcode_to_text, SHORT_DESCRIPTION_CHARS, EXPAND_DESCRIPTION_URL
+
+class RenderBBCodeTests(unittest.TestCase):
+    def test_formatting_tags(self):
+        full_html, short_html = render_bbcode_html("[b]Negrita[/b] y [strike]tachado[/strike]")
+        self.assertEqual(full_html, "<b>Negrita</b> y <s>tachado</s><br>")
+        self.assertIsNone(short_html)
+
+    def test_lists_do_not_add_line_breaks_between_items(self):
+        full_html, _ = render_bbcode_html("[list]\n[*]Uno\n[*]Dos\n[/list]")
+        self.assertEqual(full_html, "<ul><li>Uno<br><li>Dos<br></ul><br>")
+
+    def test_html_is_escaped(self):
+        full_html, _ = render_bbcode_html('<script>alert("x")</script>')
+        self.assertNotIn("<script>", full_html)
+        self.assertIn("&lt;script&gt;", full_html)
+
+    def test_links_only_allow_http(self):
+        full_html, _ = render_bbcode_html("[url=https://example.com]web[/url] [url=javascript:alert(1)]x[/url]")
+        self.assertIn('<a href="https://example.com">web</a>', full_html)
+        self.assertNotIn("javascript", full_html.replace("<a>", ""))
+
+    def test_bare_url_tag_uses_its_text_as_target(self):
+        full_html, _ = render_bbcode_html("[url]https://example.com/a[/url]")
+        self.assertIn('<a href="https://example.com/a">https://example.com/a</a>', full_html)
+
+    def test_images_become_links(self):
+        full_html, _ = render_bbcode_html("[img]https://example.com/a.png[/img][img]file:///etc/passwd[/img]")
+        self.assertIn('<a href="https://example.com/a.png">[imagen]</a>', full_html)
+        self.assertNotIn("passwd", full_html)
+
+    def test_unknown_tags_are_dropped(self):
+        full_html, _ = render_bbcode_html("[noparse]texto[/noparse]")
+        self.assertEqual(full_html, "texto<br>")
+
+    def test_long_descriptions_get_a_shortened_version(self):
+        line = "x" * 1000
+        full_html, short_html = render_bbcode_html("\n".join([line] * (SHORT_DESCRIPTION_CHARS // 1000 + 5)))
+        self.assertIsNotNone(short_html)
+        self.assertLess(len(short_html), len(full_html))
+        self.assertIn(EXPAND_DESCRIPTION_URL, short_html)
+        self.assertTrue(short_html.startswith(line + "<br>"))
+
+    def test_bbcode_to_text(self):
+        self.assertEqual(bbcode_to_text("[h1]Título[/h1] [img]https://example.com/a.png[/img]texto "), "Título texto")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+#tests/test_download_planner.py
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+from app.core import download_planner
+from app.core.download_planner import DownloadPlan, order_items, check_free_space, SAFETY_MARGIN_BYTES
+
+GB = 1024 ** 3
+
+def _items(*workshop_ids) -> list[dict]:
+    return [{'workshop_id': wid, 'name': f"Mod {wid}"} for wid in workshop_ids]
+
+def _ids(items: list[dict]) -> list[str]:
+    return [item['workshop_id'] for item in items]
+
+class OrderItemsTests(unittest.TestCase):
+    sizes = {"1": 300, "2": 100, "3": 200}
+
+    def test_small_first(self):
+        self.assertEqual(_ids(order_items(_items("1", "2", "3"), self.sizes, "small_first")), ["2", "3", "1"])
+
+    def test_large_first(self):
+        self.assertEqual(_ids(order_items(_items("1", "2", "3"), self.sizes, "large_first")), ["1", "3", "2"])
+
+    def test_unknown_sizes_go_last_in_original_order(self):
+        ordered = order_items(_items("9", "1", "8", "2"), self.sizes, "small_first")
+        self.assertEqual(_ids(ordered), ["2", "1", "9", "8"])
+
+    def test_other_strategies_keep_order_and_copy_the_list(self):
+        items = _items("1", "2", "3")
+        ordered = order_items(items, self.sizes, "queue")
+        self.assertEqual(ordered, items)
+        self.assertIsNot(ordered, items)
+
+class CheckFreeSpaceTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.staging = Path(tmp.name) / "staging"
+        self.install = Path(tmp.name) / "install"
+        self.staging.mkdir()
+        self.install.mkdir()
+        # Dos mods a descargar (1 + 2 GB) y uno que SteamCMD ya tiene al día (4 GB)
+        self.plan = DownloadPlan(_items("1", "2"), {"1": GB, "2": 2 * GB, "3": 4 * GB}, {"3": self.staging / "3"})
+
+    def check(self, free_bytes: int, same_device: bool):
+        devices = {self.staging.resolve(): 1, self.install.resolve(): 1 if same_device else 2}
+        fake_os = SimpleNamespace(stat=lambda path: SimpleNamespace(st_dev=devices[Path(path)]))
+        with mock.patch.object(download_planner, 'os', fake_os), \
+             mock.patch.object(download_planner.shutil, 'disk_usage', return_value=SimpleNamespace(free=free_bytes)):
+            check_free_space(self.plan, self.staging, self.install)
+
+    def test_same_device_only_needs_the_download(self):
+        self.check(3 * GB + SAFETY_MARGIN_BYTES, same_device=True)
+        self.assertTrue(self.plan.has_enough_space)
+
+    def test_other_device_also_receives_the_up_to_date_mods(self):
+        self.check(3 * GB + SAFETY_MARGIN_BYTES, same_device=False)
+        self.assertEqual(len(self.plan.space_problems), 1)
+        self.assertIn("instalación de mods", self.plan.space_problems[0])
+
+    def test_other_device_with_room_for_everything(self):
+        self.check(7 * GB + SAFETY_MARGIN_BYTES, same_device=False)
+        self.assertTrue(self.plan.has_enough_space)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+#tests/test_modpack.py
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+from app.core import modpack
+from app.core.data_manager import data_manager
+from app.core.modpack import LOCKFILE_FORMAT, load_lockfile, plan_import, hash_mod_folder
+from app.core.workshop_manifest import get_content_path
+
+APP_ID = "294100"
+HASH = "ab" * 32
+
+class LoadLockfileTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name) / "modpack.lock.json"
+
+    def load(self, mods, **fields) -> dict:
+        lockfile = {"format": LOCKFILE_FORMAT, "app_id": APP_ID, "mods": mods}
+        lockfile.update(fields)
+        self.path.write_text(json.dumps(lockfile), encoding='utf-8')
+        return load_lockfile(self.path)
+
+    def test_valid_lockfile_is_normalized(self):
+        lockfile = self.load([{"workshop_id": "123", "name": "Mod\nCon  saltos", "time_updated": 5,
+                               "dependencies": ["456", "../x", 7], "content_hash": HASH}])
+        self.assertEqual(lockfile['mods'], [{"workshop_id": "123", "name": "Mod Con saltos", "time_updated": 5,
+                                             "dependencies": ["456"], "content_hash": HASH}])
+
+    def test_optional_fields_get_defaults(self):
+        lockfile = self.load([{"workshop_id": "123", "name": None, "time_updated": None}])
+        self.assertEqual(lockfile['mods'], [{"workshop_id": "123", "name": "", "time_updated": 0,
+                                             "dependencies": [], "content_hash": ""}])
+
+    def test_rejects_unsafe_workshop_ids(self):
+        for workshop_id in ["../../Windows", "123\nquit", "", "１２３", 123, None, "12 3"]:
+            with self.subTest(workshop_id=workshop_id), self.assertRaises(ValueError):
+                self.load([{"workshop_id": workshop_id}])
+
+    def test_rejects_entries_that_are_not_objects(self):
+        with self.assertRaises(ValueError):
+            self.load(["123"])
+
+    def test_rejects_invalid_fields(self):
+        for entry in [{"content_hash": "abc"}, {"content_hash": HASH.upper()}, {"content_hash": 1},
+                      {"time_updated": "5"}, {"time_updated": -1}, {"time_updated": True}]:
+            with self.subTest(entry=entry), self.assertRaises(ValueError):
+                self.load([dict(entry, workshop_id="123")])
+
+    def test_rejects_unknown_formats(self):
+        with self.assertRaises(ValueError):
+            self.load([], format=LOCKFILE_FORMAT + 1)
+        with self.assertRaises(ValueError):
+            self.load({"workshop_id": "123"})
+        self.path.write_text("[]", encoding='utf-8')
+        with self.assertRaises(ValueError):
+            load_lockfile(self.path)
+        self.path.write_text("{", encoding='utf-8')
+        with self.assertRaises(ValueError):
+            load_lockfile(self.path)
+
+class PlanImportTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        root = Path(tmp.name)
+        self.install_dir = root / "mods"
+        self.staging = root / "workshop"
+        (root / "gamedata" / APP_ID).mkdir(parents=True)
+        for patcher in (mock.patch.object(data_manager, 'gamedata_path', root / "gamedata"),
+                        mock.patch.object(data_manager, 'get_game_info', return_value={'mod_install_path': str(self.install_dir)}),
+                        mock.patch.object(modpack, 'get_staging_path', return_value=self.staging)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    @staticmethod
+    def make_mod(folder: Path, content: str) -> str:
+        folder.mkdir(parents=True)
+        (folder / "mod.txt").write_text(content, encoding='utf-8')
+        return hash_mod_folder(folder)
+
+    def test_classifies_by_content_hash(self):
+        matching_hash = self.make_mod(self.install_dir / "1", "uno")
+        linkable_hash = self.make_mod(get_content_path(self.staging, APP_ID, "2"), "dos")
+        outdated_hash = self.make_mod(self.install_dir / "3", "tres viejo")
+        lockfile = {"mods": [
+            {"workshop_id": "1", "content_hash": matching_hash},
+            {"workshop_id": "2", "content_hash": linkable_hash},
+            {"workshop_id": "3", "content_hash": "f" * 64},
+            {"workshop_id": "4", "content_hash": ""},
+        ]}
+        self.assertNotEqual(outdated_hash, "f" * 64)
+        plan = plan_import(APP_ID, lockfile)
+        self.assertEqual([m['workshop_id'] for m in plan.matching], ["1"])
+        self.assertEqual([(m['workshop_id'], path) for m, path in plan.linkable],
+                         [("2", get_content_path(self.staging, APP_ID, "2"))])
+        self.assertEqual([m['workshop_id'] for m in plan.to_download], ["3", "4"])
+
+    def test_hash_ignores_folder_location(self):
+        self.assertEqual(self.make_mod(self.install_dir / "1", "igual"), self.make_mod(self.staging / "otro", "igual"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+#tests/test_network_governor.py
+import unittest
+import requests
+from app.core.network_governor import NetworkGovernor, _HostLimiter
+
+URL = "https://steamcommunity.com/sharedfiles/filedetails/?id=1"
+
+def _response(status: int, headers: dict | None = None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    return response
+
+class FakeSession:
+    """Sesión que devuelve (o lanza) los resultados indicados, uno por llamada."""
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = 0
+
+    def request(self, method, url, **kwargs):
+        self.calls += 1
+        result = self.results.pop(0) if len(self.results) > 1 else self.results[0]
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+class HostLimiterTests(unittest.TestCase):
+    def make_limiter(self, **kwargs) -> _HostLimiter:
+        options = dict(max_rate=100.0, burst=10.0, min_concurrency=1, max_concurrency=8)
+        options.update(kwargs)
+        return _HostLimiter("test.invalid", **options)
+
+    def test_acquire_and_finish_track_in_flight(self):
+        limiter = self.make_limiter()
+        limiter.acquire()
+        limiter.acquire()
+        self.assertEqual(limiter.stats()['in_flight'], 2)
+        limiter.finish(200, None)
+        limiter.finish(None, None)
+        self.assertEqual(limiter.stats()['in_flight'], 0)
+
+    def test_throttle_halves_limits_and_success_recovers(self):
+        limiter = self.make_limiter()
+        start_limit, start_rate = limiter.limit, limiter.rate
+        limiter.acquire()
+        limiter.finish(429, None)
+        self.assertEqual(limiter.limit, start_limit / 2)
+        self.assertEqual(limiter.rate, start_rate / 2)
+        self.assertEqual(limiter.throttled, 1)
+        for _ in range(200):
+            limiter.acquire()
+            limiter.finish(200, None)
+        self.assertEqual(limiter.limit, limiter.max_concurrency)
+        self.assertEqual(limiter.rate, limiter.max_rate)
+
+    def test_consecutive_throttles_count_as_one_decrease(self):
+        limiter = self.make_limiter()
+        start_limit = limiter.limit
+        for _ in range(3):
+            limiter.acquire()
+            limiter.finish(503, None)
+        self.assertEqual(limiter.limit, start_limit / 2)
+        self.assertEqual(limiter.throttled, 3)
+
+    def test_token_bucket_waits_after_burst(self):
+        limiter = self.make_limiter(max_rate=1.0, burst=2.0)
+        self.assertEqual(limiter.reserve(), 0.0)
+        self.assertEqual(limiter.reserve(), 0.0)
+        self.assertGreater(limiter.reserve(), 0.5)
+
+    def test_retry_after_blocks_host(self):
+        limiter = self.make_limiter()
+        limiter.acquire()
+        limiter.finish(429, 30.0)
+        self.assertGreater(limiter.stats()['blocked_for_s'], 29.0)
+
+class NetworkGovernorTests(unittest.TestCase):
+    def make_governor(self, *results) -> tuple[NetworkGovernor, FakeSession]:
+        governor = NetworkGovernor()
+        governor.max_rate, governor.burst = 1000.0, 1000.0
+        governor.max_retries = 2
+        governor.backoff_base = 0.0
+        session = FakeSession(*results)
+        governor._local.session = session
+        return governor, session
+
+    def in_flight(self, governor: NetworkGovernor) -> int:
+        return governor._limiter(URL).stats()['in_flight']
+
+    def test_retries_throttled_response_then_succeeds(self):
+        governor, session = self.make_governor(_response(429, {'Retry-After': '0'}), _response(200))
+        response = governor.get(URL)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(session.calls, 2)
+        self.assertEqual(governor.stats()["steamcommunity.com"]['throttled'], 1)
+        self.assertEqual(self.in_flight(governor), 0)
+
+    def test_returns_last_throttled_response_when_retries_run_out(self):
+        governor, session = self.make_governor(_response(503))
+        self.assertEqual(governor.get(URL).status_code, 503)
+        self.assertEqual(session.calls, governor.max_retries + 1)
+        self.assertEqual(self.in_flight(governor), 0)
+
+    def test_transient_errors_are_retried_and_release_the_slot(self):
+        governor, session = self.make_governor(requests.exceptions.ChunkedEncodingError("truncado"))
+        with self.assertRaises(requests.exceptions.ChunkedEncodingError):
+            governor.get(URL)
+        self.assertEqual(session.calls, governor.max_retries + 1)
+        self.assertEqual(self.in_flight(governor), 0)
+
+    def test_non_transient_errors_are_raised_at_once_and_release_the_slot(self):
+        for error in (requests.exceptions.InvalidURL("url"), requests.TooManyRedirects("bucle"), ValueError("inesperado")):
+            governor, session = self.make_governor(error)
+            with self.assertRaises(type(error)):
+                governor.get(URL)
+            self.assertEqual(session.calls, 1)
+            self.assertEqual(self.in_flight(governor), 0)
+
+    def test_errors_beyond_the_concurrency_limit_do_not_block_later_requests(self):
+        governor, _ = self.make_governor(requests.exceptions.ContentDecodingError("gzip"))
+        governor.max_retries = 0
+        for _ in range(governor.max_concurrency + 2):
+            with self.assertRaises(requests.exceptions.ContentDecodingError):
+                governor.get(URL)
+        governor._local.session = FakeSession(_response(200))
+        self.assertEqual(governor.get(URL).status_code, 200)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+#tests/test_run_history.py
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+from app.core import run_history
+from app.core.data_manager import data_manager
+from app.core.run_history import RunLogWriter, get_item_excerpt, find_runs_for_item
+
+APP_ID = "294100"
+
+class RunLogTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        patcher = mock.patch.object(data_manager, 'gamedata_path', Path(tmp.name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def write_run(self, lines: list[str], workshop_ids: list[str]) -> RunLogWriter:
+        writer = RunLogWriter(APP_ID, workshop_ids)
+        for line in lines:
+            writer.write_line(line)
+        writer.close({wid: 'succeeded' for wid in workshop_ids})
+        return writer
+
+    def test_excerpt_spans_several_chunks(self):
+        lines = [f"linea {i}" for i in range(run_history.CHUNK_LINES * 3)]
+        lines[5] = "Downloading item 1234567 ..."
+        lines[run_history.CHUNK_LINES * 2] = 'Success. Downloaded item 1234567 to "/tmp/x" (10 bytes)'
+        writer = self.write_run(lines, ["1234567"])
+        excerpt = get_item_excerpt(APP_ID, writer.run_id, "1234567", context=1)
+        self.assertEqual(excerpt, [
+            "linea 4", lines[5], "linea 6",
+            f"linea {run_history.CHUNK_LINES * 2 - 1}", lines[run_history.CHUNK_LINES * 2], f"linea {run_history.CHUNK_LINES * 2 + 1}"
+        ])
+
+    def test_excerpt_of_unknown_item_or_run_is_empty(self):
+        writer = self.write_run(["Downloading item 1234567 ..."], ["1234567"])
+        self.assertEqual(get_item_excerpt(APP_ID, writer.run_id, "7654321"), [])
+        self.assertEqual(get_item_excerpt(APP_ID, "no-existe", "1234567"), [])
+
+    def test_ids_outside_the_run_are_not_indexed(self):
+        writer = self.write_run(["Downloading item 1234567 ...", "Otro mod 7654321"], ["1234567"])
+        self.assertEqual(get_item_excerpt(APP_ID, writer.run_id, "7654321"), [])
+        self.assertEqual([run['run_id'] for run in find_runs_for_item(APP_ID, "1234567")], [writer.run_id])
+
+    def test_close_reports_item_timings(self):
+        writer = RunLogWriter(APP_ID, ["1", "2"], attempt=1)
+        writer.write_line("Downloading item 1 ...")
+        writer.write_line('Success. Downloaded item 1 to "/tmp/x" (10 bytes)')
+        summary = writer.close({"1": 'succeeded', "2": 'failed'})
+        stats = {item['workshop_id']: item for item in summary['item_stats']}
+        self.assertEqual(stats["1"]['bytes'], 10)
+        self.assertEqual(stats["1"]['attempt'], 1)
+        self.assertIsNone(stats["1"]['failure_reason'])
+        self.assertEqual(stats["2"]['failure_reason'], "SteamCMD se detuvo antes de descargarlo")
+        self.assertIsNone(writer.close({}))
+
+if __name__ == '__main__':
+    unittest.main()
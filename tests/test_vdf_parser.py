@@ -0,0 +1,56 @@
+#tests/test_vdf_parser.py
+import unittest
+from app.core.vdf_parser import parse_vdf, VDFParseError
+
+ACF = r'''
+"AppWorkshop"
+{
+    "appid"     "294100"
+    // Comentario que se ignora
+    "WorkshopItemsInstalled"
+    {
+        "2009463077"
+        {
+            "size"          "1024"
+            "timeupdated"   "1690000000"
+        }
+    }
+}
+'''
+
+class ParseVDFTests(unittest.TestCase):
+    def test_parses_nested_blocks(self):
+        data = parse_vdf(ACF)
+        item = data['AppWorkshop']['WorkshopItemsInstalled']['2009463077']
+        self.assertEqual(data['AppWorkshop']['appid'], "294100")
+        self.assertEqual(item, {"size": "1024", "timeupdated": "1690000000"})
+
+    def test_unescapes_quoted_values(self):
+        data = parse_vdf(r'"root" { "path" "C:\\Steam\\\"mods\"" "text" "a\tb\nc" }')
+        self.assertEqual(data['root']['path'], 'C:\\Steam\\"mods"')
+        self.assertEqual(data['root']['text'], "a\tb\nc")
+
+    def test_bare_tokens_and_repeated_keys_keep_last_value(self):
+        data = parse_vdf('root { key first key "second" }')
+        self.assertEqual(data, {"root": {"key": "second"}})
+
+    def test_comment_inside_quotes_is_a_value(self):
+        data = parse_vdf('"root" { "url" "https://example.com" }')
+        self.assertEqual(data['root']['url'], "https://example.com")
+
+    def test_empty_text(self):
+        self.assertEqual(parse_vdf(""), {})
+
+    def test_unbalanced_braces_raise(self):
+        with self.assertRaises(VDFParseError):
+            parse_vdf('"root" { "key" "value"')
+        with self.assertRaises(VDFParseError):
+            parse_vdf('"root" "value" }')
+        with self.assertRaises(VDFParseError):
+            parse_vdf('{ "key" "value" }')
+
+    def test_parse_error_is_a_value_error(self):
+        self.assertTrue(issubclass(VDFParseError, ValueError))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+#tools/fake_steamcmd.py
+"""
+SteamCMD falso para pruebas de carga sin conexión. Se configura como steamcmd_path en
+[Paths] (SteamCMDWorker lo lanza con el intérprete de Python) y entiende el mismo script que
+genera la aplicación: login, workshop_download_item, @ShutdownOnFailedCommand y quit.
+
+Por cada workshop_download_item escribe archivos del tamaño que anuncia la API simulada en
+<carpeta de este script>/steamapps/workshop/content/<appid>/<id>, actualiza el manifiesto
+appworkshop_<appid>.acf al terminar y reproduce la salida de SteamCMD. Se ajusta con la sección [Testing]:
+  fake_latency_ms    Latencia media por mod (con un ±50 % aleatorio).
+  fake_failure_rate  Probabilidad (0-1) de que un mod falle.
+  fake_min_size_kb / fake_max_size_kb / fake_seed  Tamaños y semilla compartidos con mock_steam_server.py.
+"""
+import random
+import sys
+import time
+from pathlib import Path
+from fake_workshop import load_testing_config, item_info_from_config
+
+WORKSHOP_ROOT = Path(__file__).resolve().parent / "steamapps" / "workshop"
+_BLOCK = random.Random(0).randbytes(64 * 1024)
+
+def read_commands(argv: list[str]) -> list[str]:
+    """Convierte '+runscript ruta' y '+comando args' de la línea de órdenes en una lista de comandos."""
+    commands, current = [], None
+    for arg in argv:
+        if arg.startswith('+'):
+            current = [arg[1:]]
+            commands.append(current)
+        elif current is not None:
+            current.append(arg)
+    lines = []
+    for command in commands:
+        if command[0] == 'runscript' and len(command) > 1:
+            with open(command[1], 'r', encoding='utf-8') as f:
+                lines.extend(line.strip() for line in f if line.strip())
+        else:
+            lines.append(" ".join(command))
+    return lines
+
+def write_item(content_dir: Path, files: list[tuple[str, int]]):
+    for rel_path, size in files:
+        path = content_dir / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'wb') as f:
+            remaining = size
+            while remaining > 0:
+                chunk = _BLOCK[:min(len(_BLOCK), remaining)]
+                f.write(chunk)
+                remaining -= len(chunk)
+
+def write_manifest(app_id: str, installed: dict[str, dict]):
+    """Escribe appworkshop_<appid>.acf con el formato VDF que usa SteamCMD."""
+    lines = ['"AppWorkshop"', '{', f'\t"appid"\t\t"{app_id}"', '\t"WorkshopItemsInstalled"', '\t{']
+    for workshop_id, entry in sorted(installed.items()):
+        lines += [f'\t\t"{workshop_id}"', '\t\t{', f'\t\t\t"size"\t\t"{entry["size"]}"',
+                  f'\t\t\t"timeupdated"\t\t"{entry["timeupdated"]}"', f'\t\t\t"manifest"\t\t"{entry["timeupdated"]}"', '\t\t}']
+    lines += ['\t}', '}']
+    WORKSHOP_ROOT.mkdir(parents=True, exist_ok=True)
+    (WORKSHOP_ROOT / f"appworkshop_{app_id}.acf").write_text("\n".join(lines) + "\n", encoding='utf-8')
+
+def load_manifest(app_id: str) -> dict[str, dict]:
+    path = WORKSHOP_ROOT / f"appworkshop_{app_id}.acf"
+    installed, current = {}, None
+    if not path.exists():
+        return installed
+    # Lectura mínima del formato que escribe write_manifest
+    for line in path.read_text(encoding='utf-8').splitlines():
+        parts = [p for p in line.strip().split('"') if p.strip()]
+        if len(parts) == 1 and parts[0].isdigit():
+            current = installed.setdefault(parts[0], {})
+        elif len(parts) == 2 and current is not None and parts[0] in ('size', 'timeupdated'):
+            current[parts[0]] = int(parts[1])
+    return installed
+
+def main() -> int:
+    testing = load_testing_config()
+    latency = testing.getfloat("fake_latency_ms", 50.0) / 1000
+    failure_rate = testing.getfloat("fake_failure_rate", 0.0)
+    rng = random.Random()
+    shutdown_on_failure = False
+    manifests: dict[str, dict] = {}
+
+    print("Redirecting stderr to 'logs/stderr.txt'", flush=True)
+    print("[  0%] Checking for available updates...", flush=True)
+    print("[----] Verifying installation...", flush=True)
+    print("Steam Console Client (c) Valve Corporation - version 1700000000 (simulado)", flush=True)
+    print("Loading Steam API...OK", flush=True)
+
+    for line in read_commands(sys.argv[1:]):
+        parts = line.split()
+        command = parts[0].lower()
+        if command == '@shutdownonfailedcommand':
+            shutdown_on_failure = len(parts) > 1 and parts[1] == '1'
+        elif command == 'login':
+            print(f"Logging in user '{parts[1] if len(parts) > 1 else 'anonymous'}' to Steam Public...OK", flush=True)
+            print("Waiting for client config...OK", flush=True)
+            print("Waiting for user info...OK", flush=True)
+        elif command == 'workshop_download_item' and len(parts) >= 3:
+            app_id, workshop_id = parts[1], parts[2]
+            info = item_info_from_config(workshop_id, testing)
+            print(f"Downloading item {workshop_id} ...", flush=True)
+            time.sleep(max(0.0, latency * rng.uniform(0.5, 1.5)))
+            if rng.random() < failure_rate:
+                print(f"ERROR! Download item {workshop_id} failed (Failure).", flush=True)
+                if shutdown_on_failure:
+                    break
+                continue
+            content_dir = WORKSHOP_ROOT / "content" / app_id / workshop_id
+            write_item(content_dir, info['files'])
+            if app_id not in manifests:
+                manifests[app_id] = load_manifest(app_id)
+            manifests[app_id][workshop_id] = {'size': info['size'], 'timeupdated': info['time_updated']}
+            print(f'Success. Downloaded item {workshop_id} to "{content_dir}" ({info["size"]} bytes) ', flush=True)
+        elif command == 'quit':
+            break
+    # El manifiesto se escribe una sola vez al final para que miles de mods no lo reescriban miles de veces
+    for app_id, installed in manifests.items():
+        write_manifest(app_id, installed)
+    print("Unloading Steam API...OK", flush=True)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,63 @@
+#tools/fake_workshop.py
+"""
+Generador determinista de mods ficticios compartido por fake_steamcmd.py y mock_steam_server.py.
+Un mismo workshop_id produce siempre el mismo título, tamaño, fecha y dependencias (para una
+misma semilla), así que el tamaño que anuncia la API simulada coincide con lo que "descarga" SteamCMD.
+"""
+import configparser
+import random
+import zlib
+from pathlib import Path
+
+CATALOG_BASE_ID = 3000000000 # Los ids del catálogo simulado son CATALOG_BASE_ID + i
+CONFIG_FILE = Path("config.ini") # Se ejecutan con el directorio de trabajo de la aplicación
+
+def load_testing_config() -> configparser.SectionProxy:
+    """Lee la sección [Testing] de config.ini (o una vacía si no existe)."""
+    config = configparser.ConfigParser()
+    config.read(CONFIG_FILE)
+    if not config.has_section("Testing"):
+        config.add_section("Testing")
+    return config["Testing"]
+
+def catalog_ids(count: int) -> list[str]:
+    return [str(CATALOG_BASE_ID + i) for i in range(count)]
+
+def _rng(seed: str, workshop_id: str) -> random.Random:
+    return random.Random(zlib.crc32(f"{seed}:{workshop_id}".encode('utf-8')))
+
+def item_info(workshop_id: str, seed: str = "moddownloader", min_size_kb: int = 64, max_size_kb: int = 2048,
+              catalog_size: int = 5000) -> dict:
+    """Devuelve {'title', 'size', 'files', 'time_updated', 'dependencies'} de un mod ficticio."""
+    rng = _rng(seed, workshop_id)
+    size = rng.randint(min_size_kb, max(min_size_kb, max_size_kb)) * 1024
+    file_count = rng.randint(1, 8)
+    # Reparto del tamaño total entre los archivos; el último se queda con el resto
+    cuts = sorted(rng.randint(0, size) for _ in range(file_count - 1))
+    bounds = [0] + cuts + [size]
+    files = [(f"data/file_{i:02d}.bin", bounds[i + 1] - bounds[i]) for i in range(file_count)]
+
+    dependencies = []
+    if catalog_size and rng.random() < 0.3:
+        for _ in range(rng.randint(1, 3)):
+            dep_id = str(CATALOG_BASE_ID + rng.randrange(catalog_size))
+            if dep_id != str(workshop_id) and dep_id not in dependencies:
+                dependencies.append(dep_id)
+
+    return {
+        'title': f"Mod de prueba {workshop_id}",
+        'size': size,
+        'files': files,
+        'time_updated': 1700000000 + rng.randrange(10_000_000),
+        'dependencies': dependencies
+    }
+
+def item_info_from_config(workshop_id: str, testing: configparser.SectionProxy) -> dict:
+    """item_info con los parámetros de la sección [Testing]."""
+    return item_info(
+        workshop_id,
+        seed=testing.get("fake_seed", "moddownloader"),
+        min_size_kb=testing.getint("fake_min_size_kb", 64),
+        max_size_kb=testing.getint("fake_max_size_kb", 2048),
+        catalog_size=testing.getint("mock_catalog_size", 5000)
+    )
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+#tools/load_test.py
+"""
+Prueba de carga de extremo a extremo del proceso de descarga, sin conexión ni interfaz:
+  1. Metadatos y dependencias por lotes desde la API simulada (SteamAPIHandler).
+  2. Planificación (plan_downloads) y descarga con SteamCMDWorker usando tools/fake_steamcmd.py.
+  3. Instalación con el motor de copia (install_mods) en una carpeta temporal.
+
+Arranca su propio mock_steam_server en segundo plano y usa un gamedata temporal, así que no
+toca los datos reales. La latencia y los fallos de SteamCMD salen de [Testing] en config.ini.
+Uso: python tools/load_test.py [--count 2000] [--app-id 480] [--keep]
+"""
+import argparse
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+TOOLS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(TOOLS_DIR.parent))
+
+from fake_workshop import load_testing_config, catalog_ids
+import mock_steam_server
+
+def start_mock_server(port: int) -> str:
+    server = mock_steam_server.ThreadingHTTPServer(("127.0.0.1", port), mock_steam_server.MockSteamHandler)
+    server.daemon_threads = True
+    server.testing = load_testing_config()
+    server.latency = server.testing.getfloat("mock_latency_ms", 0.0) / 1000
+    server.error_rate = server.testing.getfloat("mock_error_rate", 0.0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+def report(phase: str, seconds: float, items: int, nbytes: int = 0):
+    rate = f", {nbytes / seconds / 1024 / 1024:.1f} MiB/s" if nbytes and seconds else ""
+    print(f"{phase:<14} {seconds:8.2f} s  {items:6d} mods  {items / seconds if seconds else 0:8.1f} mods/s{rate}", flush=True)
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Prueba de carga del proceso de descarga con SteamCMD y Steam simulados.")
+    parser.add_argument('--count', type=int, default=1000, help="Número de mods a procesar")
+    parser.add_argument('--app-id', default="480")
+    parser.add_argument('--port', type=int, default=0, help="Puerto del servidor simulado (0 = libre)")
+    parser.add_argument('--keep', action='store_true', help="No borrar la carpeta temporal al terminar")
+    args = parser.parse_args()
+
+    work_dir = Path(tempfile.mkdtemp(prefix="moddownloader_load_"))
+    base_url = start_mock_server(args.port)
+
+    # La configuración se ajusta en memoria antes de importar los módulos que la leen al cargarse
+    from app.core.config_manager import config_manager
+    config_manager.set("Testing", "mock_steam_url", base_url)
+    config_manager.set("Paths", "steamcmd_path", str(TOOLS_DIR / "fake_steamcmd.py"))
+    config_manager.set("Paths", "gamedata_path", str(work_dir / "gamedata"))
+    config_manager.set("API", "steam_api_key", "loadtest")
+
+    from app.core.data_manager import data_manager
+    from app.core.steam_api_handler import steam_api_handler
+    from app.core.download_planner import plan_downloads, get_staging_path
+    from app.core.steam_handler import SteamCMDWorker
+    from app.core.copy_engine import install_mods
+    from app.core.metrics import metrics
+
+    install_dir = work_dir / "mods"
+    data_manager.save_game_info(args.app_id, {"name": "Prueba de carga", "mod_install_path": str(install_dir)})
+    ids = catalog_ids(args.count)
+    data_manager.add_mods_to_game(args.app_id, [(wid, f"Mod {wid}") for wid in ids])
+    print(f"Servidor simulado en {base_url}; datos temporales en {work_dir}\n", flush=True)
+
+    try:
+        start = time.perf_counter()
+        dependencies = steam_api_handler.get_dependencies(ids) or {}
+        report("Dependencias", time.perf_counter() - start, len(dependencies))
+
+        start = time.perf_counter()
+        download_list = [{'workshop_id': wid, 'name': f"Mod {wid}"} for wid in ids]
+        plan = plan_downloads(args.app_id, download_list, install_dir)
+        report("Planificación", time.perf_counter() - start, len(plan.items), plan.total_bytes)
+
+        script_path = work_dir / "download_script.txt"
+        with open(script_path, 'w') as f:
+            f.write("login anonymous\n")
+            for mod in plan.items:
+                f.write(f"workshop_download_item {args.app_id} {mod['workshop_id']}\n")
+            f.write("quit\n")
+        result = {}
+        worker = SteamCMDWorker(str(TOOLS_DIR / "fake_steamcmd.py"), str(script_path))
+        worker.signals.finished.connect(lambda log: result.update(log=log))
+        worker.signals.error.connect(lambda err: result.update(error=err))
+        start = time.perf_counter()
+        worker.run()
+        if 'error' in result:
+            print(f"ERROR: {result['error']}")
+            return 1
+        content_root = get_staging_path() / "content" / args.app_id
+        downloaded = [(wid, content_root / wid) for wid in ids if f'Downloaded item {wid} ' in result.get('log', '')]
+        report("Descarga", time.perf_counter() - start, len(downloaded), plan.total_bytes)
+
+        start = time.perf_counter()
+        installed, errors = install_mods(downloaded, install_dir)
+        installed_bytes = sum(f.stat().st_size for f in install_dir.rglob('*') if f.is_file())
+        report("Instalación", time.perf_counter() - start, len(installed), installed_bytes)
+        if errors:
+            print(f"\n{len(errors)} mods no se pudieron instalar, p. ej.: {next(iter(errors.items()))}")
+        print(f"\nFallos de SteamCMD simulados: {len(ids) - len(downloaded)}\n")
+        print(metrics.render())
+    finally:
+        shutil.rmtree(get_staging_path() / "content" / args.app_id, ignore_errors=True)
+        if not args.keep:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+#tools/mock_steam_server.py
+"""
+Servidor local que imita las páginas de la Workshop y la API Web de Steam para pruebas de carga.
+Con [Testing] mock_steam_url = http://127.0.0.1:<puerto> la aplicación le envía todas las
+peticiones de SteamWebScraper y SteamAPIHandler (cualquier steam_api_key sirve).
+
+Rutas simuladas:
+  GET  /sharedfiles/filedetails/?id=<id>                  Página de un mod (con RequiredItems).
+  POST /ISteamRemoteStorage/GetPublishedFileDetails/v1/   Detalles por lotes.
+  GET  /IPublishedFileService/GetDetails/v1/              Detalles por lotes con 'children'.
+  GET  /IPublishedFileService/QueryFiles/v1/?cursor=<c>   Catálogo por "actualizados recientemente".
+  GET  /workshop/browse/?appid=<id>&p=<n>                 Página de resultados del catálogo (HTML).
+  GET  /preview/<id>.png                                  Banner.
+
+Uso: python tools/mock_steam_server.py [--port N] [--latency-ms N] [--error-rate 0-1]
+(los valores por defecto salen de mock_port, mock_latency_ms y mock_error_rate de [Testing]).
+"""
+import argparse
+import html
+import json
+import random
+import struct
+import sys
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from fake_workshop import load_testing_config, item_info_from_config, catalog_ids
+
+def _png(width: int, height: int, rgb: tuple[int, int, int]) -> bytes:
+    """PNG de un solo color, generado sin dependencias."""
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+    raw = b"".join(b"\x00" + bytes(rgb) * width for _ in range(height))
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(raw)) + chunk(b"IEND", b""))
+
+class MockSteamHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass # Miles de peticiones por segundo: sin log por petición
+
+    @property
+    def testing(self):
+        return self.server.testing
+
+    def _base_url(self) -> str:
+        return f"http://{self.headers.get('Host', '127.0.0.1')}"
+
+    def _send(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _simulate_network(self) -> bool:
+        """Aplica la latencia configurada y, a veces, responde con un error. Devuelve False si ya respondió."""
+        if self.server.latency:
+            time.sleep(self.server.latency * random.uniform(0.5, 1.5))
+        if random.random() < self.server.error_rate:
+            status = random.choice((429, 500, 503))
+            self._send(status, b'{"error": "simulado"}', 'application/json')
+            return False
+        return True
+
+    def _api_item(self, workshop_id: str, include_children: bool) -> dict:
+        if not workshop_id.isdigit():
+            return {'publishedfileid': workshop_id, 'result': 9}
+        info = item_info_from_config(workshop_id, self.testing)
+        description = f"[h1]{info['title']}[/h1]\nDescripción [b]simulada[/b] del mod {workshop_id}."
+        item = {
+            'publishedfileid': workshop_id, 'result': 1, 'title': info['title'],
+            'file_size': str(info['size']), 'time_updated': info['time_updated'], 'time_created': info['time_updated'],
+            'preview_url': f"{self._base_url()}/preview/{workshop_id}.png",
+            'description': description, 'file_description': description
+        }
+        if include_children:
+            item['num_children'] = len(info['dependencies'])
+            item['children'] = [{'publishedfileid': dep, 'sortorder': i, 'file_type': 0}
+                                for i, dep in enumerate(info['dependencies'])]
+        return item
+
+    def _catalog(self) -> list[tuple[str, dict]]:
+        """Los mods de catalog_ids(mock_catalog_size), del más recientemente actualizado al más antiguo."""
+        catalog = getattr(self.server, 'catalog', None)
+        if catalog is None:
+            ids = catalog_ids(self.testing.getint("mock_catalog_size", 5000))
+            catalog = sorted(((wid, item_info_from_config(wid, self.testing)) for wid in ids), key=lambda e: -e[1]['time_updated'])
+            self.server.catalog = catalog
+        return catalog
+
+    @staticmethod
+    def _stars(workshop_id: str) -> int:
+        return zlib.crc32(workshop_id.encode('utf-8')) % 6
+
+    def _query_files(self, params: dict):
+        cursor = params.get('cursor', ['*'])[0]
+        start = int(cursor) if cursor.isdigit() else 0
+        per_page = min(100, int(params.get('numperpage', ['100'])[0]))
+        catalog = self._catalog()
+        items = []
+        for wid, info in catalog[start:start + per_page]:
+            stars = self._stars(wid)
+            items.append({'publishedfileid': wid, 'result': 1, 'title': info['title'], 'time_updated': info['time_updated'],
+                          'file_size': str(info['size']), 'preview_url': f"{self._base_url()}/preview/{wid}.png",
+                          'vote_data': {'score': stars / 5, 'votes_up': stars * 10, 'votes_down': (5 - stars) * 10}})
+        next_cursor = str(start + len(items)) if items else cursor
+        body = json.dumps({'response': {'total': len(catalog), 'publishedfiledetails': items, 'next_cursor': next_cursor}})
+        self._send(200, body.encode('utf-8'), 'application/json')
+
+    def _browse_page(self, params: dict):
+        page = max(1, int(params.get('p', ['1'])[0]))
+        per_page = min(30, int(params.get('numperpage', ['30'])[0]))
+        items = "".join(
+            f'<div class="workshopItem"><a href="{self._base_url()}/sharedfiles/filedetails/?id={wid}" class="ugc" '
+            f'data-publishedfileid="{wid}"><img class="workshopItemPreviewImage" src="{self._base_url()}/preview/{wid}.png"></a>'
+            f'<img class="fileRating" src="{self._base_url()}/images/{self._stars(wid)}-star_large.png">'
+            f'<div class="workshopItemTitle ellipsis">{html.escape(info["title"])}</div></div>'
+            for wid, info in self._catalog()[(page - 1) * per_page:page * per_page])
+        self._send(200, f"<html><body><div class=\"workshopBrowseItems\">{items}</div></body></html>".encode('utf-8'),
+                   'text/html; charset=utf-8')
+
+    def _details_response(self, ids: list[str], include_children: bool):
+        items = [self._api_item(wid, include_children) for wid in ids]
+        body = json.dumps({'response': {'result': 1, 'resultcount': len(items), 'publishedfiledetails': items}})
+        self._send(200, body.encode('utf-8'), 'application/json')
+
+    @staticmethod
+    def _ids_from(params: dict) -> list[str]:
+        keys = sorted((k for k in params if k.startswith('publishedfileids[')), key=lambda k: int(k[17:-1]))
+        return [params[k][0] for k in keys]
+
+    def _mod_page(self, workshop_id: str):
+        info = item_info_from_config(workshop_id, self.testing)
+        required = "".join(
+            f'<a href="{self._base_url()}/sharedfiles/filedetails/?id={dep}"><div class="requiredItem">'
+            f'{html.escape(item_info_from_config(dep, self.testing)["title"])}</div></a>'
+            for dep in info['dependencies'])
+        page = (f"<html><head><title>Steam Workshop::{html.escape(info['title'])}</title></head><body>"
+                f'<div class="workshopItemTitle">{html.escape(info["title"])}</div>'
+                f'<img id="mainContentsContainer" src="{self._base_url()}/preview/{workshop_id}.png">'
+                f'<div class="workshopItemDescription"><div class="bb_h1">{html.escape(info["title"])}</div>'
+                f'Descripción <b>simulada</b> del mod {workshop_id}.<br></div>'
+                f'<div id="RequiredItems">{required}</div></body></html>')
+        self._send(200, page.encode('utf-8'), 'text/html; charset=utf-8')
+
+    def do_GET(self):
+        if not self._simulate_network():
+            return
+        url = urlparse(self.path)
+        params = parse_qs(url.query)
+        if url.path.rstrip('/') == '/sharedfiles/filedetails' and params.get('id', [''])[0].isdigit():
+            self._mod_page(params['id'][0])
+        elif url.path.rstrip('/') == '/IPublishedFileService/GetDetails/v1':
+            self._details_response(self._ids_from(params), params.get('includechildren', ['false'])[0] == 'true')
+        elif url.path.rstrip('/') == '/IPublishedFileService/QueryFiles/v1':
+            self._query_files(params)
+        elif url.path.rstrip('/') == '/workshop/browse':
+            self._browse_page(params)
+        elif url.path.startswith('/preview/'):
+            workshop_id = url.path.rsplit('/', 1)[-1].split('.')[0]
+            shade = zlib.crc32(workshop_id.encode('utf-8'))
+            self._send(200, _png(64, 36, (shade & 0xFF, (shade >> 8) & 0xFF, (shade >> 16) & 0xFF)), 'image/png')
+        else:
+            self._send(404, b'Not Found', 'text/plain')
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0) or 0)
+        form = parse_qs(self.rfile.read(length).decode('utf-8'))
+        if not self._simulate_network():
+            return
+        if urlparse(self.path).path.rstrip('/') == '/ISteamRemoteStorage/GetPublishedFileDetails/v1':
+            self._details_response(self._ids_from(form), include_children=False)
+        else:
+            self._send(404, b'Not Found', 'text/plain')
+
+def main() -> int:
+    testing = load_testing_config()
+    parser = argparse.ArgumentParser(description="Servidor simulado de la Workshop y la API Web de Steam.")
+    parser.add_argument('--port', type=int, default=testing.getint("mock_port", 27070))
+    parser.add_argument('--latency-ms', type=float, default=testing.getfloat("mock_latency_ms", 0.0))
+    parser.add_argument('--error-rate', type=float, default=testing.getfloat("mock_error_rate", 0.0))
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), MockSteamHandler)
+    server.daemon_threads = True
+    server.testing = testing
+    server.latency = args.latency_ms / 1000
+    server.error_rate = args.error_rate
+    print(f"Servidor simulado de Steam en http://127.0.0.1:{args.port} "
+          f"(latencia {args.latency_ms} ms, errores {args.error_rate:.0%})", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())